@@ -28,6 +28,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         from agents.api.services.task_service import task_service
 
         await task_service.initialize()
+
+        # 启动时解析 Skill 后端并完成相关模块的导入，避免首个请求承担该开销
+        from agents.claude.skill_runtime import get_skill_runtime
+
+        logger.info(f"Skill backend: {get_skill_runtime().backend}")
         logger.info("Services initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize services: {str(e)}")
@@ -41,6 +46,14 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         from agents.api.services.task_service import task_service
 
         await task_service.cleanup()
+
+        from agents.claude.pdf_engine import shutdown_extraction_engine
+        from agents.claude.skill_runtime import close_skill_runtime
+        from agents.core.http_client import close_http_client
+
+        shutdown_extraction_engine()
+        await close_skill_runtime()
+        await close_http_client()
         logger.info("Services cleanup completed")
     except Exception as e:
         logger.error(f"Error during cleanup: {str(e)}")
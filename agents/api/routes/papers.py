@@ -13,6 +13,7 @@ from fastapi import (
     Query,
     UploadFile,
 )
+from fastapi.responses import Response
 
 from agents.api.models.paper import (
     BatchProcessRequest,
@@ -30,9 +31,18 @@ router = APIRouter()
 @router.get("/health")
 async def health_check() -> dict[str, Any]:
     """
-    Health check endpoint.
+    Health check endpoint, including skill call and LLM rate limiter
+    statistics (queue wait times).
     """
-    return {"status": "healthy", "message": "Service is running"}
+    from agents.claude.rate_limiter import get_llm_governor
+    from agents.claude.skill_runtime import get_skill_runtime
+
+    return {
+        "status": "healthy",
+        "message": "Service is running",
+        "skills": get_skill_runtime().get_stats(),
+        "llm": get_llm_governor().get_stats(),
+    }
 
 
 # Dependency injection
@@ -149,6 +159,108 @@ async def get_paper_content(
         ) from e
 
 
+@router.get("/{paper_id}/pages/{page_number}")
+async def get_paper_page(
+    paper_id: str = Path(..., description="Paper ID"),
+    page_number: int = Path(..., ge=1, description="Page number (1-based)"),
+    service: PaperService = Depends(get_paper_service),
+) -> dict[str, Any]:
+    """
+    Extract a single page on demand (cached per page).
+
+    - **paper_id**: Paper ID
+    - **page_number**: Page number, starting at 1
+    """
+    try:
+        return await service.get_page(paper_id, page_number)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    except Exception as e:
+        logger.error(f"Error getting page {page_number} of {paper_id}: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to get page: {str(e)}"
+        ) from e
+
+
+@router.get("/{paper_id}/pages/{page_number}/thumbnail")
+async def get_paper_page_thumbnail(
+    paper_id: str = Path(..., description="Paper ID"),
+    page_number: int = Path(..., ge=1, description="Page number (1-based)"),
+    width: int = Query(256, ge=32, le=1024, description="Thumbnail width in pixels"),
+    service: PaperService = Depends(get_paper_service),
+) -> Response:
+    """
+    Get a JPEG thumbnail of a page (rendered on first request, then cached).
+
+    - **paper_id**: Paper ID
+    - **page_number**: Page number, starting at 1
+    - **width**: Thumbnail width in pixels
+    """
+    try:
+        image = await service.get_page_thumbnail(paper_id, page_number, width)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    except Exception as e:
+        logger.error(
+            f"Error rendering thumbnail of page {page_number} of {paper_id}: {str(e)}"
+        )
+        raise HTTPException(
+            status_code=500, detail=f"Failed to render thumbnail: {str(e)}"
+        ) from e
+
+    return Response(
+        content=image,
+        media_type="image/jpeg",
+        headers={"Cache-Control": "private, max-age=3600"},
+    )
+
+
+@router.get("/tables/search")
+async def search_tables(
+    column: str | None = Query(None, description="Column header, case-insensitive"),
+    paper_id: str | None = Query(None, description="Restrict to one paper"),
+    page: int | None = Query(None, ge=1, description="Restrict to one page"),
+    service: PaperService = Depends(get_paper_service),
+) -> dict[str, Any]:
+    """
+    Find extracted tables by column header, paper and page (index lookup).
+
+    - **column**: Column header, e.g. ``Accuracy``
+    - **paper_id**: Paper ID
+    - **page**: Page number, starting at 1
+    """
+    try:
+        return await service.search_tables(column=column, paper_id=paper_id, page=page)
+    except Exception as e:
+        logger.error(f"Error searching tables: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to search tables: {str(e)}"
+        ) from e
+
+
+@router.get("/{paper_id}/tables")
+async def get_paper_tables(
+    paper_id: str = Path(..., description="Paper ID"),
+    page: int | None = Query(None, ge=1, description="Restrict to one page"),
+    service: PaperService = Depends(get_paper_service),
+) -> dict[str, Any]:
+    """
+    Get the tables extracted from a paper.
+
+    - **paper_id**: Paper ID
+    - **page**: Page number, starting at 1
+    """
+    try:
+        return await service.get_tables(paper_id, page=page)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    except Exception as e:
+        logger.error(f"Error getting tables of {paper_id}: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to get tables: {str(e)}"
+        ) from e
+
+
 @router.get("/", response_model=PaperListResponse)
 async def list_papers(
     category: str | None = Query(None, description="Filter by category"),
@@ -264,6 +376,28 @@ async def translate_paper(
         ) from e
 
 
+@router.post("/{paper_id}/translate/retry")
+async def retry_paper_translation(
+    paper_id: str = Path(..., description="Paper ID"),
+    service: PaperService = Depends(get_paper_service),
+) -> dict[str, Any]:
+    """
+    Re-translate only the chunks that failed in the last translation.
+
+    - **paper_id**: Paper ID
+    """
+    try:
+        result = await service.retry_translation(paper_id)
+        return result
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    except Exception as e:
+        logger.error(f"Error retrying translation of {paper_id}: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Translation retry failed: {str(e)}"
+        ) from e
+
+
 @router.post("/{paper_id}/analyze")
 async def analyze_paper(
     paper_id: str = Path(..., description="Paper ID"),
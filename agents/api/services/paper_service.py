@@ -10,7 +10,11 @@ from typing import Any
 from fastapi import UploadFile
 
 from agents.claude.batch_agent import BatchProcessingAgent
+from agents.claude.extraction_checkpoint import checkpoint_files
 from agents.claude.heartfelt_agent import HeartfeltAgent
+from agents.claude.table_store import get_table_store
+from agents.claude.thumbnail_cache import get_thumbnail_cache
+from agents.claude.translation_segments import checkpoint_file, segments_file
 from agents.claude.workflow_agent import WorkflowAgent
 from agents.core.config import settings
 
@@ -104,15 +108,19 @@ class PaperService:
 
         # 更新状态
         await self._update_status(paper_id, "processing", workflow)
+        task_id = (
+            f"task_{paper_id}_{workflow}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        )
 
         try:
-            # 启动处理
+            # 启动处理，流式译文推送给论文的订阅者
             result = await self.workflow_agent.process(
                 {
                     "source_path": str(source_path),
                     "workflow": workflow,
                     "paper_id": paper_id,
                     "options": options or {},
+                    "on_partial": self._partial_translation_listener(paper_id),
                 }
             )
 
@@ -124,9 +132,6 @@ class PaperService:
                 )
 
             # 创建任务记录
-            task_id = (
-                f"task_{paper_id}_{workflow}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
-            )
             await self._create_task_record(paper_id, task_id, workflow, result)
 
             return {
@@ -232,6 +237,113 @@ class PaperService:
                 "file_path": str(content_path),
             }
 
+    async def get_page(self, paper_id: str, page_number: int) -> dict[str, Any]:
+        """按需提取论文的单页内容.
+
+        只解析请求的页面，结果按页写入提取缓存，再次请求同一页时直接命中
+        缓存，无需运行完整的工作流。
+
+        Args:
+            paper_id: 论文ID
+            page_number: 页码（从 1 开始）
+
+        Returns:
+            单页内容
+        """
+        source_path = self._get_source_path(paper_id)
+        if not source_path.exists():
+            raise ValueError(f"Paper not found: {paper_id}")
+
+        # page_range 从 0 开始且包含结束页
+        result = await self.workflow_agent.pdf_agent.extract_content(
+            {
+                "file_path": str(source_path),
+                "options": {"page_range": [page_number - 1, page_number - 1]},
+            }
+        )
+        if not result["success"]:
+            raise RuntimeError(result.get("error", "Page extraction failed"))
+
+        data = result["data"]
+        if not data["page_count"]:
+            raise ValueError(
+                f"Page {page_number} out of range (1-{data['total_pages']}): {paper_id}"
+            )
+
+        return {
+            "paper_id": paper_id,
+            "page": page_number,
+            "total_pages": data["total_pages"],
+            "format": "markdown",
+            "content": data["content"],
+            "tables": data["tables"],
+            "formulas": data["formulas"],
+            "images": data["images"],
+            "word_count": data["word_count"],
+        }
+
+    async def get_page_thumbnail(
+        self, paper_id: str, page_number: int, width: int = 256
+    ) -> bytes:
+        """获取论文页面的缩略图.
+
+        缩略图在首次请求时由进程池渲染并写入 papers/.cache/thumbnails，
+        之后的请求直接读取缓存，不再打开 PDF。
+
+        Args:
+            paper_id: 论文ID
+            page_number: 页码（从 1 开始）
+            width: 缩略图宽度（像素）
+
+        Returns:
+            JPEG 数据
+        """
+        source_path = self._get_source_path(paper_id)
+        if not source_path.exists():
+            raise ValueError(f"Paper not found: {paper_id}")
+
+        cache = get_thumbnail_cache(self.papers_dir)
+        return await cache.get(str(source_path), page_number, width)
+
+    async def get_tables(
+        self, paper_id: str, page: int | None = None
+    ) -> dict[str, Any]:
+        """获取论文提取的表格.
+
+        Args:
+            paper_id: 论文ID
+            page: 只返回该页（从 1 开始）的表格
+
+        Returns:
+            论文ID和表格列表（表头和所有行）
+        """
+        if not self._get_source_path(paper_id).exists():
+            raise ValueError(f"Paper not found: {paper_id}")
+
+        tables = await get_table_store(self.papers_dir).load(paper_id, page=page)
+        return {"paper_id": paper_id, "tables": tables, "total": len(tables)}
+
+    async def search_tables(
+        self,
+        column: str | None = None,
+        paper_id: str | None = None,
+        page: int | None = None,
+    ) -> dict[str, Any]:
+        """按表头、论文和页码在表格索引中查找表格.
+
+        Args:
+            column: 表头名称（忽略大小写和空白差异）
+            paper_id: 只查找该论文的表格
+            page: 只查找该页的表格
+
+        Returns:
+            匹配的索引条目列表
+        """
+        results = await get_table_store(self.papers_dir).find(
+            column=column, paper_id=paper_id, page=page
+        )
+        return {"results": results, "total": len(results)}
+
     async def list_papers(
         self,
         category: str | None = None,
@@ -327,6 +439,9 @@ class PaperService:
             source_path = self._get_source_path(paper_id)
             if source_path.exists():
                 source_path.unlink()
+            # 提取检查点及其锁文件
+            for checkpoint_path in checkpoint_files(source_path):
+                checkpoint_path.unlink(missing_ok=True)
 
             # 删除翻译文件
             translation_path = (
@@ -334,6 +449,16 @@ class PaperService:
             )
             if translation_path.exists():
                 translation_path.unlink()
+            # 增量翻译使用的源文本分段、各目标语言的翻译检查点和流式译文临时文件
+            segments_path = segments_file(translation_path)
+            if segments_path.exists():
+                segments_path.unlink()
+            pattern = checkpoint_file(translation_path, "*").name
+            for checkpoint_path in translation_path.parent.glob(pattern):
+                checkpoint_path.unlink()
+            part_path = translation_path.with_name(f"{translation_path.name}.part")
+            if part_path.exists():
+                part_path.unlink()
 
             # 删除深度分析文件
             heartfelt_dir = self.papers_dir / "heartfelt" / category
@@ -349,6 +474,12 @@ class PaperService:
             if report_path.exists():
                 report_path.unlink()
 
+            # 删除提取的表格及其索引条目
+            await get_table_store(self.papers_dir).delete(paper_id)
+
+            # 删除逐页产物记录，避免同一论文再次上传时复用过期的页面和译文
+            await self.workflow_agent.revisions.delete(paper_id)
+
             # 删除元数据
             await self._delete_metadata(paper_id)
 
@@ -635,6 +766,26 @@ class PaperService:
 
         return output_dir / f"{filename}.json"
 
+    def _partial_translation_listener(self, paper_id: str) -> Any:
+        """创建将流式译文转发给 WebSocket 订阅者的回调.
+
+        任务ID在处理完成后才返回给客户端，因此流式译文以论文ID为订阅键
+        推送，客户端在发起请求前订阅论文ID即可实时接收译文。
+
+        Args:
+            paper_id: 论文ID
+
+        Returns:
+            接收 (新增译文, 进度百分比) 的异步回调
+        """
+
+        async def on_partial(text: str, progress: float) -> None:
+            from ..routes.websocket import send_task_update
+
+            await send_task_update(paper_id, "translating", progress, text)
+
+        return on_partial
+
     async def translate_paper(self, paper_id: str) -> dict[str, Any]:
         """翻译论文.
 
@@ -650,27 +801,28 @@ class PaperService:
 
         # 更新状态
         await self._update_status(paper_id, "processing", "translate")
+        task_id = f"translate_{paper_id}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
 
         try:
-            # 启动翻译工作流
+            # 启动翻译工作流，流式译文推送给任务订阅者
             result = await self.workflow_agent.process(
                 {
                     "source_path": str(source_path),
-                    "workflow": "translate",
+                    "workflow": "translate_only",
                     "paper_id": paper_id,
+                    "on_partial": self._partial_translation_listener(paper_id),
                 }
             )
 
             if result["success"]:
-                await self._update_status(paper_id, "completed", "translate")
-                task_id = (
-                    f"translate_{paper_id}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+                status = await self._update_translation_status(
+                    paper_id, result.get("data")
                 )
                 await self._create_task_record(paper_id, task_id, "translate", result)
                 return {
                     "task_id": task_id,
                     "paper_id": paper_id,
-                    "status": "completed",
+                    "status": status,
                     "result": result,
                 }
             else:
@@ -684,6 +836,70 @@ class PaperService:
             logger.error(f"Error translating paper {paper_id}: {str(e)}")
             raise
 
+    async def _update_translation_status(
+        self, paper_id: str, data: dict[str, Any] | None
+    ) -> str:
+        """按翻译结果更新论文状态.
+
+        仍有分段翻译失败时状态为 partial，可以通过 retry_translation 重试。
+
+        Args:
+            paper_id: 论文ID
+            data: 翻译结果数据
+
+        Returns:
+            新状态（completed 或 partial）
+        """
+        failed_chunks = (data or {}).get("failed_chunks") or []
+        if not failed_chunks:
+            await self._update_status(paper_id, "completed", "translate")
+            return "completed"
+        await self._update_status(
+            paper_id,
+            "partial",
+            "translate",
+            f"{len(failed_chunks)} chunks failed to translate",
+        )
+        return "partial"
+
+    async def retry_translation(self, paper_id: str) -> dict[str, Any]:
+        """只重新翻译论文上一次翻译失败的分段.
+
+        Args:
+            paper_id: 论文ID
+
+        Returns:
+            翻译任务结果，仍有分段翻译失败时 status 为 partial
+        """
+        metadata = await self._get_metadata(paper_id)
+        if not metadata:
+            raise ValueError(f"Paper not found: {paper_id}")
+
+        await self._update_status(paper_id, "processing", "translate")
+        task_id = f"retry_{paper_id}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+
+        result = await self.workflow_agent.translation_agent.retry_failed(
+            {
+                "paper_id": paper_id,
+                "on_partial": self._partial_translation_listener(paper_id),
+            }
+        )
+        if not result["success"]:
+            await self._update_status(
+                paper_id, "failed", "translate", result.get("error") or ""
+            )
+            raise ValueError(result.get("error", "Translation retry failed"))
+
+        status = await self._update_translation_status(paper_id, result["data"])
+        await self._create_task_record(paper_id, task_id, "translate", result)
+        return {
+            "task_id": task_id,
+            "paper_id": paper_id,
+            "status": status,
+            "retried": result["data"]["retried"],
+            "failed_chunks": result["data"]["failed_chunks"],
+        }
+
     async def analyze_paper(self, paper_id: str) -> dict[str, Any]:
         """分析论文（深度阅读）.
 
@@ -3,6 +3,7 @@
 import asyncio
 import logging
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Awaitable, Callable
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -47,36 +48,54 @@ class BaseAgent(ABC):
         Returns:
             Skill 调用结果
         """
+        from .skill_runtime import get_skill_runtime
+
         try:
-            # First try to use the official SDK if available
-            try:
-                from claude_agent_sdk.tools import Skill
-
-                result = await Skill(skill_name, params)
-                return {"success": True, "data": result}
-            except ImportError:
-                # Fallback to our implementation
-                logger.info(f"Using fallback skill implementation for {skill_name}")
-                from .skills import SkillInvoker
-
-                invoker = SkillInvoker()
-                return await invoker.call_skill(skill_name, params)
+            return await get_skill_runtime().call(skill_name, params)
         except Exception as e:
             logger.error(f"Error calling skill {skill_name}: {str(e)}")
             return {"success": False, "error": str(e)}
 
+    async def stream_skill(
+        self, skill_name: str, params: dict[str, Any]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """流式调用 Claude Skill，逐个产出中间结果.
+
+        Args:
+            skill_name: Skill 名称
+            params: Skill 参数
+
+        Yields:
+            Skill 事件，失败时产出 type 为 error 的事件
+        """
+        from .skill_runtime import get_skill_runtime
+
+        async for event in get_skill_runtime().stream(skill_name, params):
+            yield event
+
     async def batch_call_skill(
-        self, calls: list[dict[str, Any]]
+        self,
+        calls: list[dict[str, Any]],
+        on_result: Callable[[int, Any], Awaitable[None]] | None = None,
     ) -> list[dict[str, Any]]:
         """批量调用 Skills，提高并发性能.
 
         Args:
             calls: 调用列表，每个元素包含 skill 和 params 字段
+            on_result: 可选回调，每个调用完成时以 (调用序号, 结果) 调用，
+                用于在其余调用仍在进行时持久化已完成的结果
 
         Returns:
             批量调用结果列表
         """
-        tasks = [self.call_skill(call["skill"], call["params"]) for call in calls]
+
+        async def call_and_report(index: int, call: dict[str, Any]) -> Any:
+            result = await self.call_skill(call["skill"], call["params"])
+            if on_result is not None:
+                await on_result(index, result)
+            return result
+
+        tasks = [call_and_report(i, call) for i, call in enumerate(calls)]
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
         # Convert any exceptions to error dictionaries
@@ -7,6 +7,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from agents.core.utils import validate_pdf_file
+
 from .base import BaseAgent
 
 logger = logging.getLogger(__name__)
@@ -134,7 +136,7 @@ class BatchProcessingAgent(BaseAgent):
         Returns:
             验证结果
         """
-        valid_files = []
+        candidates = []
         invalid_files = []
 
         for file_path in files:
@@ -143,7 +145,19 @@ class BatchProcessingAgent(BaseAgent):
             elif not file_path.lower().endswith(".pdf"):
                 invalid_files.append({"path": file_path, "error": "Not a PDF file"})
             else:
+                candidates.append(file_path)
+
+        # 在线程池中并发检查文件头、xref 和 trailer，在提取前拒绝损坏的 PDF
+        results = await asyncio.gather(
+            *(asyncio.to_thread(validate_pdf_file, path) for path in candidates)
+        )
+
+        valid_files = []
+        for file_path, result in zip(candidates, results, strict=True):
+            if result["valid"]:
                 valid_files.append(file_path)
+            else:
+                invalid_files.append({"path": file_path, "error": result["error"]})
 
         return {
             "success": True,
@@ -239,15 +253,13 @@ class BatchProcessingAgent(BaseAgent):
         """
         last_error = None
 
+        # 生成 paper_id（重试时沿用，提取从检查点中最后完成的页之后继续）
+        file_name = os.path.splitext(os.path.basename(file_path))[0]
+        category = self._get_category_from_path(file_path)
+        paper_id = f"{category}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{file_name}"
+
         for attempt in range(retry_count + 1):
             try:
-                # 生成 paper_id
-                file_name = os.path.splitext(os.path.basename(file_path))[0]
-                category = self._get_category_from_path(file_path)
-                paper_id = (
-                    f"{category}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{file_name}"
-                )
-
                 # 调用 WorkflowAgent 处理
                 from .workflow_agent import WorkflowAgent
 
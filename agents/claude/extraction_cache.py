@@ -0,0 +1,155 @@
+"""Extraction cache - 按 PDF 内容哈希和提取选项缓存 pdf-reader 结果."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+from agents.core.cache import DiskLRUCache
+from agents.core.utils import get_file_hash
+
+from .pdf_engine import EXTRACTOR_VERSION
+
+logger = logging.getLogger(__name__)
+
+CACHE_SUBDIR = Path(".cache") / "extraction"
+
+
+def normalize_extraction_options(options: dict[str, Any]) -> dict[str, Any]:
+    """规范化影响提取结果的选项，作为缓存键的一部分.
+
+    Args:
+        options: pdf-reader skill 参数
+
+    Returns:
+        规范化后的选项
+    """
+    page_range = options.get("page_range")
+    return {
+        "page_range": [int(page_range[0]), int(page_range[1])]
+        if page_range and len(page_range) >= 2
+        else None,
+        "extract_tables": bool(options.get("extract_tables", True)),
+        "method": options.get("method") or "auto",
+        # 图片只在指定存储目录时提取，结果中包含该目录下的路径
+        "image_dir": options.get("image_dir")
+        if options.get("extract_images", True)
+        else None,
+        # 逐页记录（指纹、原始结果）改变结果结构
+        "include_pages": bool(options.get("include_pages", False)),
+    }
+
+
+class ExtractionCache:
+    """内容寻址的提取结果缓存."""
+
+    def __init__(self, cache_dir: str | Path, max_bytes: int) -> None:
+        """初始化提取缓存.
+
+        Args:
+            cache_dir: 缓存目录
+            max_bytes: 缓存总大小上限（字节）
+        """
+        self._store = DiskLRUCache(cache_dir, max_bytes, suffix=".json")
+        # (path, size, mtime) -> 内容哈希，避免重复读取同一文件
+        self._hash_memo: dict[tuple[str, int, float], str] = {}
+
+    def _file_hash(self, file_path: str) -> str:
+        """计算文件内容哈希（按路径、大小和修改时间记忆）."""
+        stat = os.stat(file_path)
+        memo_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime)
+        if memo_key not in self._hash_memo:
+            self._hash_memo[memo_key] = get_file_hash(file_path, "sha256")
+        return self._hash_memo[memo_key]
+
+    def make_key(self, file_hash: str, options: dict[str, Any]) -> str:
+        """根据内容哈希、规范化选项和提取器版本生成缓存键.
+
+        Args:
+            file_hash: 文件内容哈希
+            options: pdf-reader skill 参数
+
+        Returns:
+            缓存键
+        """
+        payload = json.dumps(
+            {
+                "file": file_hash,
+                "options": normalize_extraction_options(options),
+                "version": EXTRACTOR_VERSION,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def key_for(self, file_path: str, options: dict[str, Any]) -> str:
+        """计算文件和选项对应的缓存键.
+
+        Args:
+            file_path: PDF 文件路径
+            options: pdf-reader skill 参数
+
+        Returns:
+            缓存键
+        """
+        file_hash = await asyncio.to_thread(self._file_hash, file_path)
+        return self.make_key(file_hash, options)
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        """读取缓存的提取结果.
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            提取结果，未命中时返回 None
+        """
+        data = await asyncio.to_thread(self._store.get, key)
+        if data is None:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            logger.warning(f"Discarding corrupt extraction cache entry {key}")
+            await asyncio.to_thread(self._store.delete, key)
+            return None
+
+    async def put(self, key: str, result: dict[str, Any]) -> None:
+        """保存提取结果.
+
+        Args:
+            key: 缓存键
+            result: 提取结果
+        """
+        data = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        await asyncio.to_thread(self._store.put, key, data)
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取缓存统计信息.
+
+        Returns:
+            命中/未命中计数、条目数和大小
+        """
+        return self._store.get_stats()
+
+
+_caches: dict[str, ExtractionCache] = {}
+
+
+def get_extraction_cache(papers_dir: str | Path) -> ExtractionCache:
+    """获取 papers 目录对应的进程级共享提取缓存.
+
+    Args:
+        papers_dir: 论文根目录
+
+    Returns:
+        ExtractionCache 实例
+    """
+    cache_dir = str(Path(papers_dir) / CACHE_SUBDIR)
+    if cache_dir not in _caches:
+        max_mb = int(os.getenv("EXTRACTION_CACHE_MAX_MB", "512"))
+        _caches[cache_dir] = ExtractionCache(cache_dir, max_mb * 1024 * 1024)
+    return _caches[cache_dir]
@@ -0,0 +1,222 @@
+"""Extraction checkpoint - 逐页持久化提取结果，失败或重启后断点续提."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, TextIO
+
+from .extraction_cache import normalize_extraction_options
+from .pdf_engine import EXTRACTOR_VERSION
+
+logger = logging.getLogger(__name__)
+
+# 本进程持有的检查点锁；锁文件中是本进程号但不在其中的锁是上一次运行
+# 遗留的（如容器重启后服务进程号同为 1）
+_held_locks: set[Path] = set()
+_held_locks_lock = threading.Lock()
+
+
+def checkpoint_files(file_path: str | Path) -> list[Path]:
+    """列出论文旁边的全部提取检查点文件（含锁文件和临时文件）.
+
+    Args:
+        file_path: 本地 PDF 文件路径
+
+    Returns:
+        检查点文件路径列表
+    """
+    file_path = Path(file_path)
+    return sorted(file_path.parent.glob(f".{file_path.name}.*.extract.jsonl*"))
+
+
+class ExtractionCheckpoint:
+    """保存在论文旁边的逐页提取检查点.
+
+    检查点是一个 JSON Lines 文件（``.<论文文件名>.<键>.extract.jsonl``），
+    每提取完成一页追加一行。由于页面按页码顺序产出，检查点中总是从起始页
+    开始的连续页面，续提时从最后完成的页之后开始。文件名中的键由提取选项、
+    提取器版本以及 PDF 的大小和修改时间计算，PDF 或选项变化后旧检查点不会
+    被误用。
+
+    同一检查点同时只能由一次提取使用：使用前需通过 acquire 创建锁文件
+    （``<检查点>.lock``，内容为持有者进程号），持有者进程已退出或者
+    进程号与本进程相同但本进程并未持有的锁视为失效并被接管。
+    """
+
+    def __init__(self, file_path: str, options: dict[str, Any]) -> None:
+        """初始化检查点.
+
+        Args:
+            file_path: 本地 PDF 文件路径
+            options: pdf-reader 提取选项
+        """
+        self.file_path = Path(file_path)
+        stat = self.file_path.stat()
+        payload = json.dumps(
+            {
+                "options": normalize_extraction_options(options),
+                "version": EXTRACTOR_VERSION,
+                "size": stat.st_size,
+                "mtime": stat.st_mtime_ns,
+            },
+            sort_keys=True,
+        )
+        key = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+        self.path = self.file_path.with_name(
+            f".{self.file_path.name}.{key}.extract.jsonl"
+        )
+        self.lock_path = self.path.with_name(f"{self.path.name}.lock")
+        self._file: TextIO | None = None
+        self._locked = False
+
+    def _lock_is_stale(self) -> bool:
+        """锁文件的持有者进程是否已经退出."""
+        try:
+            pid = int(self.lock_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return True
+        except ValueError:
+            # 持有者刚创建锁文件、尚未写入进程号
+            return False
+        if pid == os.getpid():
+            with _held_locks_lock:
+                return self.lock_path not in _held_locks
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            return False
+        return False
+
+    def _acquire(self) -> bool:
+        for _ in range(2):
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if not self._lock_is_stale():
+                    return False
+                logger.info(f"Taking over stale extraction lock {self.lock_path}")
+                try:
+                    os.unlink(self.lock_path)
+                except FileNotFoundError:
+                    pass
+                continue
+            with _held_locks_lock:
+                _held_locks.add(self.lock_path)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(str(os.getpid()))
+            self._locked = True
+            return True
+        return False
+
+    async def acquire(self) -> bool:
+        """获取检查点的独占使用权.
+
+        Returns:
+            是否获取成功；另一次提取正在使用该检查点时返回 False
+        """
+        return await asyncio.to_thread(self._acquire)
+
+    def _release(self) -> None:
+        """释放检查点锁."""
+        if self._locked:
+            self._locked = False
+            try:
+                os.unlink(self.lock_path)
+            except FileNotFoundError:
+                pass
+            with _held_locks_lock:
+                _held_locks.discard(self.lock_path)
+
+    def _load(self, start_page: int, end_page: int | None) -> list[dict[str, Any]]:
+        """读取检查点中从起始页开始的连续页面."""
+        if not self.path.exists():
+            return []
+
+        pages: list[dict[str, Any]] = []
+        contiguous = True
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    page = json.loads(line)
+                except ValueError:
+                    page = None
+                # 写了一半的行或页码不连续（文件损坏或被并发写入）时
+                # 只保留此前的页面
+                if page is None or page.get("page") != start_page + len(pages) + 1:
+                    contiguous = False
+                    break
+                pages.append(page)
+
+        # 截掉无效的部分，之后追加的页面紧接在有效页面之后
+        if not contiguous and self._locked:
+            logger.warning(
+                f"Discarding checkpointed pages of {self.file_path.name} after "
+                f"page {start_page + len(pages)}"
+            )
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(p, ensure_ascii=False) + "\n" for p in pages)
+            os.replace(tmp_path, self.path)
+        if end_page is not None:
+            pages = pages[: max(end_page - start_page, 0)]
+        return pages
+
+    async def load(
+        self, start_page: int = 0, end_page: int | None = None
+    ) -> list[dict[str, Any]]:
+        """读取已完成的页面.
+
+        Args:
+            start_page: 提取范围的起始页（0 起始）
+            end_page: 提取范围的结束页（不包含），为空表示不限
+
+        Returns:
+            从起始页开始、页码连续的页面结果列表
+        """
+        pages = await asyncio.to_thread(self._load, start_page, end_page)
+        if pages:
+            logger.info(
+                f"Resuming extraction of {self.file_path.name} after "
+                f"{len(pages)} checkpointed pages"
+            )
+        return pages
+
+    def _append(self, page: dict[str, Any]) -> None:
+        """追加一页结果并刷新到磁盘."""
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(page, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    async def append(self, page: dict[str, Any]) -> None:
+        """追加一页提取结果.
+
+        Args:
+            page: 页面结果
+        """
+        await asyncio.to_thread(self._append, page)
+
+    def close(self) -> None:
+        """关闭检查点文件并释放锁（保留内容以便续提）."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._release()
+
+    def remove(self) -> None:
+        """提取成功后删除检查点并释放锁."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.path.exists():
+            os.unlink(self.path)
+        self._release()
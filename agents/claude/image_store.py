@@ -0,0 +1,108 @@
+"""Image store - 按内容哈希去重的图片存储."""
+
+import hashlib
+import os
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+
+# 图片存储在 papers/images 下的子目录，按哈希前两位分桶
+STORE_SUBDIR = "sha256"
+
+
+class ImageStore:
+    """内容寻址的图片存储，同一图片在整个语料库中只写入一次.
+
+    文件名为图片内容哈希，写入时先写临时文件再原子替换，因此多个 worker
+    进程可以安全地并发写入同一存储。
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        """初始化图片存储.
+
+        Args:
+            root: 图片根目录（通常为 papers/images）
+        """
+        self.root = Path(root)
+        self.directory = self.root / STORE_SUBDIR
+
+    @staticmethod
+    def make_key(*parts: bytes) -> str:
+        """根据图片数据计算内容哈希.
+
+        Args:
+            *parts: 参与哈希的字节串（图片数据、编码参数等）
+
+        Returns:
+            SHA-256 十六进制字符串
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part)
+        return digest.hexdigest()
+
+    def _bucket(self, key: str) -> Path:
+        """获取哈希对应的分桶目录."""
+        return self.directory / key[:2]
+
+    def find(self, key: str) -> Path | None:
+        """查找已存储的图片.
+
+        Args:
+            key: 内容哈希
+
+        Returns:
+            图片文件路径，不存在时返回 None
+        """
+        bucket = self._bucket(key)
+        if not bucket.is_dir():
+            return None
+        for path in bucket.glob(f"{key}.*"):
+            return path
+        return None
+
+    def put(self, key: str, write: Callable[[Path], Path]) -> tuple[Path, bool]:
+        """存储图片，已存在时直接返回已有文件.
+
+        Args:
+            key: 内容哈希
+            write: 将图片写入给定路径前缀的函数，返回实际写入的文件路径
+                （扩展名由写入函数决定）
+
+        Returns:
+            (图片文件路径, 是否新写入)
+        """
+        existing = self.find(key)
+        if existing is not None:
+            return existing, False
+
+        bucket = self._bucket(key)
+        bucket.mkdir(parents=True, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=bucket, prefix=".tmp_")
+        try:
+            written = write(Path(tmp_dir) / key)
+            target = bucket / f"{key}{written.suffix}"
+            os.replace(written, target)
+        finally:
+            for leftover in Path(tmp_dir).iterdir():
+                leftover.unlink()
+            os.rmdir(tmp_dir)
+        return target, True
+
+    def put_bytes(self, data: bytes, extension: str) -> tuple[Path, bool]:
+        """存储已编码的图片数据.
+
+        Args:
+            data: 图片文件内容
+            extension: 文件扩展名（不含点）
+
+        Returns:
+            (图片文件路径, 是否新写入)
+        """
+
+        def write(prefix: Path) -> Path:
+            path = prefix.with_name(f"{prefix.name}.{extension}")
+            path.write_bytes(data)
+            return path
+
+        return self.put(self.make_key(data), write)
@@ -0,0 +1,285 @@
+"""Markdown chunker - 按 Markdown 块结构和 token 预算切分待翻译内容."""
+
+import math
+import re
+
+from marko.ext.gfm import gfm
+
+# 每个翻译块的默认输入 token 预算。zh-translator 的输出上限为 4000 tokens，
+# 英译中的输出通常为输入的 1～1.5 倍，因此预留余量避免译文被截断。
+DEFAULT_TOKEN_BUDGET = 2000
+
+CJK_RE = re.compile(
+    r"[\u3000-\u303f\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uff00-\uffef]"
+)
+# 句子：以句末标点（英文标点后需跟空白）或文本结尾结束
+SENTENCE_RE = re.compile(r".+?(?:[.!?](?:\s+|$)|[。！？；]\s*|$)", re.S)
+WORD_RE = re.compile(r"\S+\s*|\s+")
+FENCE_RE = re.compile(r"^\s{0,3}(`{3,}|~{3,})")
+TABLE_DELIMITER_RE = re.compile(r"^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$")
+
+BLOCK_KINDS = {
+    "FencedCode": "code",
+    "Table": "table",
+    "List": "list",
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """估算文本的 token 数.
+
+    中日韩字符按每字 1 token 计，其余字符按每 4 个字符 1 token 计。
+
+    Args:
+        text: 文本
+
+    Returns:
+        估算的 token 数
+    """
+    cjk = len(CJK_RE.findall(text))
+    return cjk + math.ceil((len(text) - cjk) / 4)
+
+
+def _group(pieces: list[str], budget: int, separator: str) -> list[list[str]]:
+    """将片段按顺序分组，每组连接后不超过预算（单个超限片段独占一组）."""
+    groups: list[list[str]] = []
+    current: list[str] = []
+    current_tokens = 0
+    separator_tokens = estimate_tokens(separator)
+    for piece in pieces:
+        tokens = estimate_tokens(piece) + (separator_tokens if current else 0)
+        if current and current_tokens + tokens > budget:
+            groups.append(current)
+            current, current_tokens = [], 0
+            tokens -= separator_tokens
+        current.append(piece)
+        current_tokens += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _pack(pieces: list[str], budget: int, separator: str) -> list[str]:
+    """将片段按顺序合并为不超过预算的块（单个超限片段独占一块）."""
+    return [separator.join(group) for group in _group(pieces, budget, separator)]
+
+
+def _split_text(text: str, budget: int) -> list[str]:
+    """按句子切分超限文本，单句仍超限时按单词（或字符）切分."""
+    pieces: list[str] = []
+    for sentence in SENTENCE_RE.findall(text):
+        if estimate_tokens(sentence) <= budget:
+            pieces.append(sentence)
+            continue
+        for word in WORD_RE.findall(sentence):
+            if estimate_tokens(word) <= budget:
+                pieces.append(word)
+            else:
+                # 无空白的超长文本（如中文长句）：按预算对应的字符数切分
+                pieces.extend(word[i : i + budget] for i in range(0, len(word), budget))
+    return [chunk.strip() for chunk in _pack(pieces, budget, "") if chunk.strip()]
+
+
+def _split_code(text: str, budget: int) -> list[str]:
+    """按行切分超限代码块，每一块重新包上围栏."""
+    lines = text.split("\n")
+    opening = lines[0]
+    fence = FENCE_RE.match(opening)
+    marker = fence.group(1) if fence else "```"
+    body = lines[1:]
+    closing = marker
+    if body and body[-1].strip().startswith(marker[0] * len(marker)):
+        closing = body.pop()
+    overhead = estimate_tokens(opening) + estimate_tokens(closing)
+    return [
+        f"{opening}\n{chunk}\n{closing}"
+        for chunk in _pack(body, max(budget - overhead, 1), "\n")
+    ]
+
+
+def _split_table(text: str, budget: int) -> list[str]:
+    """按行切分超限表格，每一块重复表头和分隔行."""
+    lines = text.split("\n")
+    if len(lines) < 3 or not TABLE_DELIMITER_RE.match(lines[1]):
+        return _split_text(text, budget)
+    header = "\n".join(lines[:2])
+    return [
+        f"{header}\n{rows}"
+        for rows in _pack(lines[2:], max(budget - estimate_tokens(header), 1), "\n")
+    ]
+
+
+def _split_block(kind: str, text: str, items: list[str], budget: int) -> list[str]:
+    """切分超过预算的单个块."""
+    if kind == "code":
+        return _split_code(text, budget)
+    if kind == "table":
+        return _split_table(text, budget)
+    if kind == "list" and len(items) > 1:
+        chunks = []
+        # 合并后超限的块只含单个条目
+        for chunk in _pack(items, budget, "\n"):
+            if estimate_tokens(chunk) > budget:
+                chunks.extend(_split_text(chunk, budget))
+            else:
+                chunks.append(chunk)
+        return chunks
+    return _split_text(text, budget)
+
+
+def _parse_blocks(content: str) -> list[tuple[str, str, list[str]]] | None:
+    """使用 GFM 解析器获取顶层块，解析失败时返回 None.
+
+    块的边界取自各顶层元素的起始位置，两个起始位置之间的全部原文都归入
+    前一个块，因此解析器不保留的内容（如链接引用定义）不会丢失。
+    """
+    try:
+        document = gfm.parse(content)
+    except Exception:
+        return None
+
+    elements = [
+        element
+        for element in document.children
+        if type(element).__name__ != "BlankLine"
+    ]
+    # 没有源码位置的元素无法定位原文（依赖要求 marko>=2.2.4），改用按行扫描
+    if not elements or any(
+        getattr(element, "source_span", None) is None for element in elements
+    ):
+        return None
+
+    starts = [element.source_span[0] for element in elements]
+    starts[0] = 0
+    blocks = []
+    for i, element in enumerate(elements):
+        end = starts[i + 1] if i + 1 < len(starts) else len(content)
+        text = content[starts[i] : end].strip("\n")
+        if not text.strip():
+            continue
+        kind = BLOCK_KINDS.get(type(element).__name__, "text")
+        items = []
+        if kind == "list":
+            items = [
+                content[item.source_span[0] : item.source_span[1]].strip("\n")
+                for item in element.children
+                if getattr(item, "source_span", None) is not None
+            ]
+        blocks.append((kind, text, items))
+    return blocks
+
+
+def _scan_blocks(content: str) -> list[tuple[str, str, list[str]]]:
+    """按空行切分顶层块（不在代码围栏内部切分）."""
+    blocks = []
+    current: list[str] = []
+    fence = None
+    for line in content.split("\n"):
+        match = FENCE_RE.match(line)
+        if fence is None and match:
+            fence = match.group(1)
+        elif fence is not None and line.strip().startswith(fence):
+            fence = None
+        elif fence is None and not line.strip():
+            if current:
+                blocks.append("\n".join(current))
+                current = []
+            continue
+        current.append(line)
+    if current:
+        blocks.append("\n".join(current))
+
+    result = []
+    for text in blocks:
+        lines = text.split("\n")
+        if FENCE_RE.match(lines[0]):
+            kind = "code"
+        elif len(lines) > 2 and TABLE_DELIMITER_RE.match(lines[1]) and "|" in text:
+            kind = "table"
+        else:
+            kind = "text"
+        result.append((kind, text, []))
+    return result
+
+
+def _merge_math(
+    blocks: list[tuple[str, str, list[str]]],
+) -> list[tuple[str, str, list[str]]]:
+    """合并被空行拆开的 $$ 公式块."""
+    merged: list[tuple[str, str, list[str]]] = []
+    open_math = False
+    for kind, text, items in blocks:
+        if open_math:
+            _, previous, _ = merged.pop()
+            merged.append(("math", f"{previous}\n\n{text}", []))
+        else:
+            merged.append(
+                ("math" if text.lstrip().startswith("$$") else kind, text, items)
+            )
+        if kind != "code" and text.count("$$") % 2:
+            open_math = not open_math
+    return merged
+
+
+def split_blocks(content: str, token_budget: int = DEFAULT_TOKEN_BUDGET) -> list[str]:
+    """将 Markdown 切分为不超过 token 预算的块（不合并）.
+
+    Args:
+        content: Markdown 内容
+        token_budget: 每块的估算 token 上限
+
+    Returns:
+        按文档顺序排列的块（超过预算的单个块已被切分）
+    """
+    content = content.replace("\r\n", "\n")
+    if not content.strip():
+        return []
+    budget = max(int(token_budget), 1)
+
+    blocks = _parse_blocks(content)
+    if blocks is None:
+        blocks = _scan_blocks(content)
+
+    pieces: list[str] = []
+    for kind, text, items in _merge_math(blocks):
+        if estimate_tokens(text) > budget and kind != "math":
+            pieces.extend(_split_block(kind, text, items, budget))
+        else:
+            pieces.append(text)
+    return pieces
+
+
+def pack_blocks(
+    blocks: list[str], token_budget: int = DEFAULT_TOKEN_BUDGET
+) -> list[list[str]]:
+    """将块按顺序分组，每组以空行连接后不超过 token 预算.
+
+    Args:
+        blocks: split_blocks 返回的块
+        token_budget: 每组的估算 token 上限
+
+    Returns:
+        块分组列表
+    """
+    return _group(blocks, max(int(token_budget), 1), "\n\n")
+
+
+def split_markdown(content: str, token_budget: int = DEFAULT_TOKEN_BUDGET) -> list[str]:
+    """将 Markdown 切分为不超过 token 预算的翻译块.
+
+    先解析出顶层块（标题、段落、代码围栏、表格、列表、公式等），再按顺序
+    将完整的块合并到预算内，块与块之间以空行连接。只有单个块超过预算时
+    才会切分该块：代码按行切分并保留围栏，表格按行切分并重复表头，列表
+    按条目切分，其余文本按句子切分。
+
+    Args:
+        content: Markdown 内容
+        token_budget: 每块的估算 token 上限
+
+    Returns:
+        翻译块列表（内容为空时返回空列表）
+    """
+    return [
+        "\n\n".join(group)
+        for group in pack_blocks(split_blocks(content, token_budget), token_budget)
+    ]
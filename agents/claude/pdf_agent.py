@@ -1,13 +1,23 @@
 """PDF Processing Agent - 封装 PDF 处理功能."""
 
+import asyncio
+import base64
 import logging
 import os
+from collections.abc import AsyncIterator
 from typing import Any
 
+from agents.core.utils import validate_pdf_file
+
 from .base import BaseAgent
+from .extraction_cache import ExtractionCache, get_extraction_cache
+from .image_store import ImageStore
 
 logger = logging.getLogger(__name__)
 
+# 超过该大小（base64 字符数）的图片数据写入图片存储，不在结果中内联
+INLINE_IMAGE_MAX_BYTES = 64 * 1024
+
 
 class PDFProcessingAgent(BaseAgent):
     """PDF 处理专用 Agent."""
@@ -25,6 +35,12 @@ class PDFProcessingAgent(BaseAgent):
             "extract_formulas": True,
             "output_format": "markdown",
         }
+        # 配置了 papers_dir 时默认启用提取缓存
+        self.extraction_cache: ExtractionCache | None = None
+        if self.config.get("extraction_cache", "papers_dir" in self.config):
+            self.extraction_cache = get_extraction_cache(
+                self.config.get("papers_dir", "papers")
+            )
 
     async def process(self, input_data: dict[str, Any]) -> dict[str, Any]:
         """处理 PDF 文档.
@@ -60,23 +76,8 @@ class PDFProcessingAgent(BaseAgent):
 
         try:
             # 调用 pdf-reader skill
-            skill_params = {
-                "pdf_source": file_path,
-                "method": options.get("method", "auto"),
-                "include_metadata": options.get("include_metadata", True),
-                "extract_images": options.get("extract_images", True),
-                "extract_tables": options.get("extract_tables", True),
-                "extract_formulas": options.get("extract_formulas", True),
-                "output_format": options.get("output_format", "markdown"),
-                "page_range": options.get("page_range"),
-            }
-
-            # 如果需要嵌入图片
-            if options.get("embed_images"):
-                skill_params["embed_images"] = True
-                skill_params["embed_options"] = options.get("embed_options", {})
-
-            result = await self.call_skill("pdf-reader", skill_params)
+            skill_params = self._build_skill_params(file_path, options)
+            result = await self._read_pdf(file_path, skill_params)
 
             if result["success"]:
                 # 提取元数据
@@ -90,22 +91,30 @@ class PDFProcessingAgent(BaseAgent):
                         options.get("paper_id") or "",
                     )
 
-                return {
-                    "success": True,
-                    "data": {
-                        "content": result["data"].get(
-                            "markdown", result["data"].get("content", "")
-                        ),
-                        "metadata": metadata,
-                        "images": result["data"].get("images", []),
-                        "tables": result["data"].get("tables", []),
-                        "formulas": result["data"].get("formulas", []),
-                        "page_count": result["data"].get("page_count", 0),
-                        "word_count": self._count_words(
-                            result["data"].get("content", "")
-                        ),
-                    },
+                data = {
+                    "content": result["data"].get(
+                        "markdown", result["data"].get("content", "")
+                    ),
+                    "metadata": metadata,
+                    "images": result["data"].get("images", []),
+                    "tables": result["data"].get("tables", []),
+                    "formulas": result["data"].get("formulas", []),
+                    "page_count": result["data"].get("page_count", 0),
+                    "total_pages": result["data"].get("total_pages", 0),
+                    "word_count": metadata["word_count"],
+                    "statistics": result["data"].get("statistics", {}),
                 }
+
+                # 逐页记录（增量处理新版本时使用）
+                for key in ("header", "pages"):
+                    if key in result["data"]:
+                        data[key] = result["data"][key]
+
+                # 流式写入模式下内容已写入文件，不在内存中返回
+                if "output_path" in result["data"]:
+                    data["output_path"] = result["data"]["output_path"]
+
+                return {"success": True, "data": data}
             else:
                 return result
 
@@ -113,6 +122,103 @@ class PDFProcessingAgent(BaseAgent):
             logger.error(f"Error extracting PDF content: {str(e)}")
             return {"success": False, "error": str(e)}
 
+    async def _read_pdf(
+        self, file_path: str | None, skill_params: dict[str, Any]
+    ) -> dict[str, Any]:
+        """调用 pdf-reader skill，优先使用提取缓存.
+
+        Args:
+            file_path: PDF 文件路径
+            skill_params: pdf-reader skill 参数
+
+        Returns:
+            skill 调用结果
+        """
+        cache = self.extraction_cache
+        if (
+            cache is None
+            or skill_params.get("output_path")
+            or not file_path
+            or not os.path.isfile(file_path)
+        ):
+            return await self.call_skill("pdf-reader", skill_params)
+
+        key = await cache.key_for(file_path, skill_params)
+        cached = await cache.get(key)
+        if cached is not None:
+            logger.info(f"Extraction cache hit for {file_path}")
+            return cached
+
+        result = await self.call_skill("pdf-reader", skill_params)
+        if result.get("success"):
+            await cache.put(key, result)
+        return result
+
+    async def stream_content(
+        self, params: dict[str, Any]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """逐页流式提取 PDF 内容.
+
+        Args:
+            params: 包含 file_path 和 options 的参数
+
+        Yields:
+            start 事件（元数据）、每页一个 page 事件（markdown、tables、stats），
+            最后是 complete 事件；失败时产出 error 事件
+        """
+        file_path = params.get("file_path")
+        options = {**self.default_options, **params.get("options", {})}
+
+        async for event in self.stream_skill(
+            "pdf-reader", self._build_skill_params(file_path, options)
+        ):
+            yield event
+
+    def _build_skill_params(
+        self, file_path: str | None, options: dict[str, Any]
+    ) -> dict[str, Any]:
+        """构建 pdf-reader skill 参数.
+
+        Args:
+            file_path: PDF 文件路径
+            options: 提取选项
+
+        Returns:
+            skill 参数
+        """
+        skill_params = {
+            "pdf_source": file_path,
+            "method": options.get("method", "auto"),
+            "include_metadata": options.get("include_metadata", True),
+            "extract_images": options.get("extract_images", True),
+            "extract_tables": options.get("extract_tables", True),
+            "extract_formulas": options.get("extract_formulas", True),
+            "output_format": options.get("output_format", "markdown"),
+            "page_range": options.get("page_range"),
+        }
+
+        # 图片写入 papers/images 下的内容寻址存储，跨论文去重
+        image_dir = options.get("image_dir") or self._default_image_dir()
+        if skill_params["extract_images"] and image_dir:
+            skill_params["image_dir"] = str(image_dir)
+
+        # 流式写入模式：逐页写入输出文件，并限制提取进程的内存
+        for key in ("output_path", "memory_budget_mb"):
+            if options.get(key):
+                skill_params[key] = options[key]
+
+        # 增量提取：复用旧版本中指纹未变的页面，并返回逐页记录
+        for key in ("reuse_pages", "include_pages"):
+            if options.get(key):
+                skill_params[key] = options[key]
+
+        # 如果需要嵌入图片
+        if options.get("embed_images"):
+            skill_params["embed_images"] = True
+            skill_params["embed_options"] = options.get("embed_options", {})
+
+        return skill_params
+
     async def batch_extract(
         self, file_paths: list[str], options: dict[str, Any] | None = None
     ) -> dict[str, Any]:
@@ -205,18 +311,31 @@ class PDFProcessingAgent(BaseAgent):
 
         # 添加统计信息
         metadata["page_count"] = data.get("page_count", 0)
-        metadata["word_count"] = self._count_words(data.get("content", ""))
+        # pdf-reader 在逐页分析时已统计词数，避免再次切分全文
+        metadata["word_count"] = (
+            data["word_count"]
+            if "word_count" in data
+            else self._count_words(data.get("content", ""))
+        )
         metadata["image_count"] = len(data.get("images", []))
         metadata["table_count"] = len(data.get("tables", []))
         metadata["formula_count"] = len(data.get("formulas", []))
 
         return metadata
 
+    def _default_image_dir(self) -> str | None:
+        """获取默认的图片存储目录（配置了 papers_dir 时为 papers/images）."""
+        papers_dir = self.config.get("papers_dir")
+        return os.path.join(papers_dir, "images") if papers_dir else None
+
     def _process_images(
         self, images: list[dict[str, Any]], pdf_path: str, paper_id: str | None = None
     ) -> list[dict[str, Any]]:
         """处理提取的图片信息.
 
+        已写入图片存储的图片按路径引用；超过 INLINE_IMAGE_MAX_BYTES 的内嵌
+        图片数据会写入图片存储，不在结果中内联。
+
         Args:
             images: 图片信息列表
             pdf_path: PDF 文件路径
@@ -226,6 +345,7 @@ class PDFProcessingAgent(BaseAgent):
             处理后的图片信息
         """
         processed_images = []
+        image_dir = self._default_image_dir()
 
         for img in images:
             processed_img = {
@@ -236,8 +356,32 @@ class PDFProcessingAgent(BaseAgent):
                 "size": img.get("size", [0, 0]),
             }
 
-            # 如果有嵌入的图片数据
-            if "data" in img:
+            if (
+                "data" in img
+                and image_dir
+                and len(img["data"]) > INLINE_IMAGE_MAX_BYTES
+                and "file_path" not in img
+            ):
+                # 大图片写入图片存储，按路径引用
+                path, _ = ImageStore(image_dir).put_bytes(
+                    base64.b64decode(img["data"]), processed_img["format"]
+                )
+                img = {**img, "file_path": str(path), "hash": path.stem}
+                img.pop("data")
+
+            if "file_path" in img:
+                # 图片已写入内容寻址存储，路径相对于 papers 目录
+                papers_dir = self.config.get("papers_dir")
+                processed_img["path"] = (
+                    os.path.relpath(img["file_path"], papers_dir)
+                    if papers_dir
+                    else img["file_path"]
+                )
+                processed_img["filename"] = os.path.basename(img["file_path"])
+                processed_img["hash"] = img.get("hash", "")
+                processed_img["embedded"] = False
+            elif "data" in img:
+                # 如果有嵌入的图片数据
                 processed_img["data"] = img["data"]
                 processed_img["embedded"] = True
             else:
@@ -284,19 +428,15 @@ class PDFProcessingAgent(BaseAgent):
         Returns:
             验证结果
         """
-        if not os.path.exists(file_path):
-            return {"valid": False, "error": "File does not exist"}
-
-        if not file_path.lower().endswith(".pdf"):
-            return {"valid": False, "error": "Not a PDF file"}
-
-        file_size = os.path.getsize(file_path)
-        if file_size == 0:
-            return {"valid": False, "error": "Empty file"}
+        # 只检查文件头、xref 和 trailer，不解析页面内容
+        result = await asyncio.to_thread(validate_pdf_file, file_path)
+        if not result["valid"]:
+            return {"valid": False, "error": result["error"]}
 
-        # 可以添加更多的 PDF 验证逻辑
         return {
             "valid": True,
-            "file_size": file_size,
+            "file_size": result["size"],
             "file_name": os.path.basename(file_path),
+            "page_count": result["pages"],
+            "version": result["version"],
         }
@@ -0,0 +1,647 @@
+"""PDF extraction backends - 可插拔的页面提取后端."""
+
+import hashlib
+import io
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Container
+from pathlib import Path
+from typing import Any
+
+import pdfplumber
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+
+from .image_store import ImageStore
+
+# pdfium 不是线程安全的，同一进程内的所有调用需要串行化
+_PDFIUM_LOCK = threading.RLock()
+
+# auto 模式下，页面中细线（表格框线）数量达到该值时使用版面分析后端
+RULING_THRESHOLD = 3
+# auto 模式下，页面矢量路径数量达到该值时视为复杂版面（图表、流程图等）
+COMPLEX_PATH_THRESHOLD = 200
+# 表格预筛：判定为框线的最大线宽（也是框线对齐的容差），以及网格内至少需要的字符数
+EDGE_TOLERANCE = 2
+MIN_TABLE_CHARS = 4
+# 宽或高小于该像素数的图片视为装饰（项目符号、分隔线），不提取
+MIN_IMAGE_SIDE = 16
+
+# 公式候选：数学符号（运算符、关系符、希腊字母等）
+MATH_SYMBOLS = frozenset(
+    "=+−×÷±∓·∑∏∫∮√∞∝≈≠≡≤≥≪≫∈∉∋⊂⊃⊆⊇∪∩∧∨¬∀∃∂∇′″→←↔⇒⇔"
+    "αβγδεζηθϑικλμνξπϖρϱσςτυφϕχψωΓΔΘΛΞΠΣΥΦΨΩ"
+)
+# 行尾的公式编号，如 "(3)" 或 "(2.1)"
+EQUATION_NUMBER = re.compile(r"\(\d+(\.\d+)*\)$")
+# 判定为公式候选行所需的数学符号数量及其占非空白字符的比例
+MIN_FORMULA_SYMBOLS = 2
+MIN_FORMULA_DENSITY = 0.08
+# 缩略图 JPEG 质量
+THUMBNAIL_QUALITY = 80
+
+
+def _is_math_symbol(char: str) -> bool:
+    """判断字符是否为数学符号（含 Unicode 数学字母数字符号区块）."""
+    return char in MATH_SYMBOLS or 0x1D400 <= ord(char) <= 0x1D7FF
+
+
+def analyze_text(text: str) -> dict[str, Any]:
+    """单次遍历页面文本，统计词数、行数并识别公式候选行.
+
+    Args:
+        text: 页面文本
+
+    Returns:
+        包含 word_count、line_count 和 formulas 的字典
+    """
+    word_count = 0
+    line_count = 0
+    formulas = []
+    for line in text.splitlines():
+        words = line.split()
+        if not words:
+            continue
+        line_count += 1
+        word_count += len(words)
+
+        stripped = line.strip()
+        symbols = sum(1 for char in stripped if _is_math_symbol(char))
+        visible = sum(len(word) for word in words)
+        if symbols >= MIN_FORMULA_SYMBOLS and symbols / visible >= MIN_FORMULA_DENSITY:
+            formulas.append(stripped)
+        elif symbols and EQUATION_NUMBER.search(stripped):
+            formulas.append(stripped)
+    return {"word_count": word_count, "line_count": line_count, "formulas": formulas}
+
+
+def page_fingerprint(text: str) -> str:
+    """计算页面文本层指纹（忽略空白差异）.
+
+    指纹只取决于页面文字，与页码和排版无关，同一论文的新版本中未修改的
+    页面指纹不变。
+
+    Args:
+        text: 页面文本
+
+    Returns:
+        十六进制指纹
+    """
+    normalized = " ".join(text.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+
+def render_page_thumbnail(file_path: str, index: int, width: int) -> dict[str, Any]:
+    """使用 pdfium 将页面渲染为指定宽度的 JPEG 缩略图（在 worker 中执行）.
+
+    Args:
+        file_path: PDF 文件路径
+        index: 页面索引（0 起始）
+        width: 缩略图宽度（像素）
+
+    Returns:
+        包含 page_count 和 image（JPEG 数据，页码越界时为 None）的字典
+    """
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            page_count = len(pdf)
+            if not 0 <= index < page_count:
+                return {"page_count": page_count, "image": None}
+            page = pdf[index]
+            bitmap = page.render(scale=width / page.get_width())
+            image = bitmap.to_pil().convert("RGB")
+            bitmap.close()
+            page.close()
+        finally:
+            pdf.close()
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=THUMBNAIL_QUALITY, optimize=True)
+    return {"page_count": page_count, "image": buffer.getvalue()}
+
+
+def build_page_result(
+    index: int,
+    text: str,
+    tables: list[list[list[str]]],
+    tables_scanned: bool,
+) -> dict[str, Any]:
+    """构建页面结果，文本只分析一次.
+
+    Args:
+        index: 页面索引（0 起始）
+        text: 页面文本
+        tables: 结构化表格（行列表）
+        tables_scanned: 是否运行了表格查找
+
+    Returns:
+        页面结果
+    """
+    analysis = analyze_text(text)
+    return {
+        "page": index + 1,
+        "text": text,
+        "tables": tables,
+        "tables_scanned": tables_scanned,
+        "formulas": analysis["formulas"],
+        "word_count": analysis["word_count"],
+        "counts": {
+            "words": analysis["word_count"],
+            "lines": analysis["line_count"],
+            "tables": len(tables),
+            "formulas": len(analysis["formulas"]),
+            "images": 0,
+        },
+    }
+
+
+def _edge_orientation(x0: float, top: float, x1: float, bottom: float) -> str | None:
+    """判断线段是水平（h）还是垂直（v）框线."""
+    if abs(bottom - top) <= EDGE_TOLERANCE and abs(x1 - x0) > EDGE_TOLERANCE:
+        return "h"
+    if abs(x1 - x0) <= EDGE_TOLERANCE and abs(bottom - top) > EDGE_TOLERANCE:
+        return "v"
+    return None
+
+
+def _add_edge(
+    edges: dict[str, list[tuple[float, float, float]]],
+    x0: float,
+    top: float,
+    x1: float,
+    bottom: float,
+) -> None:
+    """按方向记录框线，水平线为 (y, x0, x1)，垂直线为 (x, top, bottom)."""
+    orientation = _edge_orientation(x0, top, x1, bottom)
+    if orientation == "h":
+        edges["h"].append(((top + bottom) / 2, x0, x1))
+    elif orientation == "v":
+        edges["v"].append(((x0 + x1) / 2, top, bottom))
+
+
+def _distinct_positions(values: list[float]) -> int:
+    """统计去除容差内重复后的坐标个数."""
+    count = 0
+    last = None
+    for value in sorted(values):
+        if last is None or value - last > EDGE_TOLERANCE:
+            count += 1
+        last = value
+    return count
+
+
+def _grid_boxes(
+    edges: dict[str, list[tuple[float, float, float]]],
+) -> list[tuple[float, float, float, float]]:
+    """把相交的框线连成网格，返回至少构成 2×2 单元格的网格外框.
+
+    至少需要三条不同位置的水平线和三条不同位置的垂直线彼此相交；单个边框
+    （图片外框、文本框、高亮）只有两条水平线和两条垂直线，不会被当作表格。
+    """
+    horizontal, vertical = edges["h"], edges["v"]
+    n = len(horizontal)
+    parent = list(range(n + len(vertical)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, (y, x0, x1) in enumerate(horizontal):
+        for j, (x, top, bottom) in enumerate(vertical):
+            if (
+                x0 - EDGE_TOLERANCE <= x <= x1 + EDGE_TOLERANCE
+                and top - EDGE_TOLERANCE <= y <= bottom + EDGE_TOLERANCE
+            ):
+                parent[find(i)] = find(n + j)
+
+    groups: dict[int, tuple[list, list]] = {}
+    for i, edge in enumerate(horizontal):
+        groups.setdefault(find(i), ([], []))[0].append(edge)
+    for j, edge in enumerate(vertical):
+        groups.setdefault(find(n + j), ([], []))[1].append(edge)
+
+    boxes = []
+    for h_edges, v_edges in groups.values():
+        if (
+            _distinct_positions([e[0] for e in h_edges]) < 3
+            or _distinct_positions([e[0] for e in v_edges]) < 3
+        ):
+            continue
+        boxes.append(
+            (
+                min(e[0] for e in v_edges),
+                min(e[0] for e in h_edges),
+                max(e[0] for e in v_edges),
+                max(e[0] for e in h_edges),
+            )
+        )
+    return boxes
+
+
+def is_table_candidate(page: Any) -> bool:
+    """用框线、矩形和字符密度廉价地判断页面是否可能包含表格.
+
+    只有相交的框线至少围成 2×2 单元格网格（三条水平线、三条垂直线）时才
+    运行完整的表格查找；单个边框（图片外框、文本框、高亮）不满足该条件。
+    网格内几乎没有字符的页面（装饰线、流程图）同样跳过。
+
+    Args:
+        page: pdfplumber 页面对象
+
+    Returns:
+        是否需要运行表格查找
+    """
+    edges: dict[str, list[tuple[float, float, float]]] = {"h": [], "v": []}
+
+    for line in page.lines:
+        _add_edge(edges, line["x0"], line["top"], line["x1"], line["bottom"])
+
+    for rect in page.rects:
+        x0, top, x1, bottom = rect["x0"], rect["top"], rect["x1"], rect["bottom"]
+        if _edge_orientation(x0, top, x1, bottom):
+            _add_edge(edges, x0, top, x1, bottom)
+        else:
+            # 普通矩形的四条边都可以作为单元格边框
+            _add_edge(edges, x0, top, x1, top)
+            _add_edge(edges, x0, bottom, x1, bottom)
+            _add_edge(edges, x0, top, x0, bottom)
+            _add_edge(edges, x1, top, x1, bottom)
+
+    for curve in page.curves:
+        points = curve.get("pts") or []
+        for (x0, y0), (x1, y1) in zip(points, points[1:], strict=False):
+            _add_edge(edges, min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+
+    if len(edges["h"]) < 3 or len(edges["v"]) < 3:
+        return False
+
+    # 网格区域内的字符密度
+    for left, top, right, bottom in _grid_boxes(edges):
+        chars = 0
+        for char in page.chars:
+            if (
+                left <= char["x0"]
+                and char["x1"] <= right
+                and top <= char["top"]
+                and char["bottom"] <= bottom
+            ):
+                chars += 1
+                if chars >= MIN_TABLE_CHARS:
+                    return True
+    return False
+
+
+class ExtractionBackend(ABC):
+    """页面提取后端基类，在 worker 进程中按文档打开."""
+
+    name = ""
+
+    def __init__(self, file_path: str) -> None:
+        """打开文档.
+
+        Args:
+            file_path: PDF 文件路径
+        """
+        self.file_path = file_path
+
+    @abstractmethod
+    def extract_page(self, index: int, options: dict[str, Any]) -> dict[str, Any]:
+        """提取单个页面.
+
+        Args:
+            index: 页面索引（0 起始）
+            options: 提取选项
+
+        Returns:
+            build_page_result 构建的页面结果，另含 image_boxes
+        """
+
+    @abstractmethod
+    def close(self) -> None:
+        """关闭文档."""
+
+    def __enter__(self) -> "ExtractionBackend":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class LayoutBackend(ExtractionBackend):
+    """基于 pdfplumber 版面分析的后端，支持表格提取，速度较慢."""
+
+    name = "layout"
+
+    def __init__(self, file_path: str) -> None:
+        super().__init__(file_path)
+        self._pdf = pdfplumber.open(file_path)
+
+    def extract_page(self, index: int, options: dict[str, Any]) -> dict[str, Any]:
+        page = self._pdf.pages[index]
+        text = page.extract_text() or ""
+
+        tables: list[list[list[str]]] = []
+        # 仅对预筛选出的候选页面运行代价较高的表格查找
+        tables_scanned = options.get("extract_tables", True) and is_table_candidate(
+            page
+        )
+        if tables_scanned:
+            for table in page.extract_tables():
+                if table:
+                    # Filter out None values and ensure all cells are strings
+                    tables.append(
+                        [
+                            [str(cell) if cell is not None else "" for cell in row]
+                            for row in table
+                        ]
+                    )
+
+        # 图片框来自已解析的页面对象，无需再次遍历
+        image_boxes = [
+            [
+                round(image["x0"], 2),
+                round(float(page.height) - image["bottom"], 2),
+                round(image["x1"], 2),
+                round(float(page.height) - image["top"], 2),
+            ]
+            for image in page.images
+        ]
+
+        # 释放页面的布局缓存，避免 worker 内存持续增长
+        page.close()
+        result = build_page_result(index, text, tables, tables_scanned)
+        result["image_boxes"] = image_boxes
+        result["counts"]["images"] = len(image_boxes)
+        return result
+
+    def close(self) -> None:
+        self._pdf.close()
+
+
+class FastBackend(ExtractionBackend):
+    """基于 pypdfium2 文本层的快速后端，不做版面分析，不提取表格."""
+
+    name = "fast"
+
+    def __init__(self, file_path: str) -> None:
+        super().__init__(file_path)
+        with _PDFIUM_LOCK:
+            self._pdf = pdfium.PdfDocument(file_path)
+
+    def scan(
+        self,
+        index: int,
+        options: dict[str, Any],
+        store: ImageStore | None = None,
+        method: str = "fast",
+        reuse: Container[str] = (),
+    ) -> dict[str, Any]:
+        """单次遍历页面对象：统计框线和矢量路径、收集图片，计算文本层指纹.
+
+        Args:
+            index: 页面索引（0 起始）
+            options: 提取选项
+            store: 图片存储，为空时只收集图片框，不写入图片
+            method: fast 时总是返回文本；auto 时仅在无需版面分析时返回文本；
+                layout 时不返回文本
+            reuse: 可复用的页面指纹，命中时跳过页面对象遍历
+
+        Returns:
+            包含 fingerprint、reused、needs_layout、image_boxes、images 和
+            text（未使用时为 None）的字典
+        """
+        rulings = 0
+        paths = 0
+        image_boxes: list[list[float]] = []
+        images: list[dict[str, Any]] = []
+        with _PDFIUM_LOCK:
+            page = self._pdf[index]
+            textpage = page.get_textpage()
+            # pdfium 使用 CRLF 换行，并以 \x02 标记行尾断字连字符
+            text = (
+                textpage.get_text_bounded().replace("\r\n", "\n").replace("\x02", "-")
+            )
+            textpage.close()
+            fingerprint = page_fingerprint(text)
+            if fingerprint in reuse:
+                page.close()
+                return {
+                    "fingerprint": fingerprint,
+                    "reused": True,
+                    "needs_layout": False,
+                    "image_boxes": image_boxes,
+                    "images": images,
+                    "text": None,
+                }
+
+            for obj in page.get_objects(
+                filter=(pdfium_c.FPDF_PAGEOBJ_PATH, pdfium_c.FPDF_PAGEOBJ_IMAGE),
+                max_depth=3,
+            ):
+                left, bottom, right, top = obj.get_bounds()
+                if obj.type == pdfium_c.FPDF_PAGEOBJ_PATH:
+                    paths += 1
+                    # 细长的水平或垂直路径视为表格框线
+                    if (
+                        min(right - left, top - bottom) < 2
+                        and max(right - left, top - bottom) > 20
+                    ):
+                        rulings += 1
+                    continue
+
+                width, height = obj.get_px_size()
+                if min(width, height) < MIN_IMAGE_SIDE:
+                    continue
+                bbox = [round(v, 2) for v in (left, bottom, right, top)]
+                image_boxes.append(bbox)
+                if store is not None:
+                    images.append(
+                        self._store_image(obj, store, index, bbox, len(images))
+                    )
+            page.close()
+
+        needs_layout = paths >= COMPLEX_PATH_THRESHOLD or (
+            options.get("extract_tables", True) and rulings >= RULING_THRESHOLD
+        )
+        use_text = method == "fast" or (method == "auto" and not needs_layout)
+        return {
+            "fingerprint": fingerprint,
+            "reused": False,
+            "needs_layout": needs_layout,
+            "image_boxes": image_boxes,
+            "images": images,
+            "text": text if use_text else None,
+        }
+
+    @staticmethod
+    def _store_image(
+        obj: Any, store: ImageStore, index: int, bbox: list[float], position: int
+    ) -> dict[str, Any]:
+        """将图片对象写入内容寻址存储.
+
+        图片按原始编码数据计算哈希，已存在于存储中的图片不会重复解码和写入。
+        """
+        width, height = obj.get_px_size()
+        key = store.make_key(
+            ",".join(obj.get_filters()).encode(),
+            f"{width}x{height}".encode(),
+            bytes(obj.get_data(decode_simple=False)),
+        )
+
+        def write(prefix: Path) -> Path:
+            obj.extract(prefix, fb_format="png")
+            return next(prefix.parent.glob(f"{prefix.name}.*"))
+
+        path, new = store.put(key, write)
+        return {
+            "index": position,
+            "page": index + 1,
+            "hash": key,
+            "file_path": str(path),
+            "format": path.suffix.lstrip("."),
+            "size": [width, height],
+            "bbox": bbox,
+            "new": new,
+        }
+
+    def page_result(self, index: int, scan: dict[str, Any]) -> dict[str, Any]:
+        """根据 scan 结果构建页面结果.
+
+        Args:
+            index: 页面索引（0 起始）
+            scan: 包含文本的 scan 结果
+
+        Returns:
+            页面结果
+        """
+        result = build_page_result(index, scan["text"] or "", [], False)
+        result["image_boxes"] = scan["image_boxes"]
+        result["counts"]["images"] = len(scan["image_boxes"])
+        return result
+
+    def extract_page(self, index: int, options: dict[str, Any]) -> dict[str, Any]:
+        return self.page_result(index, self.scan(index, options))
+
+    def needs_layout(self, index: int, options: dict[str, Any]) -> bool:
+        """判断页面是否需要版面分析（存在表格框线或复杂矢量图形）.
+
+        Args:
+            index: 页面索引（0 起始）
+            options: 提取选项
+
+        Returns:
+            是否应使用版面分析后端
+        """
+        return self.scan(index, options, method="layout")["needs_layout"]
+
+    def close(self) -> None:
+        with _PDFIUM_LOCK:
+            self._pdf.close()
+
+
+BACKENDS: dict[str, type[ExtractionBackend]] = {
+    LayoutBackend.name: LayoutBackend,
+    FastBackend.name: FastBackend,
+}
+
+METHODS = ("auto", *BACKENDS)
+
+
+def register_backend(backend: type[ExtractionBackend]) -> None:
+    """注册提取后端，注册后可通过 method 参数选择.
+
+    Args:
+        backend: 后端类
+    """
+    BACKENDS[backend.name] = backend
+
+
+class PageExtractor:
+    """按 method 为每个页面选择后端的提取器，后端按需打开."""
+
+    def __init__(self, file_path: str, method: str = "auto") -> None:
+        """初始化提取器.
+
+        Args:
+            file_path: PDF 文件路径
+            method: auto 或已注册的后端名称
+        """
+        if method != "auto" and method not in BACKENDS:
+            raise ValueError(f"Unsupported extraction method: {method}")
+        self.file_path = file_path
+        self.method = method
+        self._backends: dict[str, ExtractionBackend] = {}
+        self._image_store: ImageStore | None = None
+
+    def _backend(self, name: str) -> ExtractionBackend:
+        """获取（必要时打开）指定后端."""
+        if name not in self._backends:
+            self._backends[name] = BACKENDS[name](self.file_path)
+        return self._backends[name]
+
+    def _fast(self) -> FastBackend:
+        """获取 pdfium 后端（用于页面对象遍历）."""
+        fast = self._backend(FastBackend.name)
+        assert isinstance(fast, FastBackend)
+        return fast
+
+    def extract_page(self, index: int, options: dict[str, Any]) -> dict[str, Any]:
+        """分析并提取页面.
+
+        每个页面的 pdfium 对象只遍历一次：同一次遍历决定 auto 模式使用的后端、
+        收集图片框并写入图片；文本也只分析一次，同时得到词数、行数和公式候选。
+
+        Args:
+            index: 页面索引（0 起始）
+            options: 提取选项
+
+        Returns:
+            页面结果，backend 字段记录实际使用的后端，fingerprint 为文本层
+            指纹；指定 image_dir 且 extract_images 为真时，images 字段包含
+            写入图片存储的图片。指纹在 options["reuse_fingerprints"] 中时只
+            返回 page、fingerprint 和 reused 标记，不做提取
+        """
+        store = None
+        if options.get("extract_images", True) and options.get("image_dir"):
+            if self._image_store is None:
+                self._image_store = ImageStore(options["image_dir"])
+            store = self._image_store
+
+        # 每页都计算文本层指纹；与旧版本相同的页面由调用方拼接已有结果
+        reuse = frozenset(options.get("reuse_fingerprints") or ())
+        scan = self._fast().scan(index, options, store, self.method, reuse)
+        if scan["reused"]:
+            return {
+                "page": index + 1,
+                "fingerprint": scan["fingerprint"],
+                "reused": True,
+                "backend": "reused",
+            }
+
+        if scan["text"] is not None:
+            name = FastBackend.name
+            result = self._fast().page_result(index, scan)
+        else:
+            name = LayoutBackend.name if self.method == "auto" else self.method
+            result = self._backend(name).extract_page(index, options)
+        result["backend"] = name
+        result["images"] = scan["images"]
+        result["fingerprint"] = scan["fingerprint"]
+        result["reused"] = False
+        return result
+
+    def close(self) -> None:
+        """关闭所有已打开的后端."""
+        for backend in self._backends.values():
+            backend.close()
+        self._backends.clear()
+
+    def __enter__(self) -> "PageExtractor":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
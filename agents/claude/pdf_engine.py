@@ -0,0 +1,389 @@
+"""PDF extraction engine - 将 PDF 页面分片到进程池中并行提取."""
+
+import asyncio
+import gc
+import itertools
+import logging
+import math
+import os
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+import pdfplumber
+
+from agents.core.exceptions import MemoryBudgetExceededError
+from agents.core.utils import get_rss_bytes
+
+from .pdf_backends import PageExtractor, render_page_thumbnail
+
+logger = logging.getLogger(__name__)
+
+# 提取结果的格式或内容发生变化时递增，使已缓存的结果失效
+EXTRACTOR_VERSION = "7"
+
+
+def default_worker_count() -> int:
+    """获取默认的 worker 数量.
+
+    Returns:
+        PDF_WORKERS 环境变量的值，未设置时为 CPU 数（最多 4 个）
+    """
+    env_value = os.getenv("PDF_WORKERS")
+    if env_value is not None:
+        return max(0, int(env_value))
+    return min(4, os.cpu_count() or 1)
+
+
+def resolve_page_range(page_range: Any, page_count: int) -> tuple[int, int]:
+    """将 [start, end] 页码范围（0 起始，包含 end）转换为切片边界.
+
+    Args:
+        page_range: 可选的 [start, end] 页码范围
+        page_count: 文档总页数
+
+    Returns:
+        (start, end) 切片边界，end 不包含
+    """
+    if page_range and len(page_range) >= 2:
+        start_page = max(0, int(page_range[0]))
+        end_page = min(page_count, int(page_range[1]) + 1)
+    else:
+        start_page = 0
+        end_page = page_count
+    return start_page, max(start_page, end_page)
+
+
+def read_document_info(file_path: str) -> dict[str, Any]:
+    """读取文档元数据和总页数（在 worker 中执行）.
+
+    Args:
+        file_path: PDF 文件路径
+
+    Returns:
+        包含 metadata 和 page_count 的字典
+    """
+    with pdfplumber.open(file_path) as pdf:
+        metadata = {}
+        if hasattr(pdf, "metadata") and pdf.metadata:
+            metadata = {
+                "title": pdf.metadata.get("Title", ""),
+                "author": pdf.metadata.get("Author", ""),
+                "creator": pdf.metadata.get("Creator", ""),
+                "producer": pdf.metadata.get("Producer", ""),
+                "creation_date": str(pdf.metadata.get("CreationDate", "")),
+                "modification_date": str(pdf.metadata.get("ModDate", "")),
+            }
+        return {"metadata": metadata, "page_count": len(pdf.pages)}
+
+
+def extract_page_shard(
+    file_path: str, start: int, end: int, options: dict[str, Any]
+) -> list[dict[str, Any]]:
+    """提取 [start, end) 范围内的页面（在 worker 中执行）.
+
+    设置 memory_budget_mb 时，每页提取后检查进程 RSS：超出预算先关闭文档
+    释放解析缓存，仍超出则抛出 MemoryBudgetExceededError。
+
+    Args:
+        file_path: PDF 文件路径
+        start: 起始页索引（包含）
+        end: 结束页索引（不包含）
+        options: 提取选项
+
+    Returns:
+        按页码排序的页面结果列表，rss_bytes 为提取该页后的进程 RSS
+    """
+    budget = int(options.get("memory_budget_mb") or 0) * 1024 * 1024
+    results = []
+    with PageExtractor(file_path, options.get("method") or "auto") as extractor:
+        for index in range(start, end):
+            page = extractor.extract_page(index, options)
+            rss = get_rss_bytes()
+            if budget and rss > budget:
+                # 关闭文档以释放 pdfminer/pdfium 的对象缓存，后续页面按需重新打开
+                extractor.close()
+                gc.collect()
+                rss = get_rss_bytes()
+                if rss > budget:
+                    raise MemoryBudgetExceededError(
+                        f"PDF extraction exceeded memory budget on page {index + 1}: "
+                        f"{rss / 1024 / 1024:.1f} MB > {budget / 1024 / 1024:.0f} MB"
+                    )
+            page["rss_bytes"] = rss
+            results.append(page)
+    return results
+
+
+class PDFExtractionEngine:
+    """将 PDF 页面分片到进程池中并行提取的引擎."""
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        pages_per_shard: int = 8,
+        max_in_flight: int | None = None,
+    ) -> None:
+        """初始化提取引擎.
+
+        Args:
+            max_workers: 进程池大小，0 表示在线程中执行（不使用进程池）
+            pages_per_shard: 每个分片的最大页数
+            max_in_flight: 单个文档同时提交的最大分片数，默认为 worker 数的两倍
+        """
+        self.max_workers = (
+            default_worker_count() if max_workers is None else max(0, max_workers)
+        )
+        self.pages_per_shard = max(1, pages_per_shard)
+        if max_in_flight is None:
+            max_in_flight = 2 * max(1, self.max_workers)
+        self.max_in_flight = max(1, max_in_flight)
+        self._executor: Executor | None = None
+        self._stats: dict[str, Any] = {"documents": 0, "pages": 0, "seconds": 0.0}
+
+    def _get_executor(self) -> Executor | None:
+        """获取（必要时创建）进程池."""
+        if self.max_workers == 0:
+            return None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def _run(self, func: Any, *args: Any) -> Any:
+        """在进程池中执行函数，进程池损坏时重建.
+
+        Args:
+            func: 需要执行的模块级函数
+            *args: 函数参数
+
+        Returns:
+            函数返回值
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        except BrokenProcessPool:
+            logger.warning("PDF worker pool broken, recreating on next call")
+            self._executor = None
+            raise
+
+    def plan_shards(self, start: int, end: int) -> list[tuple[int, int]]:
+        """将页面范围划分为分片.
+
+        Args:
+            start: 起始页索引（包含）
+            end: 结束页索引（不包含）
+
+        Returns:
+            (start, end) 分片列表
+        """
+        total = end - start
+        if total <= 0:
+            return []
+        workers = max(1, self.max_workers)
+        shard_size = min(self.pages_per_shard, math.ceil(total / workers))
+        return [
+            (shard_start, min(shard_start + shard_size, end))
+            for shard_start in range(start, end, shard_size)
+        ]
+
+    async def get_document_info(self, file_path: str) -> dict[str, Any]:
+        """读取文档元数据和总页数.
+
+        Args:
+            file_path: PDF 文件路径
+
+        Returns:
+            包含 metadata 和 page_count 的字典
+        """
+        return await self._run(read_document_info, file_path)
+
+    async def render_thumbnail(
+        self, file_path: str, index: int, width: int
+    ) -> dict[str, Any]:
+        """在 worker 中渲染页面缩略图.
+
+        Args:
+            file_path: PDF 文件路径
+            index: 页面索引（0 起始）
+            width: 缩略图宽度（像素）
+
+        Returns:
+            包含 page_count 和 image（JPEG 数据，页码越界时为 None）的字典
+        """
+        return await self._run(render_page_thumbnail, file_path, index, width)
+
+    async def iter_pages(
+        self,
+        file_path: str,
+        options: dict[str, Any] | None = None,
+        info: dict[str, Any] | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """按页码顺序逐页产出提取结果，每个分片完成后立即产出.
+
+        最多 max_in_flight 个分片同时提交到进程池，后续分片在消费者处理前面
+        页面时仍在并行提取，同时已完成但未消费的结果数量有上限，内存占用与
+        文档页数无关。消费者提前退出时，尚未完成的分片会被取消。
+
+        Args:
+            file_path: PDF 文件路径
+            options: 提取选项（page_range、extract_tables、method、memory_budget_mb）
+            info: 已读取的文档信息，为空时自动读取
+
+        Yields:
+            单页提取结果
+        """
+        options = options or {}
+        started = time.perf_counter()
+
+        if info is None:
+            info = await self.get_document_info(file_path)
+        start_page, end_page = resolve_page_range(
+            options.get("page_range"), info["page_count"]
+        )
+
+        shards = iter(self.plan_shards(start_page, end_page))
+        tasks: deque[asyncio.Future[Any]] = deque()
+
+        def submit() -> None:
+            for start, end in itertools.islice(shards, self.max_in_flight - len(tasks)):
+                tasks.append(
+                    asyncio.ensure_future(
+                        self._run(extract_page_shard, file_path, start, end, options)
+                    )
+                )
+
+        page_count = 0
+        try:
+            submit()
+            while tasks:
+                pages = await tasks.popleft()
+                submit()
+                for page in pages:
+                    page_count += 1
+                    yield page
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._record(page_count, time.perf_counter() - started)
+
+    async def extract(
+        self, file_path: str, options: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """并行提取 PDF 页面，并按页码顺序重组结果.
+
+        Args:
+            file_path: PDF 文件路径
+            options: 提取选项（page_range、extract_tables、method、memory_budget_mb）
+
+        Returns:
+            包含 metadata、pages 和 stats 的提取结果
+        """
+        options = options or {}
+        started = time.perf_counter()
+
+        info = await self.get_document_info(file_path)
+        start_page, end_page = resolve_page_range(
+            options.get("page_range"), info["page_count"]
+        )
+        pages = [page async for page in self.iter_pages(file_path, options, info)]
+        elapsed = time.perf_counter() - started
+        peak_rss = max([get_rss_bytes()] + [page["rss_bytes"] for page in pages])
+
+        return {
+            "metadata": info["metadata"],
+            "total_pages": info["page_count"],
+            "start_page": start_page,
+            "end_page": end_page,
+            "pages": pages,
+            "stats": self.document_stats(
+                len(pages),
+                len(self.plan_shards(start_page, end_page)),
+                elapsed,
+                peak_rss,
+            ),
+        }
+
+    def _record(self, page_count: int, elapsed: float) -> None:
+        """记录一次文档提取的统计数据."""
+        self._stats["documents"] += 1
+        self._stats["pages"] += page_count
+        self._stats["seconds"] += elapsed
+
+    def document_stats(
+        self,
+        page_count: int,
+        shard_count: int,
+        elapsed: float,
+        peak_rss_bytes: int = 0,
+    ) -> dict[str, Any]:
+        """构建单个文档的提取统计.
+
+        Args:
+            page_count: 已提取页数
+            shard_count: 分片数量
+            elapsed: 耗时（秒）
+            peak_rss_bytes: 提取期间观测到的峰值 RSS
+
+        Returns:
+            统计信息字典
+        """
+        return {
+            "workers": self.max_workers,
+            "shards": shard_count,
+            "pages": page_count,
+            "processing_time": round(elapsed, 3),
+            "pages_per_second": round(page_count / elapsed, 2) if elapsed > 0 else 0,
+            "peak_rss_mb": round(peak_rss_bytes / 1024 / 1024, 1),
+        }
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取引擎累计统计信息.
+
+        Returns:
+            worker 数量、处理文档数、页数以及 pages/s
+        """
+        seconds = self._stats["seconds"]
+        return {
+            "workers": self.max_workers,
+            "documents": self._stats["documents"],
+            "pages": self._stats["pages"],
+            "seconds": round(seconds, 3),
+            "pages_per_second": round(self._stats["pages"] / seconds, 2)
+            if seconds > 0
+            else 0,
+        }
+
+    def shutdown(self) -> None:
+        """关闭进程池."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+_engine: PDFExtractionEngine | None = None
+
+
+def get_extraction_engine() -> PDFExtractionEngine:
+    """获取进程级共享的提取引擎.
+
+    Returns:
+        PDFExtractionEngine 实例
+    """
+    global _engine
+    if _engine is None:
+        _engine = PDFExtractionEngine(
+            pages_per_shard=int(os.getenv("PDF_PAGES_PER_SHARD", "8"))
+        )
+    return _engine
+
+
+def shutdown_extraction_engine() -> None:
+    """关闭共享提取引擎的进程池."""
+    global _engine
+    if _engine is not None:
+        _engine.shutdown()
+        _engine = None
@@ -0,0 +1,410 @@
+"""LLM rate limiter - 进程级令牌桶限流和并发控制."""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """按分钟配额持续补充的令牌桶（由调用方加锁）."""
+
+    def __init__(self, per_minute: float) -> None:
+        """初始化令牌桶，初始为满.
+
+        Args:
+            per_minute: 每分钟补充的令牌数，同时也是桶容量
+        """
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount: float, now: float) -> float:
+        """计算取出 amount 个令牌前需要等待的秒数.
+
+        Args:
+            amount: 令牌数（超过容量时按容量计）
+            now: 当前 time.monotonic()
+
+        Returns:
+            等待秒数，可立即取出时为 0
+        """
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float, now: float) -> None:
+        """取出令牌.
+
+        Args:
+            amount: 令牌数（超过容量时按容量计）
+            now: 当前 time.monotonic()
+        """
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+
+
+# 表示服务端限流或过载的 HTTP 状态码
+OVERLOAD_STATUS = frozenset({429, 529})
+
+
+def is_overload(error: BaseException) -> bool:
+    """判断异常是否表示服务端限流（429）或过载（529）.
+
+    Args:
+        error: 调用抛出的异常
+
+    Returns:
+        是否为过载错误
+    """
+    return getattr(error, "status_code", None) in OVERLOAD_STATUS
+
+
+class AIMDController:
+    """加性增、乘性减（AIMD）的自适应并发上限.
+
+    并发已用满且延迟正常时，每完成约 limit 次调用上限加 1；遇到 429/529
+    时上限减半，近期延迟超过基线延迟的 latency_tolerance 倍时上限乘以
+    latency_backoff。每个往返时间内最多下调一次，避免同一批失败连续下调。
+    """
+
+    # 近期延迟和基线延迟的 EWMA 系数
+    RECENT_WEIGHT = 0.3
+    BASELINE_WEIGHT = 0.05
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        backoff: float = 0.5,
+        latency_backoff: float = 0.75,
+        latency_tolerance: float = 2.0,
+        warmup: int = 5,
+    ) -> None:
+        """初始化控制器.
+
+        Args:
+            initial: 初始并发上限
+            min_limit: 并发上限的最小值
+            max_limit: 并发上限的最大值
+            backoff: 遇到 429/529 时的下调系数
+            latency_backoff: 延迟升高时的下调系数
+            latency_tolerance: 近期延迟与基线延迟之比超过该值时视为拥塞
+            warmup: 开始按延迟下调前需要的样本数
+        """
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, min_limit)
+        self.limit = float(min(max(initial, min_limit), self.max_limit))
+        self.backoff = backoff
+        self.latency_backoff = latency_backoff
+        self.latency_tolerance = latency_tolerance
+        self.warmup = warmup
+        self.increases = 0
+        self.decreases = 0
+        self._samples = 0
+        self._recent: float | None = None
+        self._baseline: float | None = None
+        self._last_decrease = 0.0
+
+    @property
+    def current(self) -> int:
+        """当前并发上限."""
+        return max(self.min_limit, int(self.limit))
+
+    def on_success(self, latency: float, saturated: bool) -> None:
+        """记录一次成功调用.
+
+        Args:
+            latency: 调用耗时（秒，不含排队时间）
+            saturated: 调用开始时并发是否已用满
+        """
+        self._samples += 1
+        if self._recent is None or self._baseline is None:
+            self._recent = self._baseline = latency
+        else:
+            self._recent += (latency - self._recent) * self.RECENT_WEIGHT
+            self._baseline += (latency - self._baseline) * self.BASELINE_WEIGHT
+
+        if (
+            self._samples > self.warmup
+            and self._recent > self._baseline * self.latency_tolerance
+        ):
+            self._decrease(self.latency_backoff)
+        elif saturated and self.limit < self.max_limit:
+            before = self.current
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            if self.current > before:
+                self.increases += 1
+
+    def on_overload(self) -> None:
+        """记录一次 429/529 错误."""
+        self._decrease(self.backoff)
+
+    def _decrease(self, factor: float) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < (self._recent or 1.0):
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_limit), self.limit * factor)
+        self.decreases += 1
+        logger.info(f"LLM concurrency limit lowered to {self.current}")
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取控制器统计信息.
+
+        Returns:
+            当前上限、上调和下调次数以及近期和基线延迟（毫秒）
+        """
+        return {
+            "limit": self.current,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "recent_latency_ms": round((self._recent or 0) * 1000, 1),
+            "baseline_latency_ms": round((self._baseline or 0) * 1000, 1),
+        }
+
+
+class _Waiter:
+    """排队中的一次调用."""
+
+    __slots__ = ("future", "tokens", "granted")
+
+    def __init__(self, future: asyncio.Future[None], tokens: int) -> None:
+        self.future = future
+        self.tokens = tokens
+        self.granted = False
+
+
+def _wake(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class LLMGovernor:
+    """进程级 LLM 调用限流器.
+
+    同时限制每分钟请求数、每分钟输入 token 数和同时进行中的调用数，
+    调用按到达顺序（FIFO）放行。不依赖特定事件循环，可在多个事件循环
+    之间共享。限制值为 0 表示不限制。配置 AIMDController 时，同时进行中的
+    调用数上限由控制器根据调用延迟和 429/529 错误动态调整。
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 0,
+        input_tokens_per_minute: int = 0,
+        max_in_flight: int = 0,
+        controller: AIMDController | None = None,
+    ) -> None:
+        """初始化限流器.
+
+        Args:
+            requests_per_minute: 每分钟请求数上限
+            input_tokens_per_minute: 每分钟输入 token 数上限
+            max_in_flight: 同时进行中的调用数上限（未配置 controller 时使用）
+            controller: 自适应并发控制器
+        """
+        self.requests_per_minute = requests_per_minute
+        self.input_tokens_per_minute = input_tokens_per_minute
+        self.max_in_flight = max_in_flight
+        self.controller = controller
+        self._requests = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self._tokens = (
+            TokenBucket(input_tokens_per_minute) if input_tokens_per_minute else None
+        )
+        self._lock = threading.Lock()
+        self._waiters: deque[_Waiter] = deque()
+        self._in_flight = 0
+        self._timer_deadline = 0.0
+        self._stats: dict[str, Any] = {
+            "requests": 0,
+            "throttled": 0,
+            "queue_wait_seconds": 0.0,
+            "max_queue_wait_seconds": 0.0,
+        }
+
+    @asynccontextmanager
+    async def slot(self, tokens: int = 0) -> AsyncIterator[float]:
+        """等待并占用一个调用名额.
+
+        Args:
+            tokens: 本次调用的估算输入 token 数
+
+        Yields:
+            排队等待的秒数
+        """
+        started = time.monotonic()
+        await self._acquire(tokens)
+        acquired = time.monotonic()
+        waited = acquired - started
+        self._record(waited)
+        saturated = bool(self._waiters) or self._in_flight >= self.concurrency_limit
+        try:
+            yield waited
+        except Exception as e:
+            if self.controller is not None and is_overload(e):
+                self.controller.on_overload()
+            raise
+        else:
+            if self.controller is not None:
+                self.controller.on_success(time.monotonic() - acquired, saturated)
+        finally:
+            self._release()
+
+    @property
+    def concurrency_limit(self) -> int:
+        """当前同时进行中的调用数上限（0 表示不限制）."""
+        if self.controller is not None:
+            return self.controller.current
+        return self.max_in_flight
+
+    async def _acquire(self, tokens: int) -> None:
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), tokens)
+        with self._lock:
+            self._waiters.append(waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    self._in_flight -= 1
+                elif waiter in self._waiters:
+                    self._waiters.remove(waiter)
+            self._dispatch()
+            raise
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """按顺序放行满足全部限制的排队调用."""
+        with self._lock:
+            while self._waiters:
+                limit = self.concurrency_limit
+                if limit and self._in_flight >= limit:
+                    return
+                waiter = self._waiters[0]
+                if waiter.future.done() or waiter.future.get_loop().is_closed():
+                    # 调用方已取消或其事件循环已关闭
+                    self._waiters.popleft()
+                    continue
+                now = time.monotonic()
+                delay = max(
+                    self._requests.delay(1, now) if self._requests else 0.0,
+                    self._tokens.delay(waiter.tokens, now) if self._tokens else 0.0,
+                )
+                if delay > 0:
+                    # 由队首调用所在的事件循环在配额恢复后重新放行；
+                    # 计时器所在的循环关闭后计时器过期，可重新安排
+                    if now >= self._timer_deadline:
+                        self._timer_deadline = now + delay
+                        loop = waiter.future.get_loop()
+                        loop.call_soon_threadsafe(
+                            loop.call_later, delay, self._dispatch
+                        )
+                    return
+                if self._requests:
+                    self._requests.take(1, now)
+                if self._tokens:
+                    self._tokens.take(waiter.tokens, now)
+                self._waiters.popleft()
+                self._in_flight += 1
+                waiter.granted = True
+                waiter.future.get_loop().call_soon_threadsafe(_wake, waiter.future)
+
+    def _record(self, waited: float) -> None:
+        """记录一次调用的排队等待时间."""
+        self._stats["requests"] += 1
+        self._stats["queue_wait_seconds"] += waited
+        if waited > 0.001:
+            self._stats["throttled"] += 1
+            logger.debug(f"LLM call waited {waited:.3f}s for rate limits")
+        self._stats["max_queue_wait_seconds"] = max(
+            self._stats["max_queue_wait_seconds"], waited
+        )
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取限流统计信息.
+
+        Returns:
+            限制值、当前并发上限（gauge）、自适应控制器状态、进行中和排队中
+            的调用数、放行的请求数、需要等待的请求数以及平均和最大排队等待
+            时间（毫秒）
+        """
+        requests = self._stats["requests"]
+        return {
+            "limits": {
+                "requests_per_minute": self.requests_per_minute,
+                "input_tokens_per_minute": self.input_tokens_per_minute,
+                "max_in_flight": self.max_in_flight,
+            },
+            "concurrency_limit": self.concurrency_limit,
+            "adaptive": self.controller.get_stats() if self.controller else None,
+            "in_flight": self._in_flight,
+            "queued": len(self._waiters),
+            "requests": requests,
+            "throttled": self._stats["throttled"],
+            "mean_queue_wait_ms": round(
+                self._stats["queue_wait_seconds"] / requests * 1000, 1
+            )
+            if requests
+            else 0,
+            "max_queue_wait_ms": round(self._stats["max_queue_wait_seconds"] * 1000, 1),
+        }
+
+
+_governor: LLMGovernor | None = None
+
+
+def get_llm_governor() -> LLMGovernor:
+    """获取进程级共享的 LLM 限流器.
+
+    限制值通过 LLM_REQUESTS_PER_MINUTE（默认 50）、
+    LLM_INPUT_TOKENS_PER_MINUTE（默认 40000）和 LLM_MAX_IN_FLIGHT（默认 16）
+    环境变量配置，0 表示不限制。LLM_ADAPTIVE_CONCURRENCY 为 true（默认）时，
+    并发上限从 LLM_INITIAL_IN_FLIGHT（默认 4）开始由 AIMD 控制器在
+    LLM_MIN_IN_FLIGHT（默认 1）和 LLM_MAX_IN_FLIGHT 之间调整。
+
+    Returns:
+        LLMGovernor 实例
+    """
+    global _governor
+    if _governor is None:
+        max_in_flight = int(os.getenv("LLM_MAX_IN_FLIGHT", "16"))
+        adaptive = os.getenv("LLM_ADAPTIVE_CONCURRENCY", "true").lower() == "true"
+        controller = None
+        if adaptive and max_in_flight > 0:
+            controller = AIMDController(
+                initial=int(os.getenv("LLM_INITIAL_IN_FLIGHT", "4")),
+                min_limit=int(os.getenv("LLM_MIN_IN_FLIGHT", "1")),
+                max_limit=max_in_flight,
+            )
+        _governor = LLMGovernor(
+            requests_per_minute=int(os.getenv("LLM_REQUESTS_PER_MINUTE", "50")),
+            input_tokens_per_minute=int(
+                os.getenv("LLM_INPUT_TOKENS_PER_MINUTE", "40000")
+            ),
+            max_in_flight=max_in_flight,
+            controller=controller,
+        )
+    return _governor
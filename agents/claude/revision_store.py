@@ -0,0 +1,149 @@
+"""Revision store - 按页面指纹保存论文最新版本的提取和翻译结果."""
+
+import asyncio
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# paper_id 格式：<category>_<YYYYmmdd>_<HHMMSS>_<文件名>
+PAPER_ID_PATTERN = re.compile(r"^(?P<category>[^_]+)_\d{8}_\d{6}_(?P<name>.+)$")
+# 文件名末尾的版本号，如 arXiv 的 2301.12345v2
+REVISION_SUFFIX = re.compile(r"v\d+$")
+
+
+def revision_key(paper_id: str) -> str:
+    """计算同一论文各版本共享的键.
+
+    例如 ``llm_20240115_143022_2301.12345v2.pdf`` 和
+    ``llm_20240301_090000_2301.12345v3`` 的键都是 ``llm/2301.12345``。
+
+    Args:
+        paper_id: 论文ID
+
+    Returns:
+        版本无关的论文键
+    """
+    match = PAPER_ID_PATTERN.match(paper_id)
+    category, name = (
+        (match["category"], match["name"]) if match else ("general", paper_id)
+    )
+    if name.lower().endswith(".pdf"):
+        name = name[:-4]
+    name = REVISION_SUFFIX.sub("", name) or name
+    safe = [re.sub(r"[^\w.\-]", "_", part) for part in (category, name)]
+    return "/".join(safe)
+
+
+class RevisionStore:
+    """论文最新版本的逐页产物存储.
+
+    每篇论文保存一个 JSON 文件，包含按文本层指纹索引的页面提取结果和
+    译文。上传新版本时，指纹未变的页面直接复用这些产物，只有修改过的
+    页面需要重新提取和翻译。
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        """初始化版本存储.
+
+        Args:
+            root: 存储根目录（通常为 papers/revisions）
+        """
+        self.root = Path(root)
+
+    def _path(self, paper_id: str) -> Path:
+        """获取论文对应的存储文件路径."""
+        return self.root / f"{revision_key(paper_id)}.json"
+
+    def _load(self, paper_id: str) -> dict[str, Any]:
+        path = self._path(paper_id)
+        if path.exists():
+            try:
+                with open(path, encoding="utf-8") as f:
+                    return json.load(f)
+            except ValueError:
+                logger.warning(f"Discarding corrupt revision record {path}")
+        return {"paper_id": None, "pages": {}, "translations": {}}
+
+    async def load(self, paper_id: str) -> dict[str, Any]:
+        """读取同一论文上一版本的产物.
+
+        Args:
+            paper_id: 论文ID（任意版本）
+
+        Returns:
+            包含 paper_id、pages（指纹 -> 页面结果）和 translations
+            （指纹 -> 译文）的字典，没有旧版本时 pages 和 translations 为空
+        """
+        return await asyncio.to_thread(self._load, paper_id)
+
+    def _save(
+        self,
+        paper_id: str,
+        pages: list[dict[str, Any]] | None,
+        translations: dict[str, str] | None,
+    ) -> None:
+        previous = self._load(paper_id)
+        if pages is None:
+            page_results = previous["pages"]
+        else:
+            page_results = {
+                page["fingerprint"]: {
+                    k: v for k, v in page["result"].items() if k != "rss_bytes"
+                }
+                for page in pages
+            }
+
+        # 只保留当前版本仍然存在的页面的旧译文，新译文覆盖旧译文
+        merged = {
+            fingerprint: text
+            for fingerprint, text in previous["translations"].items()
+            if fingerprint in page_results
+        }
+        merged.update(translations or {})
+
+        record = {
+            "paper_id": paper_id,
+            "updated_at": datetime.now().isoformat(),
+            "pages": page_results,
+            "translations": merged,
+        }
+        path = self._path(paper_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    async def save(
+        self,
+        paper_id: str,
+        pages: list[dict[str, Any]] | None = None,
+        translations: dict[str, str] | None = None,
+    ) -> None:
+        """保存当前版本的产物.
+
+        Args:
+            paper_id: 当前版本的论文ID
+            pages: pdf-reader 返回的逐页记录，为空时保留已保存的页面
+            translations: 指纹 -> 译文，与仍然存在的旧译文合并
+        """
+        await asyncio.to_thread(self._save, paper_id, pages, translations)
+
+    def _delete(self, paper_id: str) -> None:
+        path = self._path(paper_id)
+        if self._load(paper_id)["paper_id"] == paper_id:
+            path.unlink(missing_ok=True)
+
+    async def delete(self, paper_id: str) -> None:
+        """删除论文的产物（只在记录属于该版本时删除，不影响其他版本）.
+
+        Args:
+            paper_id: 论文ID
+        """
+        await asyncio.to_thread(self._delete, paper_id)
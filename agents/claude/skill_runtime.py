@@ -0,0 +1,176 @@
+"""Skill runtime - 进程级共享的 Skill 后端，只解析一次并复用客户端."""
+
+import asyncio
+import logging
+import time
+import weakref
+from collections.abc import AsyncIterator
+from typing import Any
+
+from .markdown_chunker import estimate_tokens
+from .rate_limiter import get_llm_governor
+from .skills import SkillInvoker
+
+logger = logging.getLogger(__name__)
+
+# 调用 LLM 的 Skill：SDK 后端下由运行时统一限流（本地实现在发送请求时限流）
+LLM_SKILLS = frozenset({"zh-translator", "heartfelt", "doc-translator"})
+
+
+class SkillRuntime:
+    """进程级 Skill 运行时.
+
+    启动时解析一次 Skill 后端（Claude Agent SDK 或本地 SkillInvoker），
+    之后每次调用直接分发。SkillInvoker 及其 Anthropic 客户端（连接池）
+    按事件循环共享：连接池绑定在创建它的事件循环上，同一事件循环内的
+    所有调用复用同一个客户端。
+    """
+
+    def __init__(self) -> None:
+        """初始化运行时并解析 Skill 后端."""
+        self._sdk_skill: Any = None
+        self.backend = "fallback"
+        try:
+            from claude_agent_sdk.tools import Skill
+
+            self._sdk_skill = Skill
+            self.backend = "sdk"
+        except ImportError:
+            logger.info("Claude Agent SDK skills unavailable, using fallback skills")
+        except Exception as e:
+            # SDK 已安装但无法加载时同样使用本地实现，避免每次调用都失败
+            logger.warning(f"Failed to load Claude Agent SDK skills: {str(e)}")
+
+        self._invokers: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, SkillInvoker
+        ] = weakref.WeakKeyDictionary()
+        self._stats: dict[str, Any] = {
+            "calls": 0,
+            "errors": 0,
+            "invokers": 0,
+            "skill_seconds": 0.0,
+            "overhead_seconds": 0.0,
+        }
+
+    def get_invoker(self) -> SkillInvoker:
+        """获取当前事件循环共享的 SkillInvoker.
+
+        Returns:
+            SkillInvoker 实例
+        """
+        loop = asyncio.get_running_loop()
+        invoker = self._invokers.get(loop)
+        if invoker is None:
+            invoker = SkillInvoker()
+            self._invokers[loop] = invoker
+            self._stats["invokers"] += 1
+        return invoker
+
+    async def call(self, skill_name: str, params: dict[str, Any]) -> dict[str, Any]:
+        """调用 Skill.
+
+        Args:
+            skill_name: Skill 名称
+            params: Skill 参数
+
+        Returns:
+            Skill 调用结果
+        """
+        started = time.perf_counter()
+        if self._sdk_skill is not None:
+            dispatched = time.perf_counter()
+            try:
+                if skill_name in LLM_SKILLS:
+                    tokens = estimate_tokens(str(params.get("content", "")))
+                    async with get_llm_governor().slot(tokens):
+                        data = await self._sdk_skill(skill_name, params)
+                else:
+                    data = await self._sdk_skill(skill_name, params)
+                result = {"success": True, "data": data}
+            finally:
+                self._record(started, dispatched, time.perf_counter(), None)
+            return result
+
+        invoker = self.get_invoker()
+        dispatched = time.perf_counter()
+        result = None
+        try:
+            result = await invoker.call_skill(skill_name, params)
+        finally:
+            self._record(started, dispatched, time.perf_counter(), result)
+        return result
+
+    async def stream(
+        self, skill_name: str, params: dict[str, Any]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """流式调用 Skill（使用本地实现）.
+
+        Args:
+            skill_name: Skill 名称
+            params: Skill 参数
+
+        Yields:
+            Skill 事件
+        """
+        async for event in self.get_invoker().stream_skill(skill_name, params):
+            yield event
+
+    def _record(
+        self,
+        started: float,
+        dispatched: float,
+        finished: float,
+        result: dict[str, Any] | None,
+    ) -> None:
+        """记录一次调用的分发开销和 Skill 执行时间."""
+        self._stats["calls"] += 1
+        self._stats["overhead_seconds"] += dispatched - started
+        self._stats["skill_seconds"] += finished - dispatched
+        if result is not None and not result.get("success"):
+            self._stats["errors"] += 1
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取运行时统计信息.
+
+        Returns:
+            后端、调用次数、失败次数、创建的 SkillInvoker 数、Skill 执行时间
+            以及平均每次调用的分发开销（微秒）
+        """
+        calls = self._stats["calls"]
+        return {
+            "backend": self.backend,
+            "calls": calls,
+            "errors": self._stats["errors"],
+            "invokers": self._stats["invokers"],
+            "skill_seconds": round(self._stats["skill_seconds"], 3),
+            "mean_overhead_us": round(self._stats["overhead_seconds"] / calls * 1e6, 1)
+            if calls
+            else 0,
+        }
+
+    async def aclose(self) -> None:
+        """关闭当前事件循环的 SkillInvoker 及其客户端."""
+        invoker = self._invokers.pop(asyncio.get_running_loop(), None)
+        if invoker is not None:
+            await invoker.aclose()
+
+
+_runtime: SkillRuntime | None = None
+
+
+def get_skill_runtime() -> SkillRuntime:
+    """获取进程级共享的 Skill 运行时（首次调用时解析后端）.
+
+    Returns:
+        SkillRuntime 实例
+    """
+    global _runtime
+    if _runtime is None:
+        _runtime = SkillRuntime()
+    return _runtime
+
+
+async def close_skill_runtime() -> None:
+    """关闭共享运行时在当前事件循环中的客户端."""
+    if _runtime is not None:
+        await _runtime.aclose()
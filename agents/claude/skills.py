@@ -1,33 +1,66 @@
 """Skill implementation for Claude Agent Skills fallback."""
 
+import asyncio
 import logging
 import os
 import re
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any
 
 import anthropic
-import httpx
-import pdfplumber
 from bs4 import BeautifulSoup
 
-try:
-    from marko.ext.gfm import GFM
-except ImportError:
-    GFM = None
+from agents.core.http_client import download_to_file, get_http_client
+from agents.core.utils import get_rss_bytes
+
+from .extraction_checkpoint import ExtractionCheckpoint
+from .markdown_chunker import estimate_tokens
+from .pdf_backends import METHODS
+from .pdf_engine import get_extraction_engine, resolve_page_range
+from .rate_limiter import get_llm_governor
+from .span_masker import mask_spans, unmask_spans
 
 logger = logging.getLogger(__name__)
 
+CLAUDE_MODEL = "claude-3-sonnet-20240229"
+
+TRANSLATION_PROMPT = """Please translate the following Markdown content to Chinese while preserving:
+
+1. All formatting (headers, lists, bold, italic, etc.)
+2. Code blocks and inline code
+3. URLs and file paths
+4. LaTeX mathematical formulas
+5. HTML tags
+6. Special characters and emojis
+7. Placeholders such as ⟦0⟧, which stand for protected content; copy each one exactly once
+
+Do not translate:
+- Code blocks
+- URLs
+- File paths
+- Technical terms that should remain in English
+
+Here is the content to translate:
+
+{content}
+
+Please provide only the translated content without any explanations."""
+
 
 class SkillInvoker:
     """Fallback skill implementation using available Python packages."""
 
     def __init__(self) -> None:
         """Initialize the skill invoker."""
+        # Async client so concurrent skill calls (e.g. translation chunks
+        # gathered by batch_call_skill) overlap instead of blocking the loop
         self.anthropic_client = None
         api_key = os.getenv("ANTHROPIC_API_KEY")
         if api_key:
-            self.anthropic_client = anthropic.Anthropic(api_key=api_key)
+            self.anthropic_client = anthropic.AsyncAnthropic(api_key=api_key)
 
         # Registry of available skills
         self.skill_registry = {
@@ -40,6 +73,17 @@ class SkillInvoker:
             "batch-processor": self._handle_batch_processor,
         }
 
+        # Skills that can stream partial results
+        self.stream_registry = {
+            "pdf-reader": self._stream_pdf_reader,
+            "zh-translator": self._stream_zh_translator,
+        }
+
+    async def aclose(self) -> None:
+        """Close the Anthropic client and its connection pool."""
+        if self.anthropic_client is not None:
+            await self.anthropic_client.close()
+
     async def call_skill(
         self, skill_name: str, params: dict[str, Any]
     ) -> dict[str, Any]:
@@ -70,6 +114,84 @@ class SkillInvoker:
                 "error_type": type(e).__name__,
             }
 
+    async def stream_skill(
+        self, skill_name: str, params: dict[str, Any]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream a skill's partial results as they are produced.
+
+        Args:
+            skill_name: Name of the skill to call
+            params: Parameters to pass to the skill
+
+        Yields:
+            Skill events; failures are reported as a final ``error`` event
+        """
+        handler = self.stream_registry.get(skill_name)
+        if not handler:
+            yield {
+                "type": "error",
+                "success": False,
+                "error": f"Skill does not support streaming: {skill_name}",
+                "error_type": "SkillNotFoundError",
+            }
+            return
+
+        try:
+            async for event in handler(params):
+                yield event
+        except Exception as e:
+            logger.error(f"Error streaming skill {skill_name}: {str(e)}")
+            yield {
+                "type": "error",
+                "success": False,
+                "error": str(e),
+                "error_type": type(e).__name__,
+            }
+
+    def _get_pdf_source(self, params: dict[str, Any]) -> str | None:
+        """Get the PDF path or URL from skill parameters."""
+        return (
+            params.get("file_path")
+            or params.get("url")
+            or params.get("pdf_path")
+            or params.get("pdf_source")
+        )
+
+    @asynccontextmanager
+    async def _open_pdf_source(self, source: str) -> AsyncIterator[dict[str, Any]]:
+        """Resolve a PDF source to a local file path.
+
+        URLs are streamed to a uniquely named temporary file (size capped and
+        checksummed while downloading) that is removed on exit.
+
+        Args:
+            source: Local path or URL of the PDF
+
+        Yields:
+            Dictionary with the absolute ``path`` of a local PDF file and,
+            for URLs, a ``download`` entry with its size and SHA-256
+        """
+        if not source.startswith(("http://", "https://")):
+            # Convert relative to absolute path
+            yield {"path": source if os.path.isabs(source) else os.path.abspath(source)}
+            return
+
+        # Stream the PDF from the URL to a temporary file
+        download = await download_to_file(source, suffix=".pdf")
+        try:
+            yield {
+                "path": download["path"],
+                "download": {
+                    "url": source,
+                    "size": download["size"],
+                    "sha256": download["sha256"],
+                },
+            }
+        finally:
+            # Cleanup temp file downloaded from URL
+            if os.path.exists(download["path"]):
+                os.unlink(download["path"])
+
     async def _handle_pdf_reader(self, params: dict[str, Any]) -> dict[str, Any]:
         """Handle PDF reading and conversion to Markdown.
 
@@ -77,154 +199,457 @@ class SkillInvoker:
             params: Dictionary containing:
                 - file_path or url: Path or URL to PDF file
                 - extract_images: Whether to extract images (default: True)
+                - image_dir: Image store root; embedded images are only
+                  extracted when it is set, written once per content hash and
+                  returned by ``file_path`` (never inlined)
                 - extract_tables: Whether to extract tables (default: True)
                 - extract_formulas: Whether to extract formulas (default: True)
                 - page_range: Optional [start, end] page range
+                - method: Extraction backend, "fast", "layout" or "auto"
+                  (default: "auto", layout analysis only where needed)
+                - output_path: Optional Markdown file to write page by page
+                  instead of returning the content in memory
+                - memory_budget_mb: Optional peak RSS budget for extraction
+                  workers (default: PDF_MEMORY_BUDGET_MB, 0 disables it)
+                - reuse_pages: Page results of a previous revision keyed by
+                  text layer fingerprint; pages whose fingerprint is unchanged
+                  are spliced in instead of being extracted again
+                - include_pages: Also return the metadata ``header`` and
+                  per-page records (fingerprint, heading, body and raw result)
+                  under ``pages``
+                - checkpoint: Persist finished pages next to a local PDF so a
+                  failed or interrupted extraction resumes after the last
+                  finished page; removed on success (default: True)
 
         Returns:
             Dictionary with success status and extracted content
         """
-        file_path = (
-            params.get("file_path")
-            or params.get("url")
-            or params.get("pdf_path")
-            or params.get("pdf_source")
-        )
-        if not file_path:
+        if not self._get_pdf_source(params):
             return {
                 "success": False,
                 "error": "No file_path, url, or pdf_source provided",
                 "error_type": "ValueError",
             }
 
-        # Handle URLs by downloading first
-        if file_path.startswith(("http://", "https://")):
-            # Download PDF from URL
-            async with httpx.AsyncClient() as client:
-                response = await client.get(file_path)
-                response.raise_for_status()
-                # Save to temporary file
-                temp_path = Path("/tmp") / f"temp_{os.getpid()}.pdf"
-                with open(temp_path, "wb") as f:
-                    f.write(response.content)
-                file_path = str(temp_path)
-                cleanup_temp = True
+        output_path = params.get("output_path")
+        download: dict[str, Any] | None = None
+        content_parts = []
+        metadata: dict[str, Any] = {}
+        assets: dict[str, Any] = {"images": [], "tables": 0, "formulas": 0}
+        tables: list[dict[str, Any]] = []
+        formulas: list[dict[str, Any]] = []
+        pages: list[dict[str, Any]] = []
+        total_words = 0
+        total_paragraphs = 0
+        pages_written = 0
+        page_count = 0
+        total_pages = 0
+        statistics: dict[str, Any] = {}
+
+        async with self._open_markdown_output(output_path) as write:
+            async for event in self._stream_pdf_reader(params):
+                if event["type"] == "start":
+                    metadata = event["metadata"]
+                    download = event["download"]
+                    total_pages = event["total_pages"]
+                    header = self._render_metadata_header(metadata)
+                    if write:
+                        await write(header)
+                        total_paragraphs += self._count_paragraphs(header)
+                elif event["type"] == "page":
+                    if write:
+                        # Separate pages the same way the in-memory join does
+                        await write(("\n" if pages_written else "") + event["markdown"])
+                        pages_written += 1
+                        total_paragraphs += self._count_paragraphs(event["markdown"])
+                    else:
+                        content_parts.append(event["markdown"])
+                    tables.extend(
+                        {"page": event["page"], "index": i, "rows": rows}
+                        for i, rows in enumerate(event["tables"])
+                    )
+                    formulas.extend(
+                        {"page": event["page"], "index": i, "text": text}
+                        for i, text in enumerate(event["formulas"])
+                    )
+                    assets["images"].extend(event["images"])
+                    total_words += event["word_count"]
+                    if "result" in event:
+                        pages.append(
+                            {
+                                "page": event["page"],
+                                "fingerprint": event["fingerprint"],
+                                "reused": event["reused"],
+                                "heading": self._render_page_heading(event["page"]),
+                                "body": self._render_page_body(event["result"]),
+                                "result": event["result"],
+                            }
+                        )
+                elif event["type"] == "complete":
+                    page_count = event["page_count"]
+                    statistics = event["statistics"]
+
+        if output_path:
+            full_content = ""
         else:
-            # Convert relative to absolute path
-            if not os.path.isabs(file_path):
-                file_path = os.path.abspath(file_path)
-            cleanup_temp = False
+            # Combine all content
+            full_content = self._render_metadata_header(metadata) + "\n".join(
+                content_parts
+            )
+            total_paragraphs = self._count_paragraphs(full_content)
+
+        assets["tables"] = len(tables)
+        assets["formulas"] = len(formulas)
+
+        data = {
+            "content": full_content,
+            "markdown": full_content,  # Alias for compatibility
+            "metadata": metadata,
+            "images": assets.get("images", []),
+            "tables": tables,
+            "formulas": formulas,
+            "word_count": total_words,
+            "page_count": page_count,
+            "total_pages": total_pages,
+            "statistics": statistics,
+        }
+        if params.get("include_pages"):
+            data["header"] = self._render_metadata_header(metadata)
+            data["pages"] = pages
+        if output_path:
+            data["output_path"] = str(output_path)
+        if download:
+            data["download"] = download
+
+        return {
+            "success": True,
+            "data": data,
+            "metadata": {
+                **metadata,
+                "page_count": page_count,
+                "total_words": total_words,
+            },
+            "assets": assets,
+            "statistics": {
+                "total_words": total_words,
+                "total_paragraphs": total_paragraphs,
+                "processing_time": statistics["processing_time"],
+                "pages_per_second": statistics["pages_per_second"],
+                "workers": statistics["workers"],
+                "resumed_pages": statistics["resumed_pages"],
+                "reused_pages": statistics["reused_pages"],
+                "backends": statistics["backends"],
+                "table_pages_scanned": statistics["table_pages_scanned"],
+                "table_pages_skipped": statistics["table_pages_skipped"],
+                "peak_rss_mb": statistics["peak_rss_mb"],
+                "images": statistics["images"],
+            },
+        }
+
+    @staticmethod
+    def _count_paragraphs(content: str) -> int:
+        """Count non-empty blank-line separated paragraphs."""
+        return len([p for p in content.split("\n\n") if p.strip()])
+
+    @asynccontextmanager
+    async def _open_markdown_output(
+        self, output_path: str | Path | None
+    ) -> AsyncIterator[Any]:
+        """Open a Markdown file for incremental writes.
+
+        Writes go to a temporary file next to ``output_path`` that replaces
+        it only once extraction succeeds.
+
+        Args:
+            output_path: Target file, or None to keep content in memory
+
+        Yields:
+            An async ``write(text)`` callable, or None without ``output_path``
+        """
+        if not output_path:
+            yield None
+            return
+
+        target = Path(output_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f".{target.name}.{os.getpid()}.part")
+        f = await asyncio.to_thread(open, tmp_path, "w", encoding="utf-8")
+
+        async def write(text: str) -> None:
+            await asyncio.to_thread(f.write, text)
 
         try:
-            # Extract content using pdfplumber for better text extraction
-            content_parts = []
-            metadata = {}
-            assets: dict[str, Any] = {"images": [], "tables": 0, "formulas": 0}
-
-            with pdfplumber.open(file_path) as pdf:
-                # Extract metadata
-                if hasattr(pdf, "metadata") and pdf.metadata:
-                    metadata = {
-                        "title": pdf.metadata.get("Title", ""),
-                        "author": pdf.metadata.get("Author", ""),
-                        "creator": pdf.metadata.get("Creator", ""),
-                        "producer": pdf.metadata.get("Producer", ""),
-                        "creation_date": str(pdf.metadata.get("CreationDate", "")),
-                        "modification_date": str(pdf.metadata.get("ModDate", "")),
-                    }
+            yield write
+            await asyncio.to_thread(f.close)
+            os.replace(tmp_path, target)
+        finally:
+            if not f.closed:
+                await asyncio.to_thread(f.close)
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    async def _stream_pdf_reader(
+        self, params: dict[str, Any]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream PDF extraction page by page.
 
-                # Get page range
-                page_range = params.get("page_range", [0, len(pdf.pages)])
-                if page_range and len(page_range) >= 2:
-                    start_page = max(0, int(page_range[0]))
-                    end_page = min(len(pdf.pages), int(page_range[1]) + 1)
-                else:
-                    start_page = 0
-                    end_page = len(pdf.pages)
-
-                total_words = 0
-                for i, page in enumerate(pdf.pages[start_page:end_page]):
-                    page_num = start_page + i + 1
-                    text = page.extract_text() or ""
-
-                    # Add page header
-                    content_parts.append(f"\n\n## Page {page_num}\n\n")
-
-                    # Add extracted text
-                    if text.strip():
-                        content_parts.append(text)
-                        total_words += len(text.split())
-
-                    # Extract tables if requested
-                    if params.get("extract_tables", True):
-                        tables = page.extract_tables()
-                        for table in tables:
-                            if table:
-                                assets["tables"] += 1
-                                # Convert table to markdown
-                                # Filter out None values and ensure all cells are strings
-                                clean_table = [
-                                    [
-                                        str(cell) if cell is not None else ""
-                                        for cell in row
-                                    ]
-                                    for row in table
-                                ]
-                                markdown_table = self._convert_table_to_markdown(
-                                    clean_table
-                                )
-                                content_parts.append(f"\n\n{markdown_table}\n")
-
-                # Combine all content
-                full_content = "\n".join(content_parts)
-
-                # Add metadata header
-                if metadata:
-                    metadata_header = "\n## Document Metadata\n\n"
-                    for key, value in metadata.items():
-                        if value:
-                            metadata_header += f"- **{key.title()}**: {value}\n"
-                    full_content = metadata_header + "\n" + full_content
-
-            # Cleanup temp file if downloaded from URL
-            if cleanup_temp:
-                os.unlink(file_path)
+        Args:
+            params: Same parameters as ``_handle_pdf_reader``
 
-            return {
-                "success": True,
-                "data": {
-                    "content": full_content,
-                    "markdown": full_content,  # Alias for compatibility
-                    "metadata": metadata,
-                    "images": assets.get("images", []),
-                    "tables": [
-                        f"Table {i + 1}" for i in range(int(assets.get("tables", 0)))
-                    ],
-                    "formulas": [
-                        f"Formula {i + 1}"
-                        for i in range(int(assets.get("formulas", 0)))
-                    ],
-                    "page_count": end_page - start_page,
-                },
-                "metadata": {
-                    **metadata,
-                    "page_count": end_page - start_page,
-                    "total_words": total_words,
-                },
-                "assets": assets,
-                "statistics": {
-                    "total_words": total_words,
-                    "total_paragraphs": len(
-                        [p for p in full_content.split("\n\n") if p.strip()]
-                    ),
-                    "processing_time": "N/A",  # Could add timing if needed
-                },
+        Yields:
+            A ``start`` event with document metadata (and ``download`` details
+            for URL sources), one ``page`` event per page in page order
+            (Markdown, tables and running stats), then a ``complete`` event
+            with the document statistics
+        """
+        source = self._get_pdf_source(params)
+        if not source:
+            raise ValueError("No file_path, url, or pdf_source provided")
+
+        method = params.get("method") or "auto"
+        if method not in METHODS:
+            raise ValueError(f"Unsupported extraction method: {method}")
+
+        options = {
+            "page_range": params.get("page_range"),
+            "extract_tables": params.get("extract_tables", True),
+            "method": method,
+            "extract_images": params.get("extract_images", True),
+            "image_dir": params.get("image_dir"),
+            "memory_budget_mb": int(
+                params.get("memory_budget_mb") or os.getenv("PDF_MEMORY_BUDGET_MB", "0")
+            ),
+        }
+        # Page results of a previous revision, keyed by text layer fingerprint
+        reuse_pages = params.get("reuse_pages") or {}
+        if reuse_pages:
+            options["reuse_fingerprints"] = sorted(reuse_pages)
+        engine = get_extraction_engine()
+        started = time.perf_counter()
+
+        async with self._open_pdf_source(source) as resolved:
+            file_path = resolved["path"]
+            # Extract pages in the worker pool so the event loop stays responsive
+            info = await engine.get_document_info(file_path)
+            start_page, end_page = resolve_page_range(
+                options["page_range"], info["page_count"]
+            )
+            page_count = end_page - start_page
+            yield {
+                "type": "start",
+                "metadata": info["metadata"],
+                "page_count": page_count,
+                "total_pages": info["page_count"],
+                "download": resolved.get("download"),
             }
 
-        except Exception as e:
-            if cleanup_temp and os.path.exists(file_path):
-                os.unlink(file_path)
-            raise e
+            # Resume local files from the pages a previous attempt finished
+            checkpoint = None
+            done_pages: list[dict[str, Any]] = []
+            if params.get("checkpoint", True) and "download" not in resolved:
+                checkpoint = ExtractionCheckpoint(file_path, options)
+                if await checkpoint.acquire():
+                    done_pages = await checkpoint.load(start_page, end_page)
+                else:
+                    # Another extraction of the same file owns the checkpoint
+                    logger.info(
+                        f"Checkpoint {checkpoint.path.name} is in use, "
+                        "extracting without a checkpoint"
+                    )
+                    checkpoint = None
+
+            pages_done = 0
+            backends: dict[str, int] = {}
+            tables_scanned = 0
+            image_hashes: set[str] = set()
+            images_total = 0
+            images_written = 0
+            reused_pages = 0
+            peak_rss = get_rss_bytes()
+            resume_page = start_page + len(done_pages)
+            try:
+                async for page in self._resume_pages(
+                    engine, file_path, options, info, done_pages, resume_page, end_page
+                ):
+                    if page.get("reused") and "text" not in page:
+                        page = self._splice_page(reuse_pages[page["fingerprint"]], page)
+                    resumed = pages_done < len(done_pages)
+                    if checkpoint and not resumed:
+                        await checkpoint.append(page)
+                    pages_done += 1
+                    peak_rss = max(peak_rss, page["rss_bytes"], get_rss_bytes())
+                    backends[page["backend"]] = backends.get(page["backend"], 0) + 1
+                    reused_pages += page.get("reused", False)
+                    tables_scanned += page["tables_scanned"]
+                    for image in page["images"]:
+                        images_total += 1
+                        images_written += image["new"] and not resumed
+                        image_hashes.add(image["hash"])
+                    elapsed = time.perf_counter() - started
+                    event = {
+                        "type": "page",
+                        "page": page["page"],
+                        "markdown": self._render_page(page),
+                        "tables": page["tables"],
+                        "images": page["images"],
+                        "formulas": page["formulas"],
+                        "counts": page["counts"],
+                        "word_count": page["word_count"],
+                        "backend": page["backend"],
+                        "fingerprint": page.get("fingerprint"),
+                        "reused": page.get("reused", False),
+                        "stats": {
+                            "pages_done": pages_done,
+                            "page_count": page_count,
+                            "elapsed": round(elapsed, 3),
+                            "pages_per_second": round(pages_done / elapsed, 2)
+                            if elapsed > 0
+                            else 0,
+                        },
+                    }
+                    if params.get("include_pages"):
+                        event["result"] = page
+                    yield event
+            finally:
+                # Keep the checkpoint on failure so a retry can resume
+                if checkpoint:
+                    checkpoint.close()
+
+            # Throughput only counts the pages extracted in this run
+            statistics = engine.document_stats(
+                pages_done - len(done_pages),
+                len(engine.plan_shards(resume_page, end_page)),
+                time.perf_counter() - started,
+                peak_rss,
+            )
+            statistics["resumed_pages"] = len(done_pages)
+            # Unchanged pages spliced in from a previous revision
+            statistics["reused_pages"] = reused_pages
+            statistics["backends"] = backends
+            # Pages the table prefilter sent to / kept from the table finder
+            statistics["table_pages_scanned"] = tables_scanned
+            statistics["table_pages_skipped"] = (
+                pages_done - tables_scanned if options["extract_tables"] else 0
+            )
+            # Images are deduplicated by content hash across the whole store
+            statistics["images"] = {
+                "total": images_total,
+                "unique": len(image_hashes),
+                "written": images_written,
+            }
+            if checkpoint:
+                checkpoint.remove()
+            yield {
+                "type": "complete",
+                "metadata": info["metadata"],
+                "page_count": page_count,
+                "statistics": statistics,
+            }
+
+    async def _resume_pages(
+        self,
+        engine: Any,
+        file_path: str,
+        options: dict[str, Any],
+        info: dict[str, Any],
+        done_pages: list[dict[str, Any]],
+        resume_page: int,
+        end_page: int,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield checkpointed pages, then extract the remaining ones.
+
+        Args:
+            engine: Extraction engine
+            file_path: Local PDF path
+            options: Extraction options
+            info: Document info read by the engine
+            done_pages: Page results restored from the checkpoint
+            resume_page: First page (0-based) still to extract
+            end_page: Exclusive end of the requested page range
+
+        Yields:
+            Page results in page order
+        """
+        for page in done_pages:
+            yield page
+        if resume_page >= end_page:
+            return
+        remaining = {**options, "page_range": [resume_page, end_page - 1]}
+        async for page in engine.iter_pages(file_path, remaining, info):
+            yield page
+
+    @staticmethod
+    def _splice_page(stored: dict[str, Any], stub: dict[str, Any]) -> dict[str, Any]:
+        """Place a previous revision's page result at its new page number.
+
+        Args:
+            stored: Page result saved for the previous revision
+            stub: Reuse marker produced by the extraction engine
+
+        Returns:
+            Page result for the current revision
+        """
+        page = {**stored, **stub}
+        page["images"] = [
+            {**image, "page": stub["page"], "new": False}
+            for image in stored.get("images", [])
+        ]
+        return page
+
+    def _render_metadata_header(self, metadata: dict[str, Any]) -> str:
+        """Render document metadata as a Markdown header.
+
+        Args:
+            metadata: Document metadata
+
+        Returns:
+            Markdown header, or an empty string when there is no metadata
+        """
+        if not metadata:
+            return ""
+
+        metadata_header = "\n## Document Metadata\n\n"
+        for key, value in metadata.items():
+            if value:
+                metadata_header += f"- **{key.title()}**: {value}\n"
+        return metadata_header + "\n"
+
+    def _render_page(self, page: dict[str, Any]) -> str:
+        """Render a single extracted page as Markdown.
+
+        Args:
+            page: Page result produced by the extraction engine
+
+        Returns:
+            Markdown for the page
+        """
+        body = self._render_page_body(page)
+        heading = self._render_page_heading(page["page"])
+        return f"{heading}\n{body}" if body else heading
+
+    @staticmethod
+    def _render_page_heading(page_number: int) -> str:
+        """Render the Markdown heading that starts a page."""
+        return f"\n\n## Page {page_number}\n\n"
+
+    def _render_page_body(self, page: dict[str, Any]) -> str:
+        """Render a page's text and tables without its heading.
+
+        Args:
+            page: Page result produced by the extraction engine
+
+        Returns:
+            Markdown for the page body
+        """
+        parts = []
+        if page["text"].strip():
+            parts.append(page["text"])
+
+        for table in page["tables"]:
+            markdown_table = self._convert_table_to_markdown(table)
+            parts.append(f"\n\n{markdown_table}\n")
+
+        return "\n".join(parts)
 
     async def _handle_web_translator(self, params: dict[str, Any]) -> dict[str, Any]:
         """Handle web page content extraction and conversion to Markdown.
@@ -245,10 +670,9 @@ class SkillInvoker:
             }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, follow_redirects=True)
-                response.raise_for_status()
-                html_content = response.text
+            response = await get_http_client().get(url)
+            response.raise_for_status()
+            html_content = response.text
 
             # Parse HTML and extract main content
             soup = BeautifulSoup(html_content, "html.parser")
@@ -364,6 +788,52 @@ class SkillInvoker:
                 "error_type": type(e).__name__,
             }
 
+    async def _create_message(self, prompt: str, max_tokens: int) -> str:
+        """Send a single-turn prompt to Claude and return the first text block.
+
+        The request waits for the process-wide LLM governor, which enforces the
+        requests/min, input tokens/min and in-flight limits.
+
+        Args:
+            prompt: User prompt
+            max_tokens: Maximum number of output tokens
+
+        Returns:
+            Text of the first text block in the response ("" if none)
+        """
+        async with get_llm_governor().slot(estimate_tokens(prompt)):
+            response = await self.anthropic_client.messages.create(
+                model=CLAUDE_MODEL,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}],
+            )
+        for block in response.content:
+            if hasattr(block, "text"):
+                return block.text
+        return ""
+
+    async def _stream_message(self, prompt: str, max_tokens: int) -> AsyncIterator[str]:
+        """Stream the text of a single-turn prompt as Claude generates it.
+
+        The governor slot is held until the stream ends, so a streaming call
+        counts against the in-flight limit for its whole duration.
+
+        Args:
+            prompt: User prompt
+            max_tokens: Maximum number of output tokens
+
+        Yields:
+            Text deltas in order
+        """
+        async with get_llm_governor().slot(estimate_tokens(prompt)):
+            async with self.anthropic_client.messages.stream(
+                model=CLAUDE_MODEL,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}],
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
+
     async def _handle_zh_translator(self, params: dict[str, Any]) -> dict[str, Any]:
         """Handle translation to Chinese using Claude API.
 
@@ -391,41 +861,13 @@ class SkillInvoker:
             }
 
         try:
-            # Create translation prompt
-            prompt = f"""Please translate the following Markdown content to Chinese while preserving:
-
-1. All formatting (headers, lists, bold, italic, etc.)
-2. Code blocks and inline code
-3. URLs and file paths
-4. LaTeX mathematical formulas
-5. HTML tags
-6. Special characters and emojis
-
-Do not translate:
-- Code blocks
-- URLs
-- File paths
-- Technical terms that should remain in English
-
-Here is the content to translate:
-
-{content}
-
-Please provide only the translated content without any explanations."""
-
-            # Call Claude API
-            response = self.anthropic_client.messages.create(
-                model="claude-3-sonnet-20240229",
-                max_tokens=4000,
-                messages=[{"role": "user", "content": prompt}],
-            )
-
-            # Extract text from response content
-            translated_content = ""
-            for block in response.content:
-                if hasattr(block, "text"):
-                    translated_content = block.text
-                    break
+            # Code, tables, formulas, URLs and paths never reach the model
+            masked, spans = mask_spans(content)
+            prompt = TRANSLATION_PROMPT.format(content=masked)
+            translated = await self._create_message(prompt, max_tokens=4000)
+            translated_content, missing = unmask_spans(translated, spans)
+            if missing:
+                return self._placeholder_error(missing, spans)
 
             return {
                 "success": True,
@@ -434,6 +876,7 @@ Please provide only the translated content without any explanations."""
                 "metadata": {
                     "original_language": "auto-detected",
                     "target_language": "zh-CN",
+                    "protected_spans": len(spans),
                 },
             }
 
@@ -445,6 +888,84 @@ Please provide only the translated content without any explanations."""
                 "error_type": type(e).__name__,
             }
 
+    async def _stream_zh_translator(
+        self, params: dict[str, Any]
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream a translation to Chinese as it is generated.
+
+        Args:
+            params: Same parameters as ``_handle_zh_translator``
+
+        Protected spans are masked as in ``_handle_zh_translator`` and restored
+        line by line, so deltas only ever carry whole lines (plus the tail).
+
+        Yields:
+            ``delta`` events with restored text, then a ``complete`` event
+            carrying the full translation in ``data`` (or an ``error`` event
+            if the model dropped a placeholder)
+        """
+        content = params.get("content")
+        if not content:
+            raise ValueError("No content provided")
+        if not self.anthropic_client:
+            yield {
+                "type": "error",
+                "success": False,
+                "error": "Anthropic API key not configured",
+                "error_type": "ConfigurationError",
+            }
+            return
+
+        masked, spans = mask_spans(content)
+        prompt = TRANSLATION_PROMPT.format(content=masked)
+        parts = []
+        pending = ""
+        async for text in self._stream_message(prompt, max_tokens=4000):
+            # Placeholders never span lines, so complete lines can be restored
+            pending += text
+            cut = pending.rfind("\n") + 1
+            if cut:
+                parts.append(pending[:cut])
+                pending = pending[cut:]
+                yield {"type": "delta", "text": unmask_spans(parts[-1], spans)[0]}
+        if pending:
+            parts.append(pending)
+            yield {"type": "delta", "text": unmask_spans(pending, spans)[0]}
+
+        translated_content, missing = unmask_spans("".join(parts), spans)
+        if missing:
+            yield {"type": "error", **self._placeholder_error(missing, spans)}
+            return
+        yield {
+            "type": "complete",
+            "success": True,
+            "data": translated_content,
+            "content": translated_content,
+        }
+
+    @staticmethod
+    def _placeholder_error(
+        missing: list[int], spans: list[tuple[str, str]]
+    ) -> dict[str, Any]:
+        """Build the error for a translation that dropped protected spans.
+
+        Args:
+            missing: Placeholder numbers absent from the translation
+            spans: Spans masked before translation
+
+        Returns:
+            Error result; callers fall back to the source text
+        """
+        kinds = sorted({spans[i][0] for i in missing})
+        return {
+            "success": False,
+            "error": (
+                f"Translation dropped {len(missing)} of {len(spans)} protected "
+                f"spans ({', '.join(kinds)})"
+            ),
+            "error_type": "PlaceholderError",
+        }
+
     async def _handle_doc_translator(self, params: dict[str, Any]) -> dict[str, Any]:
         """Handle document translation workflow.
 
@@ -572,19 +1093,7 @@ Please provide a thoughtful, human-like analysis that goes beyond simple summary
 
 Focus on the emotional and human aspects of the content."""
 
-            # Call Claude API
-            response = self.anthropic_client.messages.create(
-                model="claude-3-sonnet-20240229",
-                max_tokens=2000,
-                messages=[{"role": "user", "content": prompt}],
-            )
-
-            # Extract text from response content
-            analysis = ""
-            for block in response.content:
-                if hasattr(block, "text"):
-                    analysis = block.text
-                    break
+            analysis = await self._create_message(prompt, max_tokens=2000)
 
             return {
                 "success": True,
@@ -0,0 +1,166 @@
+"""Span masker - 翻译前用占位符替换无需翻译的片段，翻译后还原."""
+
+import re
+from collections import Counter
+from collections.abc import Callable
+
+# 占位符：短小且不会被翻译的记号，如 ⟦3⟧
+PLACEHOLDER_RE = re.compile(r"⟦\s*(\d+)\s*⟧")
+
+# 按顺序匹配的受保护片段：先匹配跨行的块，再匹配行内片段，
+# 后面的模式不会匹配到已替换为占位符的内容
+SPAN_PATTERNS: list[tuple[str, re.Pattern[str]]] = [
+    # 代码围栏（围栏未闭合时保护到文末）
+    (
+        "code",
+        re.compile(
+            r"^[ \t]{0,3}(`{3,}|~{3,})[^\n]*\n.*?(?:^[ \t]{0,3}\1[ \t]*$|\Z)",
+            re.M | re.S,
+        ),
+    ),
+    # HTML 表格和 Markdown 表格（表头行、分隔行和数据行）
+    ("table", re.compile(r"<table\b.*?</table>", re.I | re.S)),
+    (
+        "table",
+        re.compile(
+            r"^[ \t]*\|[^\n]*\n[ \t]*\|?[ \t:|-]*-[ \t:|-]*\n(?:[ \t]*\|[^\n]*(?:\n|$))*",
+            re.M,
+        ),
+    ),
+    # 行间公式和 LaTeX 环境
+    ("math", re.compile(r"\$\$.+?\$\$|\\\[.+?\\\]", re.S)),
+    ("math", re.compile(r"\\begin\{([a-zA-Z*]+)\}.*?\\end\{\1\}", re.S)),
+    # HTML 注释（包括逐页翻译时的页面分隔标记）
+    ("comment", re.compile(r"<!--.*?-->", re.S)),
+    # 行内代码（不跨越空行）
+    ("code", re.compile(r"(`+)(?!`)(?:(?!\n\s*\n).)+?(?<!`)\1(?!`)", re.S)),
+    # 行内公式：$ 两侧不能是空白，结束的 $ 后不能紧跟数字（避免匹配金额）
+    ("math", re.compile(r"(?<![\\$])\$(?![\s$])[^$\n]+?(?<![\s\\])\$(?!\d)")),
+    ("math", re.compile(r"\\\(.+?\\\)")),
+    # URL（可包含成对的括号，如维基百科链接；不含末尾的标点和不成对的右括号）
+    (
+        "url",
+        re.compile(
+            r"<?(?:https?|ftp)://(?:[^\s<>()\[\]]|\([^\s<>()\[\]]*\))+"
+            r"(?<![.,;:!?'\"])>?"
+        ),
+    ),
+    # 文件路径：~/、./、../ 开头，至少两级的绝对路径，或包含目录且带扩展名；
+    # 必须包含字母，分数和比例（如 1/2.5）不是路径
+    (
+        "path",
+        re.compile(
+            r"(?<![\w/.~-])(?=[\w./~-]*[A-Za-z])"
+            r"(?:(?:~|\.{1,2})/(?:[\w.-]+/)*[\w.-]+"
+            r"|/(?:[\w.-]+/)+[\w.-]+"
+            r"|(?:[\w.-]+/)+[\w-]+\.[A-Za-z0-9]{1,5})(?<!\.)(?![\w/])"
+        ),
+    ),
+]
+
+
+def _placeholder(index: int) -> str:
+    """生成第 index 个占位符."""
+    return f"⟦{index}⟧"
+
+
+def protected_spans(text: str) -> list[tuple[str, str]]:
+    """列出文本中不需要翻译的片段.
+
+    Args:
+        text: Markdown 文本
+
+    Returns:
+        (类型, 原文) 列表，类型为 code、table、math、comment、url、path 或
+        placeholder
+    """
+    return mask_spans(text)[1]
+
+
+def mask_spans(text: str) -> tuple[str, list[tuple[str, str]]]:
+    """将代码、表格、公式、URL 和文件路径替换为占位符.
+
+    表格末尾的换行符保留在占位符之外，使块结构保持不变。
+
+    Args:
+        text: Markdown 文本
+
+    Returns:
+        (替换后的文本, 片段列表)，第 i 个片段对应占位符 ⟦i⟧
+    """
+    spans: list[tuple[str, str]] = []
+
+    def replace(kind: str, match: re.Match[str]) -> str:
+        span = match.group(0)
+        trailing = span[len(span.rstrip("\n")) :]
+        spans.append((kind, span[: len(span) - len(trailing)]))
+        return _placeholder(len(spans) - 1) + trailing
+
+    # 原文中本来就像占位符的文本先原样保护，还原时不会与生成的占位符混淆
+    masked = PLACEHOLDER_RE.sub(lambda match: replace("placeholder", match), text)
+    for kind, pattern in SPAN_PATTERNS:
+        masked = _sub_outside_placeholders(
+            pattern, masked, lambda match, kind=kind: replace(kind, match)
+        )
+    return masked, spans
+
+
+def _sub_outside_placeholders(
+    pattern: re.Pattern[str], text: str, replace: Callable[[re.Match[str]], str]
+) -> str:
+    """替换 pattern 的匹配，跳过与已有占位符重叠的匹配."""
+    taken = [m.span() for m in PLACEHOLDER_RE.finditer(text)]
+    parts = []
+    last = 0
+    for match in pattern.finditer(text):
+        start, end = match.span()
+        if start == end or any(s < end and start < e for s, e in taken):
+            continue
+        parts.append(text[last:start])
+        parts.append(replace(match))
+        last = end
+    parts.append(text[last:])
+    return "".join(parts)
+
+
+def unmask_spans(text: str, spans: list[tuple[str, str]]) -> tuple[str, list[int]]:
+    """将占位符还原为原始片段.
+
+    Args:
+        text: 含占位符的文本（如译文）
+        spans: mask_spans 返回的片段列表
+
+    Returns:
+        (还原后的文本, 译文中缺失的占位符编号列表)
+    """
+    seen: set[int] = set()
+
+    def restore(match: re.Match[str]) -> str:
+        index = int(match.group(1))
+        if index >= len(spans):
+            return match.group(0)
+        seen.add(index)
+        return spans[index][1]
+
+    restored = PLACEHOLDER_RE.sub(restore, text)
+    return restored, [i for i in range(len(spans)) if i not in seen]
+
+
+def lost_spans(original: str, translated: str) -> list[tuple[str, str]]:
+    """找出原文中未在译文里原样出现的受保护片段.
+
+    Args:
+        original: 原文
+        translated: 译文
+
+    Returns:
+        缺失的 (类型, 原文) 列表（同一片段出现多次时按次数计算）
+    """
+    needed = Counter(protected_spans(original))
+    lost = []
+    for (kind, span), count in needed.items():
+        if kind == "placeholder":
+            continue
+        missing = count - translated.count(span)
+        lost.extend([(kind, span)] * max(missing, 0))
+    return lost
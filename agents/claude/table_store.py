@@ -0,0 +1,406 @@
+"""Table store - 以列式文件保存提取的表格，并按论文、页码和表头建立索引."""
+
+import asyncio
+import json
+import logging
+import os
+import struct
+import sys
+import threading
+from array import array
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # Windows：只能保证进程内互斥
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# 文件头：magic、格式版本、表格数、字符串数、单元格数（小端）
+TABLE_FILE_HEADER = struct.Struct("<4sHIII")
+TABLE_FILE_MAGIC = b"PTBL"
+TABLE_FILE_VERSION = 1
+# 每个表格的描述字段：page、index、rows、cols、首个单元格偏移
+TABLE_FIELDS = 5
+INDEX_FILE = "index.json"
+# 跨进程更新索引时持有的锁文件
+INDEX_LOCK_FILE = "index.lock"
+
+
+def normalize_header(text: str) -> str:
+    """规范化表头用于索引（忽略大小写和空白差异）.
+
+    Args:
+        text: 表头单元格文本
+
+    Returns:
+        规范化后的表头
+    """
+    return " ".join(text.split()).casefold()
+
+
+def _to_disk(values: array) -> bytes:
+    """将数组转换为小端字节."""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_disk(typecode: str, data: bytes) -> array:
+    """从小端字节读取数组."""
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def encode_tables(tables: list[dict[str, Any]]) -> bytes:
+    """将表格编码为列式二进制格式.
+
+    所有单元格文本放入去重的字符串池，每个表格按列存储字符串编号
+    （第 0 行为表头），短行用空字符串补齐。
+
+    Args:
+        tables: pdf-reader 返回的表格列表（page、index、rows）
+
+    Returns:
+        编码后的字节
+    """
+    strings: dict[str, int] = {}
+    descriptors = array("I")
+    cells = array("I")
+    for table in tables:
+        rows = [
+            ["" if cell is None else str(cell) for cell in row] for row in table["rows"]
+        ]
+        n_cols = max((len(row) for row in rows), default=0)
+        descriptors.extend(
+            (table["page"], table["index"], len(rows), n_cols, len(cells))
+        )
+        for col in range(n_cols):
+            for row in rows:
+                text = row[col] if col < len(row) else ""
+                cells.append(strings.setdefault(text, len(strings)))
+
+    blob = bytearray()
+    offsets = array("I", [0])
+    for text in strings:
+        blob += text.encode("utf-8")
+        offsets.append(len(blob))
+
+    return b"".join(
+        (
+            TABLE_FILE_HEADER.pack(
+                TABLE_FILE_MAGIC,
+                TABLE_FILE_VERSION,
+                len(tables),
+                len(strings),
+                len(cells),
+            ),
+            _to_disk(descriptors),
+            _to_disk(offsets),
+            _to_disk(cells),
+            bytes(blob),
+        )
+    )
+
+
+def decode_tables(data: bytes) -> list[dict[str, Any]]:
+    """解码列式二进制格式.
+
+    Args:
+        data: encode_tables 生成的字节
+
+    Returns:
+        表格列表，每项包含 page、index、header 和 rows
+
+    Raises:
+        ValueError: 数据格式无效
+    """
+    if len(data) < TABLE_FILE_HEADER.size:
+        raise ValueError("Truncated table file")
+    magic, version, n_tables, n_strings, n_cells = TABLE_FILE_HEADER.unpack_from(data)
+    if magic != TABLE_FILE_MAGIC or version != TABLE_FILE_VERSION:
+        raise ValueError(f"Unsupported table file (magic={magic!r}, version={version})")
+
+    item = array("I").itemsize
+    sizes = (n_tables * TABLE_FIELDS, n_strings + 1, n_cells)
+    sections = []
+    position = TABLE_FILE_HEADER.size
+    for count in sizes:
+        end = position + count * item
+        if end > len(data):
+            raise ValueError("Truncated table file")
+        sections.append(_from_disk("I", data[position:end]))
+        position = end
+    descriptors, offsets, cells = sections
+    blob = data[position:]
+    if offsets[-1] != len(blob):
+        raise ValueError("Truncated table file")
+
+    strings = [
+        blob[offsets[i] : offsets[i + 1]].decode("utf-8") for i in range(n_strings)
+    ]
+    tables = []
+    for t in range(n_tables):
+        page, index, n_rows, n_cols, start = descriptors[
+            t * TABLE_FIELDS : (t + 1) * TABLE_FIELDS
+        ]
+        columns = [
+            cells[start + col * n_rows : start + (col + 1) * n_rows]
+            for col in range(n_cols)
+        ]
+        rows = [[strings[column[r]] for column in columns] for r in range(n_rows)]
+        tables.append(
+            {
+                "page": page,
+                "index": index,
+                "header": rows[0] if rows else [],
+                "rows": rows,
+            }
+        )
+    return tables
+
+
+class TableStore:
+    """提取表格的列式存储.
+
+    每篇论文的表格保存为 ``<root>/<category>/<paper_id>.tbl``，
+    ``<root>/index.json`` 记录每个表格的论文、页码、尺寸和表头，按列名查找
+    表格只需读取索引，无需重新解析 PDF。所有公开方法都是异步的，文件读写
+    在线程中执行。API 服务和批处理进程可能共用同一目录，更新索引时持有
+    ``<root>/index.lock`` 上的文件锁，读取—修改—写入期间不会丢失其他进程
+    写入的条目。
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        """初始化表格存储.
+
+        Args:
+            root: 存储根目录（通常为 papers/tables）
+        """
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        # 内存中的索引及其对应的索引文件修改时间
+        self._index: dict[str, list[dict[str, Any]]] | None = None
+        self._index_mtime: int | None = None
+        # 规范化表头 -> [(paper_id, 索引条目, 列号)]
+        self._by_header: dict[str, list[tuple[str, dict[str, Any], int]]] = {}
+
+    def _path(self, paper_id: str) -> Path:
+        """获取论文表格文件路径."""
+        category = paper_id.split("_")[0] if "_" in paper_id else "general"
+        return self.root / category / f"{paper_id}.tbl"
+
+    @contextmanager
+    def _index_file_lock(self) -> Iterator[None]:
+        """跨进程独占索引文件（需持有进程内的锁）."""
+        if fcntl is None:
+            yield
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / INDEX_LOCK_FILE, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _load_index(self, reload: bool = False) -> dict[str, list[dict[str, Any]]]:
+        """读取索引，索引文件被其他进程更新时重新加载（需持有锁）.
+
+        Args:
+            reload: 是否忽略修改时间、总是重新读取索引文件
+        """
+        path = self.root / INDEX_FILE
+        mtime = path.stat().st_mtime_ns if path.exists() else None
+        if reload or self._index is None or mtime != self._index_mtime:
+            index: dict[str, list[dict[str, Any]]] = {}
+            if mtime is not None:
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        index = json.load(f)["papers"]
+                except (ValueError, KeyError):
+                    logger.warning(f"Discarding corrupt table index {path}")
+            self._set_index(index, mtime)
+        return self._index
+
+    def _set_index(
+        self, index: dict[str, list[dict[str, Any]]], mtime: int | None
+    ) -> None:
+        """替换内存索引并重建表头倒排表."""
+        by_header: dict[str, list[tuple[str, dict[str, Any], int]]] = {}
+        for paper_id, entries in index.items():
+            for entry in entries:
+                for col, name in enumerate(entry["header"]):
+                    key = normalize_header(name)
+                    if key:
+                        by_header.setdefault(key, []).append((paper_id, entry, col))
+        self._index = index
+        self._index_mtime = mtime
+        self._by_header = by_header
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        """先写临时文件再替换，避免读到写了一半的文件."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def _update_index(
+        self, paper_id: str, entries: list[dict[str, Any]] | None
+    ) -> None:
+        """更新论文的索引条目，entries 为 None 时删除（需持有锁）."""
+        with self._index_file_lock():
+            index = dict(self._load_index(reload=True))
+            if entries:
+                index[paper_id] = entries
+            else:
+                index.pop(paper_id, None)
+            path = self.root / INDEX_FILE
+            self._write_atomic(
+                path, json.dumps({"papers": index}, ensure_ascii=False).encode("utf-8")
+            )
+            self._set_index(index, path.stat().st_mtime_ns)
+
+    def _save(self, paper_id: str, tables: list[dict[str, Any]]) -> None:
+        with self._lock:
+            if not tables:
+                self._delete(paper_id)
+                return
+            self._write_atomic(self._path(paper_id), encode_tables(tables))
+            entries = [
+                {
+                    "page": table["page"],
+                    "index": table["index"],
+                    "rows": len(table["rows"]),
+                    "header": [
+                        "" if cell is None else str(cell)
+                        for cell in (table["rows"][0] if table["rows"] else [])
+                    ],
+                }
+                for table in tables
+            ]
+            self._update_index(paper_id, entries)
+
+    async def save(self, paper_id: str, tables: list[dict[str, Any]]) -> None:
+        """保存论文的表格，替换已保存的表格.
+
+        Args:
+            paper_id: 论文ID
+            tables: pdf-reader 返回的表格列表（page、index、rows）
+        """
+        await asyncio.to_thread(self._save, paper_id, tables)
+
+    def _load(
+        self, paper_id: str, page: int | None, index: int | None
+    ) -> list[dict[str, Any]]:
+        path = self._path(paper_id)
+        if not path.exists():
+            return []
+        tables = decode_tables(path.read_bytes())
+        return [
+            {"paper_id": paper_id, **table}
+            for table in tables
+            if (page is None or table["page"] == page)
+            and (index is None or table["index"] == index)
+        ]
+
+    async def load(
+        self, paper_id: str, page: int | None = None, index: int | None = None
+    ) -> list[dict[str, Any]]:
+        """读取论文的表格.
+
+        Args:
+            paper_id: 论文ID
+            page: 只返回该页（从 1 开始）的表格
+            index: 只返回页内序号为该值的表格
+
+        Returns:
+            表格列表，每项包含 paper_id、page、index、header 和 rows
+        """
+        return await asyncio.to_thread(self._load, paper_id, page, index)
+
+    def _find(
+        self, column: str | None, paper_id: str | None, page: int | None
+    ) -> list[dict[str, Any]]:
+        with self._lock:
+            index = self._load_index()
+            if column is not None:
+                candidates = self._by_header.get(normalize_header(column), [])
+            else:
+                candidates = [
+                    (pid, entry, None)
+                    for pid, entries in index.items()
+                    for entry in entries
+                ]
+            return [
+                {"paper_id": pid, **entry, "column": col}
+                for pid, entry, col in candidates
+                if (paper_id is None or pid == paper_id)
+                and (page is None or entry["page"] == page)
+            ]
+
+    async def find(
+        self,
+        column: str | None = None,
+        paper_id: str | None = None,
+        page: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """在索引中查找表格（不读取表格文件）.
+
+        Args:
+            column: 表头名称（忽略大小写和空白差异），为空时不按表头过滤
+            paper_id: 只查找该论文的表格
+            page: 只查找该页（从 1 开始）的表格
+
+        Returns:
+            索引条目列表，每项包含 paper_id、page、index、rows、header，
+            以及匹配列的序号 column（未按表头查找时为 None）
+        """
+        return await asyncio.to_thread(self._find, column, paper_id, page)
+
+    def _delete(self, paper_id: str) -> None:
+        """删除论文的表格文件和索引条目（需持有锁）."""
+        path = self._path(paper_id)
+        if path.exists():
+            path.unlink()
+        if paper_id in self._load_index():
+            self._update_index(paper_id, None)
+
+    async def delete(self, paper_id: str) -> None:
+        """删除论文的表格.
+
+        Args:
+            paper_id: 论文ID
+        """
+
+        def delete() -> None:
+            with self._lock:
+                self._delete(paper_id)
+
+        await asyncio.to_thread(delete)
+
+
+_stores: dict[str, TableStore] = {}
+
+
+def get_table_store(papers_dir: str | Path) -> TableStore:
+    """获取 papers 目录对应的进程级共享表格存储.
+
+    Args:
+        papers_dir: 论文根目录
+
+    Returns:
+        TableStore 实例
+    """
+    root = str(Path(papers_dir) / "tables")
+    if root not in _stores:
+        _stores[root] = TableStore(root)
+    return _stores[root]
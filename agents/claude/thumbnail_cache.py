@@ -0,0 +1,137 @@
+"""Thumbnail cache - 按需渲染并缓存 PDF 页面缩略图."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+from agents.core.cache import DiskLRUCache
+
+from .pdf_engine import PDFExtractionEngine, get_extraction_engine
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SUBDIR = Path(".cache") / "thumbnails"
+# 缩略图格式或渲染参数发生变化时递增，使已缓存的缩略图失效
+THUMBNAIL_VERSION = "1"
+
+
+class ThumbnailCache:
+    """页面缩略图缓存.
+
+    缩略图在首次请求时由提取引擎的进程池渲染，之后直接从磁盘读取；
+    缓存键只依赖文件的路径、大小和修改时间，命中时 API 进程无需打开 PDF。
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        max_bytes: int,
+        engine: PDFExtractionEngine | None = None,
+    ) -> None:
+        """初始化缩略图缓存.
+
+        Args:
+            cache_dir: 缓存目录
+            max_bytes: 缓存总大小上限（字节）
+            engine: 渲染使用的提取引擎，默认使用进程级共享引擎
+        """
+        self._store = DiskLRUCache(cache_dir, max_bytes, suffix=".jpg")
+        self._engine = engine
+        # 正在渲染的缩略图，同一缩略图的并发请求共享一次渲染
+        self._pending: dict[str, asyncio.Future[dict[str, Any]]] = {}
+
+    @property
+    def engine(self) -> PDFExtractionEngine:
+        """渲染使用的提取引擎."""
+        return self._engine or get_extraction_engine()
+
+    def make_key(self, file_path: str, page_number: int, width: int) -> str:
+        """根据文件状态、页码和宽度生成缓存键.
+
+        Args:
+            file_path: PDF 文件路径
+            page_number: 页码（从 1 开始）
+            width: 缩略图宽度（像素）
+
+        Returns:
+            缓存键
+        """
+        stat = os.stat(file_path)
+        payload = json.dumps(
+            [
+                os.path.abspath(file_path),
+                stat.st_size,
+                stat.st_mtime_ns,
+                page_number,
+                width,
+                THUMBNAIL_VERSION,
+            ]
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, file_path: str, page_number: int, width: int) -> bytes:
+        """获取页面缩略图，未缓存时渲染.
+
+        Args:
+            file_path: PDF 文件路径
+            page_number: 页码（从 1 开始）
+            width: 缩略图宽度（像素）
+
+        Returns:
+            JPEG 数据
+
+        Raises:
+            ValueError: 页码超出文档范围
+        """
+        key = self.make_key(file_path, page_number, width)
+        data = await asyncio.to_thread(self._store.get, key)
+        if data is not None:
+            return data
+
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(
+                self.engine.render_thumbnail(file_path, page_number - 1, width)
+            )
+            self._pending[key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        rendered = await asyncio.shield(pending)
+
+        if rendered["image"] is None:
+            raise ValueError(
+                f"Page {page_number} out of range (1-{rendered['page_count']})"
+            )
+        if not self._store.contains(key):
+            await asyncio.to_thread(self._store.put, key, rendered["image"])
+        return rendered["image"]
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取缓存统计信息.
+
+        Returns:
+            命中/未命中计数、条目数和大小
+        """
+        return self._store.get_stats()
+
+
+_caches: dict[str, ThumbnailCache] = {}
+
+
+def get_thumbnail_cache(papers_dir: str | Path) -> ThumbnailCache:
+    """获取 papers 目录对应的进程级共享缩略图缓存.
+
+    Args:
+        papers_dir: 论文根目录
+
+    Returns:
+        ThumbnailCache 实例
+    """
+    cache_dir = str(Path(papers_dir) / THUMBNAIL_SUBDIR)
+    if cache_dir not in _caches:
+        max_mb = int(os.getenv("THUMBNAIL_CACHE_MAX_MB", "128"))
+        _caches[cache_dir] = ThumbnailCache(cache_dir, max_mb * 1024 * 1024)
+    return _caches[cache_dir]
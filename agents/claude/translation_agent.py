@@ -1,13 +1,36 @@
 """Translation Agent - 封装翻译功能."""
 
+import asyncio
 import logging
+from collections.abc import Awaitable, Callable
 from pathlib import Path
 from typing import Any
 
 from .base import BaseAgent
+from .markdown_chunker import DEFAULT_TOKEN_BUDGET, split_blocks, split_markdown
+from .pdf_backends import page_fingerprint
+from .span_masker import lost_spans
+from .translation_memory import get_translation_memory, segment_hash
+from .translation_segments import (
+    UNIT_BREAK,
+    TranslationCheckpoint,
+    join_segments,
+    load_segments,
+    plan_segments,
+    plan_units,
+    render_segment,
+    save_segments,
+    segments_file,
+    segments_layout,
+    split_units,
+)
+from .translation_stream import RenderCallback, TranslationStream
 
 logger = logging.getLogger(__name__)
 
+# 单个调用完成时的回调：(调用序号, 调用结果)
+ResultCallback = Callable[[int, dict[str, Any]], Awaitable[None]]
+
 
 class TranslationAgent(BaseAgent):
     """翻译处理专用 Agent."""
@@ -27,7 +50,7 @@ class TranslationAgent(BaseAgent):
             "preserve_format": True,
             "preserve_code": True,
             "preserve_formulas": True,
-            "batch_size": 5000,  # 每批处理的字符数
+            "token_budget": DEFAULT_TOKEN_BUDGET,  # 每批的估算 token 上限
         }
 
     async def process(self, input_data: dict[str, Any]) -> dict[str, Any]:
@@ -59,6 +82,9 @@ class TranslationAgent(BaseAgent):
     async def translate(self, params: dict[str, Any]) -> dict[str, Any]:
         """翻译文本内容.
 
+        传入 on_partial 回调时使用流式翻译：译文按文档顺序边生成边回调，
+        指定 paper_id 时同时追加写入译文文件。
+
         Args:
             params: 翻译参数
 
@@ -71,13 +97,13 @@ class TranslationAgent(BaseAgent):
         preserve_code = params.get("preserve_code", True)
         preserve_formulas = params.get("preserve_formulas", True)
         paper_id = params.get("paper_id")
+        on_partial = params.get("on_partial")
 
         try:
-            # 检查内容长度，决定是否需要批处理
-            content_length = len(content)
-            batch_size = self.default_options["batch_size"]
+            # 按 token 预算分块，决定是否需要批处理
+            token_budget = int(self.default_options["token_budget"])
 
-            if content_length <= int(batch_size):
+            if len(self._split_content(content, token_budget)) <= 1 and not on_partial:
                 # 单次翻译
                 result = await self._translate_single(
                     {
@@ -102,8 +128,9 @@ class TranslationAgent(BaseAgent):
                         "preserve_format": preserve_format,
                         "preserve_code": preserve_code,
                         "preserve_formulas": preserve_formulas,
-                        "batch_size": batch_size,
+                        "token_budget": token_budget,
                         "paper_id": paper_id,
+                        "on_partial": on_partial,
                     }
                 )
 
@@ -120,6 +147,18 @@ class TranslationAgent(BaseAgent):
         Returns:
             翻译结果
         """
+        remembered = await self._recall([params["content"]], params["target_language"])
+        if remembered[0] is not None:
+            return {
+                "success": True,
+                "data": {
+                    "content": remembered[0],
+                    "word_count": len(params["content"].split()),
+                    "batch_count": 1,
+                    "memory_hits": 1,
+                },
+            }
+
         skill_params = {
             "content": params["content"],
             "target_language": params["target_language"],
@@ -131,12 +170,16 @@ class TranslationAgent(BaseAgent):
         result = await self.call_skill("zh-translator", skill_params)
 
         if result["success"]:
+            await self._remember(
+                [(params["content"], result["data"])], params["target_language"]
+            )
             return {
                 "success": True,
                 "data": {
                     "content": result["data"],
                     "word_count": len(params["content"].split()),
                     "batch_count": 1,
+                    "memory_hits": 0,
                 },
             }
         else:
@@ -145,30 +188,137 @@ class TranslationAgent(BaseAgent):
     async def _translate_batch(self, params: dict[str, Any]) -> dict[str, Any]:
         """批量翻译.
 
+        指定 paper_id 时，源文本分段与译文文件一起保存。再次翻译同一论文时
+        与上一次的分段做差异比较，未修改的分段直接复用译文，只有新增或
+        修改的内容需要翻译（见 plan_segments）。每个分段翻译完成后立即写入
+        检查点，中途崩溃后重新翻译时不会重复翻译已完成的分段。
+
         Args:
             params: 批量翻译参数
 
         Returns:
-            翻译结果
+            翻译结果。翻译失败的分段使用原文，并列在 failed_chunks 中，
+            可通过 retry_failed 只重新翻译这些分段
         """
         content = params["content"]
-        batch_size = params["batch_size"]
+        token_budget = params["token_budget"]
         paper_id = params.get("paper_id")
+        target_language = params["target_language"]
+
+        # 分割内容，与上一次翻译的分段对比
+        previous = (
+            await self._load_segments(paper_id, target_language) if paper_id else []
+        )
+        segments = plan_segments(
+            previous, split_blocks(content, token_budget), token_budget
+        )
+        return await self._translate_segments(segments, params)
+
+    async def retry_failed(self, params: dict[str, Any]) -> dict[str, Any]:
+        """只重新翻译论文上一次翻译失败的分段，并重新生成译文文件.
+
+        Args:
+            params: 翻译参数，包含 paper_id 和可选的 target_language、
+                preserve_format、preserve_code、preserve_formulas、on_partial
+
+        Returns:
+            翻译结果（格式同 _translate_batch），retried 为重新翻译的分段数
+        """
+        paper_id = params.get("paper_id")
+        if not paper_id:
+            return {"success": False, "error": "No paper_id provided"}
+        params = {
+            **{k: v for k, v in self.default_options.items() if k != "token_budget"},
+            **params,
+        }
+
+        segments = await self._load_segments(paper_id, params["target_language"])
+        if not segments:
+            return {
+                "success": False,
+                "error": f"No translation segments found for {paper_id}",
+            }
+        retried = sum(1 for segment in segments if segment["translation"] is None)
+        logger.info(f"Retrying {retried} failed segments of {paper_id}")
+
+        result = await self._translate_segments(segments, params)
+        if result["success"]:
+            result["data"]["retried"] = retried
+        return result
+
+    async def _translate_segments(
+        self, segments: list[dict[str, Any]], params: dict[str, Any]
+    ) -> dict[str, Any]:
+        """翻译分段中没有译文的部分，合并并保存结果.
+
+        译文依次来自：分段已有的译文、翻译检查点、翻译记忆，其余分段调用
+        zh-translator 翻译。
+
+        Args:
+            segments: 按文档顺序排列的分段（见 plan_segments）
+            params: 翻译参数
 
-        # 分割内容
-        batches = self._split_content(content, batch_size)
+        Returns:
+            翻译结果
+        """
+        paper_id = params.get("paper_id")
+        target_language = params["target_language"]
+        batches = [segment["source"] for segment in segments]
+        remembered: list[str | None] = [segment["translation"] for segment in segments]
+        changed = [i for i, text in enumerate(remembered) if text is None]
+
+        # 中途中断的翻译：检查点中已完成的分段不再翻译
+        checkpoint = None
+        resumed = 0
+        if paper_id:
+            checkpoint = TranslationCheckpoint(
+                self._translation_file(paper_id), target_language
+            )
+            done = await checkpoint.load()
+            for i in changed:
+                text = done.get(segment_hash(batches[i]))
+                if text is not None:
+                    remembered[i] = text
+                    resumed += 1
+
+        logger.info(
+            f"Splitting content into {len(batches)} batches for translation, "
+            f"reusing {len(batches) - len(changed)} unchanged segments"
+        )
 
-        logger.info(f"Splitting content into {len(batches)} batches for translation")
+        # 翻译记忆中已有的批次不再调用 Skill
+        missing = [i for i in changed if remembered[i] is None]
+        recalled = await self._recall([batches[i] for i in missing], target_language)
+        for i, text in zip(missing, recalled, strict=True):
+            remembered[i] = text
+        pending = [i for i, hit in enumerate(remembered) if hit is None]
+
+        stream = None
+        if params.get("on_partial"):
+            render = None
+            if any(segment.get("separators") for segment in segments):
+
+                def render(i: int, text: str) -> str:
+                    return render_segment(segments[i], text)
+
+            stream = await self._open_stream(
+                segments_layout(segments),
+                batches,
+                remembered,
+                paper_id,
+                params["on_partial"],
+                render,
+            )
 
         # 准备批量调用
         calls = []
-        for batch in batches:
+        for batch in (batches[i] for i in pending):
             calls.append(
                 {
                     "skill": "zh-translator",
                     "params": {
                         "content": batch,
-                        "target_language": params["target_language"],
+                        "target_language": target_language,
                         "preserve_format": params["preserve_format"],
                         "preserve_code_blocks": params["preserve_code"],
                         "preserve_math_formulas": params["preserve_formulas"],
@@ -176,29 +326,70 @@ class TranslationAgent(BaseAgent):
                 }
             )
 
-        # 批量翻译
-        results = await self.batch_call_skill(calls)
+        # 批量翻译，每个分段完成后立即写入检查点
+        on_result = None
+        if checkpoint is not None:
+
+            async def on_result(n: int, result: dict[str, Any]) -> None:
+                source = batches[pending[n]]
+                await checkpoint.record(source, self._check_breaks(source, result))
+
+        results = await self._run_calls(calls, pending, batches, stream, on_result)
+        results = [
+            self._check_breaks(batches[i], result)
+            for i, result in zip(pending, results, strict=True)
+        ]
+
+        translated: list[str | None] = list(remembered)
+        errors: dict[int, str] = {}
+        learned = []
+        for i, result in zip(pending, results, strict=True):
+            if isinstance(result, dict) and result.get("success"):
+                translated[i] = result["data"]
+                learned.append((batches[i], result["data"]))
+            else:
+                errors[i] = (
+                    result.get("error", "Unknown error")
+                    if isinstance(result, dict)
+                    else str(result)
+                )
+                logger.error(f"Batch {i} translation failed: {errors[i]}")
+        await self._remember(learned, target_language)
 
         # 合并结果
         translated_batches = []
         total_word_count = 0
 
-        for i, result in enumerate(results):
-            if isinstance(result, dict) and result.get("success"):
-                translated_batches.append(result["data"])
-                total_word_count += len(result["data"].split())
-            else:
-                logger.error(f"Batch {i} translation failed: {result}")
-                # 使用原文作为后备
-                translated_batches.append(batches[i])
-                total_word_count += len(batches[i].split())
+        for i, text in enumerate(translated):
+            # 翻译失败的批次使用原文作为后备
+            text = batches[i] if text is None else text
+            translated_batches.append(text)
+            total_word_count += len(text.split())
+
+        # 合并翻译内容（批次边界即 Markdown 块边界）
+        translated_content = join_segments(segments, translated_batches)
 
-        # 合并翻译内容
-        translated_content = "".join(translated_batches)
+        # 记录各分段的结果（翻译失败的分段记录错误、不保存译文）
+        for i, (segment, text) in enumerate(zip(segments, translated, strict=True)):
+            segment["translation"] = text
+            segment.pop("error", None)
+            if i in errors:
+                segment["error"] = errors[i]
 
-        # 保存翻译结果
+        # 保存翻译结果和分段
         if paper_id:
-            await self._save_translation(paper_id, translated_content)
+            await self._save_translation(
+                paper_id, translated_content, segments, target_language
+            )
+            # 分段记录已包含全部结果，检查点不再需要
+            if checkpoint is not None:
+                await checkpoint.remove()
+
+        if errors:
+            logger.warning(
+                f"{len(errors)} of {len(batches)} batches failed and kept the "
+                "source text"
+            )
 
         return {
             "success": True,
@@ -206,74 +397,330 @@ class TranslationAgent(BaseAgent):
                 "content": translated_content,
                 "word_count": total_word_count,
                 "batch_count": len(batches),
+                "memory_hits": len(missing) - len(pending),
+                "reused_segments": len(batches) - len(changed),
+                "resumed_segments": resumed,
+                "failed_chunks": [
+                    {"index": i, "error": error} for i, error in errors.items()
+                ],
             },
         }
 
-    def _split_content(self, content: str, batch_size: int) -> list[str]:
-        """将内容分割成批次。
+    @staticmethod
+    def _check_breaks(source: str, result: Any) -> Any:
+        """跨页分段的译文必须保留全部页面分隔标记，否则视为翻译失败.
+
+        Args:
+            source: 分段源文本
+            result: zh-translator 的调用结果
+
+        Returns:
+            调用结果，分隔标记数量不一致时为失败结果
+        """
+        if (
+            isinstance(result, dict)
+            and result.get("success")
+            and result["data"].count(UNIT_BREAK) != source.count(UNIT_BREAK)
+        ):
+            return {"success": False, "error": "Translation lost page breaks"}
+        return result
+
+    async def translate_pages(self, params: dict[str, Any]) -> dict[str, Any]:
+        """逐页翻译，复用旧版本中未修改页面和未修改分段的译文.
+
+        译文按页面文本层指纹索引：指纹在 translations 中的页面直接使用已有
+        译文。其余页面按 Markdown 块与上一次翻译的分段做差异比较（见
+        plan_units），未修改的分段直接复用译文，待翻译的块跨页合并到 token
+        预算内，与 _translate_batch 一样经过检查点和翻译记忆后再翻译，译文
+        按页面分隔标记拆回各页。上一次的分段取自本论文，
+        没有时取自 previous_paper_id（同一论文的旧版本）。页面标题不参与
+        翻译，因此页面在新版本中移动位置后，已有译文仍可复用。
+
+        Args:
+            params: 翻译参数，包含 header（元数据头）、pages（pdf-reader 返回的
+                逐页记录）、translations（指纹 -> 已有译文）、paper_id、
+                previous_paper_id 和可选的 on_partial 流式回调（同 translate）
+
+        Returns:
+            翻译结果，translations 字段包含本次使用的全部译文（含有翻译失败
+            分段的页面不计入 translations，失败的分段列在 failed_chunks 中）
+        """
+        header = params.get("header", "")
+        pages = params.get("pages", [])
+        known = params.get("translations") or {}
+        paper_id = params.get("paper_id")
+        token_budget = int(self.default_options["token_budget"])
+        params = {
+            **{k: v for k, v in self.default_options.items() if k != "token_budget"},
+            **params,
+        }
+        target_language = params["target_language"]
+
+        try:
+            # 文档单元：元数据头和每页正文，页面标题作为单元前的固定文本
+            units = [
+                {"fingerprint": page_fingerprint(header), "lead": "", "text": header}
+            ]
+            for n, page in enumerate(pages):
+                lead = "\n" if n else ""
+                lead += page["heading"] + ("\n" if page["body"] else "")
+                units.append(
+                    {
+                        "fingerprint": page["fingerprint"],
+                        "lead": lead,
+                        "text": page["body"],
+                    }
+                )
+            for unit in units:
+                unit["translation"] = known.get(unit["fingerprint"])
+
+            previous: list[dict[str, Any]] = []
+            for candidate in (paper_id, params.get("previous_paper_id")):
+                if candidate and not previous:
+                    previous = await self._load_segments(candidate, target_language)
+            segments, owners = plan_units(previous, units, token_budget)
+
+            result = await self._translate_segments(segments, params)
+            if not result["success"]:
+                return result
+
+            # 按单元汇总分段译文（跨页分段按页面分隔标记拆分）
+            pieces: dict[int, list[str]] = {}
+            failed: set[int] = set()
+            for segment, unit_indexes in zip(segments, owners, strict=True):
+                text = segment["translation"]
+                if text is None:
+                    failed.update(unit_indexes)
+                    continue
+                texts = split_units(text) if segment.get("breaks") else [text]
+                if not unit_indexes:
+                    continue
+                for n, text in zip(unit_indexes, texts, strict=True):
+                    pieces.setdefault(n, []).append(text)
+            translations = {
+                units[n]["fingerprint"]: "\n\n".join(texts)
+                for n, texts in pieces.items()
+                if n not in failed
+            }
+            translatable = [n for n, unit in enumerate(units) if unit["text"].strip()]
+            reused = sum(1 for n in translatable if units[n]["translation"] is not None)
+
+            result["data"].update(
+                {
+                    "translations": translations,
+                    "reused_units": reused,
+                    "translated_units": len(translatable) - reused - len(failed),
+                    "failed_units": len(failed),
+                }
+            )
+            return result
+
+        except Exception as e:
+            logger.error(f"Error in page translation: {str(e)}")
+            return {"success": False, "error": str(e)}
+
+    async def _open_stream(
+        self,
+        layout: list[str | int],
+        chunks: list[str],
+        remembered: list[str | None],
+        paper_id: str | None,
+        on_partial: Any,
+        render: RenderCallback | None = None,
+    ) -> TranslationStream:
+        """创建流式输出，并立即输出翻译记忆命中的块.
+
+        Args:
+            layout: 文档布局（见 TranslationStream）
+            chunks: 翻译块
+            remembered: 翻译记忆查找结果
+            paper_id: 论文ID，指定时译文追加写入译文文件
+            on_partial: 部分译文回调
+            render: 翻译块文本的输出形式（见 TranslationStream）
+
+        Returns:
+            TranslationStream 实例
+        """
+        output_file = self._translation_file(paper_id) if paper_id else None
+        stream = TranslationStream(layout, len(chunks), output_file, on_partial, render)
+        for i, text in enumerate(remembered):
+            if text is not None:
+                await stream.complete(i, text)
+        await stream.flush()
+        return stream
+
+    async def _run_calls(
+        self,
+        calls: list[dict[str, Any]],
+        indexes: list[int],
+        chunks: list[str],
+        stream: TranslationStream | None,
+        on_result: ResultCallback | None = None,
+    ) -> list[Any]:
+        """执行翻译调用；有流式输出时逐块流式翻译.
+
+        Args:
+            calls: Skill 调用列表
+            indexes: 每个调用对应的翻译块编号
+            chunks: 翻译块
+            stream: 流式输出，为空时使用 batch_call_skill
+            on_result: 每个调用完成时的回调 (调用序号, 结果)
+
+        Returns:
+            与 calls 对应的调用结果
+        """
+        if stream is None:
+            if not calls:
+                return []
+            if on_result is None:
+                return await self.batch_call_skill(calls)
+            return await self.batch_call_skill(calls, on_result)
+
+        async def run(n: int, call: dict[str, Any], index: int) -> dict[str, Any]:
+            result: dict[str, Any] = {
+                "success": False,
+                "error": "Translation stream ended without a result",
+            }
+            try:
+                async for event in self.stream_skill(call["skill"], call["params"]):
+                    if event.get("type") == "delta":
+                        await stream.feed(index, event["text"])
+                    elif event.get("type") in ("complete", "error"):
+                        result = event
+            finally:
+                # 翻译失败的块按原文输出，最终文件以完成时的整体写入为准
+                text = result["data"] if result.get("success") else chunks[index]
+                await stream.complete(index, text)
+            if on_result is not None:
+                await on_result(n, result)
+            return result
+
+        try:
+            results = await asyncio.gather(
+                *(
+                    run(n, call, index)
+                    for n, (call, index) in enumerate(zip(calls, indexes, strict=True))
+                ),
+                return_exceptions=True,
+            )
+        except BaseException:
+            # 翻译被取消时保留原有译文文件
+            stream.abort()
+            raise
+        await stream.close()
+        return results
+
+    async def _recall(
+        self, segments: list[str], target_language: str
+    ) -> list[str | None]:
+        """从翻译记忆中查找片段译文.
+
+        翻译记忆不可用时视为全部未命中，不影响翻译。
+
+        Args:
+            segments: 源文本片段
+            target_language: 目标语言
+
+        Returns:
+            与 segments 对应的译文列表，未命中为 None
+        """
+        try:
+            memory = get_translation_memory(self.papers_dir)
+            return await memory.lookup(segments, target_language)
+        except Exception as e:
+            logger.warning(f"Translation memory lookup failed: {str(e)}")
+            return [None] * len(segments)
+
+    async def _remember(
+        self, pairs: list[tuple[str, str]], target_language: str
+    ) -> None:
+        """将新译文写入翻译记忆，失败时只记录警告.
+
+        Args:
+            pairs: (源文本片段, 译文) 列表
+            target_language: 目标语言
+        """
+        if not pairs:
+            return
+        try:
+            memory = get_translation_memory(self.papers_dir)
+            await memory.store(pairs, target_language)
+        except Exception as e:
+            logger.warning(f"Failed to update translation memory: {str(e)}")
+
+    def _split_content(self, content: str, token_budget: int) -> list[str]:
+        """按 Markdown 块结构将内容分割成批次.
+
+        完整的标题、段落、代码块、表格和公式会被合并到 token 预算内，
+        只有单个块超过预算时才会被切分（见 split_markdown）。
 
         Args:
             content: 内容
-            batch_size: 批次大小（字符数）
+            token_budget: 每批的估算 token 上限
 
         Returns:
             分割后的内容列表
         """
-        batches = []
-        current_batch = ""
-
-        # 按段落分割，避免在句子中间分割
-        paragraphs = content.split("\n\n")
-
-        for paragraph in paragraphs:
-            # 如果当前批次加上这个段落超过大小限制
-            if len(current_batch) + len(paragraph) + 2 > batch_size:
-                if current_batch:
-                    batches.append(current_batch)
-                    current_batch = ""
-
-                # 如果单个段落就超过限制，强制分割
-                if len(paragraph) > batch_size:
-                    sentences = paragraph.split("。")
-                    temp_batch = ""
-
-                    for sentence in sentences:
-                        if len(temp_batch) + len(sentence) + 1 > batch_size:
-                            if temp_batch:
-                                batches.append(temp_batch)
-                                temp_batch = ""
-                        temp_batch += sentence + "。"
-
-                    if temp_batch:
-                        current_batch = temp_batch
-                else:
-                    current_batch = paragraph
-            else:
-                if current_batch:
-                    current_batch += "\n\n" + paragraph
-                else:
-                    current_batch = paragraph
+        return split_markdown(content, token_budget)
+
+    def _translation_file(self, paper_id: str) -> Path:
+        """获取论文译文文件路径.
+
+        Args:
+            paper_id: 论文ID
 
-        if current_batch:
-            batches.append(current_batch)
+        Returns:
+            papers/translation/<category>/<paper_id>.md
+        """
+        category = paper_id.split("_")[0] if "_" in paper_id else "general"
+        return self.papers_dir / "translation" / category / f"{paper_id}.md"
 
-        return batches
+    async def _load_segments(
+        self, paper_id: str, target_language: str
+    ) -> list[dict[str, Any]]:
+        """读取论文上一次翻译的分段，读取失败时视为没有旧分段.
 
-    async def _save_translation(self, paper_id: str, content: str) -> None:
+        Args:
+            paper_id: 论文ID
+            target_language: 目标语言
+
+        Returns:
+            分段列表
+        """
+        path = segments_file(self._translation_file(paper_id))
+        try:
+            return await asyncio.to_thread(load_segments, path, target_language)
+        except Exception as e:
+            logger.warning(f"Failed to load translation segments {path}: {str(e)}")
+            return []
+
+    async def _save_translation(
+        self,
+        paper_id: str,
+        content: str,
+        segments: list[dict[str, Any]] | None = None,
+        target_language: str = "zh",
+    ) -> None:
         """保存翻译结果.
 
         Args:
             paper_id: 论文ID
             content: 翻译内容
+            segments: 源文本分段及其译文，指定时保存在译文文件旁
+            target_language: 目标语言
         """
         try:
-            category = paper_id.split("_")[0] if "_" in paper_id else "general"
-            output_dir = self.papers_dir / "translation" / category
-            output_dir.mkdir(parents=True, exist_ok=True)
-
-            output_file = output_dir / f"{paper_id}.md"
+            output_file = self._translation_file(paper_id)
+            output_file.parent.mkdir(parents=True, exist_ok=True)
             with open(output_file, "w", encoding="utf-8") as f:
                 f.write(content)
+            if segments is not None:
+                await asyncio.to_thread(
+                    save_segments,
+                    segments_file(output_file),
+                    segments,
+                    target_language,
+                )
 
             logger.info(f"Translation saved to {output_file}")
         except Exception as e:
@@ -284,6 +731,9 @@ class TranslationAgent(BaseAgent):
     ) -> dict[str, Any]:
         """验证翻译质量.
 
+        代码、公式、表格、URL 和文件路径在翻译时以占位符保护，因此要求它们
+        在译文中原样出现（见 span_masker），缺失的片段逐一列在 lost_spans 中。
+
         Args:
             original: 原文
             translated: 译文
@@ -298,13 +748,9 @@ class TranslationAgent(BaseAgent):
         # 检查长度比例（中文字符通常会少一些）
         length_ratio = translated_length / original_length if original_length > 0 else 0
 
-        # 检查是否保留了代码块
-        code_blocks_original = self._count_code_blocks(original)
-        code_blocks_translated = self._count_code_blocks(translated)
-
-        # 检查是否保留了数学公式
-        formula_blocks_original = self._count_formula_blocks(original)
-        formula_blocks_translated = self._count_formula_blocks(translated)
+        # 检查受保护片段是否原样保留
+        lost = lost_spans(original, translated)
+        lost_kinds = {kind for kind, _ in lost}
 
         validation: dict[str, Any] = {
             "valid": True,
@@ -313,9 +759,9 @@ class TranslationAgent(BaseAgent):
                 "original_length": original_length,
                 "translated_length": translated_length,
                 "length_ratio": length_ratio,
-                "code_blocks_preserved": code_blocks_original == code_blocks_translated,
-                "formulas_preserved": formula_blocks_original
-                == formula_blocks_translated,
+                "code_blocks_preserved": "code" not in lost_kinds,
+                "formulas_preserved": "math" not in lost_kinds,
+                "lost_spans": [{"type": kind, "text": text} for kind, text in lost],
             },
         }
 
@@ -323,14 +769,20 @@ class TranslationAgent(BaseAgent):
         if length_ratio < 0.3 or length_ratio > 2.0:
             validation["warnings"].append("Translation length seems unusual")
 
-        if code_blocks_original != code_blocks_translated:
+        if "code" in lost_kinds:
             validation["warnings"].append("Code blocks may not be preserved correctly")
 
-        if formula_blocks_original != formula_blocks_translated:
+        if "math" in lost_kinds:
             validation["warnings"].append(
                 "Math formulas may not be preserved correctly"
             )
 
+        other_lost = lost_kinds - {"code", "math"}
+        if other_lost:
+            validation["warnings"].append(
+                f"Protected spans were altered: {', '.join(sorted(other_lost))}"
+            )
+
         return validation
 
     def _count_code_blocks(self, content: str) -> int:
@@ -0,0 +1,282 @@
+"""Translation memory - 按源文本片段哈希和目标语言持久化译文（SQLite）."""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+MEMORY_FILE = Path(".cache") / "translation_memory.sqlite3"
+# 单条 SQL 中 IN 查询的最大参数数
+LOOKUP_BATCH = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    source_hash TEXT NOT NULL,
+    target_language TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    source_chars INTEGER NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    used_at REAL NOT NULL,
+    PRIMARY KEY (source_hash, target_language)
+) WITHOUT ROWID
+"""
+
+
+# 代码围栏的起止行
+FENCE_RE = re.compile(r"^[ \t]{0,3}(`{3,}|~{3,})")
+
+
+def normalize_segment(text: str) -> str:
+    """规范化源文本片段（统一换行符，忽略行尾空白和首尾空行）.
+
+    缩进、换行等版式差异会改变 Markdown 结构（代码块、表格、列表），
+    因此保留；代码围栏内的内容原样保留。
+
+    Args:
+        text: 源文本片段
+
+    Returns:
+        规范化后的文本
+    """
+    lines = []
+    fence = None
+    for line in text.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        match = FENCE_RE.match(line)
+        if fence is None:
+            lines.append(line.rstrip())
+            if match:
+                fence = match.group(1)
+        else:
+            # 结束围栏：同种字符、不短于起始围栏，之后只有空白
+            marker = line.strip()
+            if match and marker.startswith(fence) and marker == fence[0] * len(marker):
+                fence = None
+                line = line.rstrip()
+            lines.append(line)
+    return "\n".join(lines).strip("\n")
+
+
+def split_blocks(text: str) -> list[str]:
+    """按空行将片段拆分为段落块.
+
+    Args:
+        text: 源文本片段或译文
+
+    Returns:
+        非空段落块列表
+    """
+    return [block.strip() for block in text.split("\n\n") if block.strip()]
+
+
+def segment_hash(text: str) -> str:
+    """计算源文本片段的哈希.
+
+    Args:
+        text: 源文本片段
+
+    Returns:
+        十六进制 SHA-256
+    """
+    return hashlib.sha256(normalize_segment(text).encode("utf-8")).hexdigest()
+
+
+class TranslationMemory:
+    """片段级翻译记忆.
+
+    以 (源片段哈希, 目标语言) 为键保存译文。除整个片段外，译文与原文段落数
+    一致时还按段落块保存，因此分块边界变化后，完全由已知段落组成的片段
+    （致谢、许可声明、标准章节标题等）仍可命中。数据库在首次使用时打开，
+    使用 WAL 模式以便 API 和批处理进程同时读写。所有公开方法都是异步的，
+    SQLite 操作在线程中执行。
+    """
+
+    def __init__(self, db_path: str | Path) -> None:
+        """初始化翻译记忆.
+
+        Args:
+            db_path: SQLite 数据库文件路径
+        """
+        self.db_path = Path(db_path)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """打开数据库并创建表（需持有锁）."""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.db_path, check_same_thread=False, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.execute(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _lookup(self, hashes: list[str], target_language: str) -> dict[str, str]:
+        found: dict[str, str] = {}
+        unique = list(dict.fromkeys(hashes))
+        with self._lock:
+            conn = self._connect()
+            for start in range(0, len(unique), LOOKUP_BATCH):
+                batch = unique[start : start + LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    "SELECT source_hash, translation FROM segments "
+                    f"WHERE target_language = ? AND source_hash IN ({placeholders})",
+                    [target_language, *batch],
+                ).fetchall()
+                found.update(rows)
+            if found:
+                conn.executemany(
+                    "UPDATE segments SET hits = hits + 1, used_at = ? "
+                    "WHERE source_hash = ? AND target_language = ?",
+                    [(time.time(), h, target_language) for h in found],
+                )
+        return found
+
+    async def lookup(
+        self, segments: list[str], target_language: str
+    ) -> list[str | None]:
+        """查找片段的已有译文.
+
+        Args:
+            segments: 源文本片段
+            target_language: 目标语言
+
+        Returns:
+            与 segments 对应的译文列表，未命中为 None
+        """
+        if not segments:
+            return []
+        hashes = [segment_hash(segment) for segment in segments]
+        block_hashes = []
+        for segment in segments:
+            blocks = split_blocks(segment)
+            block_hashes.append(
+                [segment_hash(block) for block in blocks] if len(blocks) > 1 else []
+            )
+        found = await asyncio.to_thread(
+            self._lookup,
+            hashes + [h for blocks in block_hashes for h in blocks],
+            target_language,
+        )
+
+        results: list[str | None] = []
+        for segment_key, blocks in zip(hashes, block_hashes, strict=True):
+            if segment_key in found:
+                results.append(found[segment_key])
+            elif blocks and all(h in found for h in blocks):
+                results.append("\n\n".join(found[h] for h in blocks))
+            else:
+                results.append(None)
+        hits = sum(1 for result in results if result is not None)
+        self.hits += hits
+        self.misses += len(results) - hits
+        return results
+
+    def _store(self, rows: list[tuple[str, str, str, int, float, float]]) -> None:
+        with self._lock:
+            self._connect().executemany(
+                "INSERT INTO segments (source_hash, target_language, translation, "
+                "source_chars, created_at, used_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (source_hash, target_language) DO UPDATE SET "
+                "translation = excluded.translation, used_at = excluded.used_at",
+                rows,
+            )
+
+    async def store(self, pairs: list[tuple[str, str]], target_language: str) -> None:
+        """保存片段译文，覆盖同一片段的旧译文.
+
+        译文与原文段落数一致时，同时按段落块保存。
+
+        Args:
+            pairs: (源文本片段, 译文) 列表，空白片段被忽略
+            target_language: 目标语言
+        """
+        aligned = []
+        for source, translation in pairs:
+            if not source.strip():
+                continue
+            aligned.append((source, translation))
+            source_blocks = split_blocks(source)
+            translated_blocks = split_blocks(translation)
+            if 1 < len(source_blocks) == len(translated_blocks):
+                aligned.extend(zip(source_blocks, translated_blocks, strict=True))
+
+        now = time.time()
+        rows = [
+            (segment_hash(source), target_language, translation, len(source), now, now)
+            for source, translation in aligned
+        ]
+        if rows:
+            await asyncio.to_thread(self._store, rows)
+
+    def _count(self) -> int:
+        with self._lock:
+            return (
+                self._connect().execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+            )
+
+    async def count(self) -> int:
+        """获取已保存的片段数.
+
+        Returns:
+            片段数
+        """
+        return await asyncio.to_thread(self._count)
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取命中统计.
+
+        Returns:
+            命中、未命中次数和命中率
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0,
+        }
+
+    def close(self) -> None:
+        """关闭数据库连接."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_memories: dict[str, TranslationMemory] = {}
+
+
+def get_translation_memory(papers_dir: str | Path) -> TranslationMemory:
+    """获取进程级共享的翻译记忆.
+
+    数据库默认位于 papers/.cache/translation_memory.sqlite3，可通过
+    TRANSLATION_MEMORY_PATH 环境变量指定其他位置。
+
+    Args:
+        papers_dir: 论文根目录
+
+    Returns:
+        TranslationMemory 实例
+    """
+    db_path = os.getenv("TRANSLATION_MEMORY_PATH") or str(
+        Path(papers_dir) / MEMORY_FILE
+    )
+    if db_path not in _memories:
+        _memories[db_path] = TranslationMemory(db_path)
+    return _memories[db_path]
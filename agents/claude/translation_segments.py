@@ -0,0 +1,427 @@
+"""Translation segments - 保存译文的源文本分段和翻译检查点，按分段差异增量翻译."""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, TextIO
+
+from .markdown_chunker import pack_blocks, split_blocks
+from .translation_memory import segment_hash
+
+logger = logging.getLogger(__name__)
+
+SEGMENTS_VERSION = 1
+
+# 跨单元（页面）合并的分段中单元之间的分隔标记，翻译时作为受保护片段原样保留
+UNIT_BREAK = "<!-- page-break -->"
+UNIT_BREAK_RE = re.compile(r"\n*" + re.escape(UNIT_BREAK) + r"\n*")
+
+
+def segments_file(translation_file: Path) -> Path:
+    """获取译文文件旁的分段记录路径（<paper_id>.segments.json）.
+
+    Args:
+        translation_file: 译文文件路径（<paper_id>.md）
+
+    Returns:
+        分段记录路径
+    """
+    return translation_file.with_suffix(".segments.json")
+
+
+def checkpoint_file(translation_file: Path, target_language: str) -> Path:
+    """获取译文文件旁的翻译检查点路径（.<paper_id>.<目标语言>.translate.jsonl）.
+
+    Args:
+        translation_file: 译文文件路径（<paper_id>.md）
+        target_language: 目标语言
+
+    Returns:
+        检查点路径
+    """
+    return translation_file.with_name(
+        f".{translation_file.stem}.{target_language}.translate.jsonl"
+    )
+
+
+def load_segments(path: Path, target_language: str) -> list[dict[str, Any]]:
+    """读取上一次翻译的分段.
+
+    Args:
+        path: 分段记录路径
+        target_language: 目标语言，与记录不一致时视为没有旧分段
+
+    Returns:
+        分段列表，每个分段包含 source（源文本）、blocks（各块的哈希）、
+        translation（译文，翻译失败时为 None）、失败分段的 error，以及逐页
+        翻译时的 lead、breaks 和 separators（见 plan_units）
+    """
+    if not path.exists():
+        return []
+    try:
+        with open(path, encoding="utf-8") as f:
+            record = json.load(f)
+    except ValueError:
+        logger.warning(f"Discarding corrupt segment record {path}")
+        return []
+    if (
+        record.get("version") != SEGMENTS_VERSION
+        or record.get("target_language") != target_language
+    ):
+        return []
+    return record.get("segments", [])
+
+
+def save_segments(
+    path: Path, segments: list[dict[str, Any]], target_language: str
+) -> None:
+    """原子地写入分段记录.
+
+    Args:
+        path: 分段记录路径
+        segments: 分段列表
+        target_language: 目标语言
+    """
+    record = {
+        "version": SEGMENTS_VERSION,
+        "target_language": target_language,
+        "updated_at": datetime.now().isoformat(),
+        "segments": segments,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class TranslationCheckpoint:
+    """保存在译文文件旁的逐分段翻译检查点.
+
+    检查点是一个 JSON Lines 文件（见 checkpoint_file），
+    每个分段翻译完成（或失败）时追加一行，记录分段源文本的哈希和译文（或
+    错误）。翻译中途崩溃后再次翻译同一论文时，已完成的分段直接从检查点
+    恢复。全部结果写入分段记录后删除检查点。
+    """
+
+    def __init__(self, translation_file: Path, target_language: str) -> None:
+        """初始化检查点.
+
+        Args:
+            translation_file: 译文文件路径（<paper_id>.md）
+            target_language: 目标语言
+        """
+        self.path = checkpoint_file(translation_file, target_language)
+        self._file: TextIO | None = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, str]:
+        """读取已完成的分段（忽略写了一半的末行和失败记录）."""
+        if not self.path.exists():
+            return {}
+
+        done = {}
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                if entry.get("translation") is not None:
+                    done[entry["hash"]] = entry["translation"]
+        return done
+
+    async def load(self) -> dict[str, str]:
+        """读取已完成的分段.
+
+        Returns:
+            分段源文本哈希 -> 译文
+        """
+        done = await asyncio.to_thread(self._load)
+        if done:
+            logger.info(
+                f"Resuming translation after {len(done)} checkpointed segments "
+                f"({self.path.name})"
+            )
+        return done
+
+    def _append(self, entry: dict[str, Any]) -> None:
+        """追加一行并刷新到磁盘."""
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    async def record(self, source: str, result: Any) -> None:
+        """记录一个分段的翻译结果，写入失败时只记录警告.
+
+        Args:
+            source: 分段源文本
+            result: zh-translator 的调用结果
+        """
+        entry: dict[str, Any] = {"hash": segment_hash(source)}
+        if isinstance(result, dict) and result.get("success"):
+            entry["translation"] = result["data"]
+        else:
+            entry["error"] = (
+                result.get("error") if isinstance(result, dict) else str(result)
+            )
+        try:
+            await asyncio.to_thread(self._append, entry)
+        except OSError as e:
+            logger.warning(f"Failed to write translation checkpoint: {str(e)}")
+
+    def _remove(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if self.path.exists():
+            os.unlink(self.path)
+
+    async def remove(self) -> None:
+        """翻译结果保存后删除检查点."""
+        await asyncio.to_thread(self._remove)
+
+
+def plan_segments(
+    previous: list[dict[str, Any]],
+    blocks: list[str],
+    token_budget: int,
+    breaks: set[int] | None = None,
+) -> list[dict[str, Any]]:
+    """对比新旧分段，规划本次翻译的分段.
+
+    以块哈希序列做差异比较：旧分段的全部块在新内容中按顺序连续出现时，
+    整个分段（连同译文）原样复用；其余新增或修改的块按 token 预算重新
+    合并为待翻译分段。被删除的块所在的旧分段自然不再出现。
+
+    块来自多个单元时，breaks 为新单元开始的块序号。合并后跨越单元边界
+    的分段在边界处插入 UNIT_BREAK，并在 breaks 中记录边界前的块数；旧
+    分段只有单元边界位置相同时才会复用。
+
+    Args:
+        previous: 上一次翻译的分段
+        blocks: 新内容的块（split_blocks 的结果）
+        token_budget: 每个分段的估算 token 上限
+        breaks: 新单元开始的块序号
+
+    Returns:
+        按文档顺序排列的分段，待翻译分段的 translation 为 None
+    """
+    breaks = breaks or set()
+    old_hashes: list[str] = []
+    starts: dict[int, dict[str, Any]] = {}
+    for segment in previous:
+        if segment.get("translation") is None or not segment.get("blocks"):
+            continue
+        starts[len(old_hashes)] = segment
+        old_hashes.extend(segment["blocks"])
+
+    new_hashes = [segment_hash(block) for block in blocks]
+    matched: dict[int, int] = {}
+    matcher = SequenceMatcher(None, old_hashes, new_hashes, autojunk=False)
+    for tag, i1, i2, j1, _ in matcher.get_opcodes():
+        if tag == "equal":
+            matched.update({j1 + k: i1 + k for k in range(i2 - i1)})
+
+    plan: list[dict[str, Any]] = []
+    changed: list[int] = []
+
+    def segment_at(i: int, size: int) -> dict[str, Any]:
+        offsets = [k for k in range(1, size) if i + k in breaks]
+        parts = [blocks[i]]
+        for k in range(1, size):
+            parts.append(f"\n\n{UNIT_BREAK}\n\n" if k in offsets else "\n\n")
+            parts.append(blocks[i + k])
+        segment: dict[str, Any] = {
+            "source": "".join(parts),
+            "blocks": new_hashes[i : i + size],
+            "translation": None,
+        }
+        if offsets:
+            segment["breaks"] = offsets
+        return segment
+
+    def flush_changed() -> None:
+        i = changed[0] if changed else 0
+        for group in pack_blocks([blocks[k] for k in changed], token_budget):
+            plan.append(segment_at(i, len(group)))
+            i += len(group)
+        changed.clear()
+
+    i = 0
+    while i < len(blocks):
+        start = matched.get(i)
+        segment = starts.get(start) if start is not None else None
+        size = len(segment["blocks"]) if segment else 0
+        if (
+            segment
+            and all(matched.get(i + k) == start + k for k in range(size))
+            and segment.get("breaks", []) == segment_at(i, size).get("breaks", [])
+        ):
+            flush_changed()
+            plan.append(segment_at(i, size))
+            plan[-1]["translation"] = segment["translation"]
+            i += size
+        else:
+            changed.append(i)
+            i += 1
+    flush_changed()
+    return plan
+
+
+def plan_units(
+    previous: list[dict[str, Any]], units: list[dict[str, Any]], token_budget: int
+) -> tuple[list[dict[str, Any]], list[list[int]]]:
+    """将由多个单元（如元数据头和各页正文）组成的文档规划为分段.
+
+    已有译文的单元整体作为一个分段；其余连续的单元的块合并在一起与上一次
+    的分段做差异比较（见 plan_segments），待翻译的块跨越单元边界按 token
+    预算合并，避免每页单独调用一次翻译。每个分段的 lead 为文档中位于该
+    分段之前的固定文本（单元的 lead 和空白单元），separators 为分段内各
+    单元边界处的固定文本，末尾的固定文本单独作为一个没有块的分段，因此
+    按顺序拼接各分段的 lead 和 render_segment 的结果即得到完整文档（见
+    join_segments）。
+
+    Args:
+        previous: 上一次翻译的分段
+        units: 按文档顺序排列的单元，每个单元包含 lead（单元前的固定文本，
+            如页面标题）、text（源文本）和 translation（已有译文，None
+            表示需要翻译）
+        token_budget: 每个分段的估算 token 上限
+
+    Returns:
+        (分段列表, 每个分段中各单元片段所属单元的序号列表，见 split_units)
+    """
+    segments: list[dict[str, Any]] = []
+    owners: list[list[int]] = []
+    lead = ""
+    # 待翻译的连续单元：块、各块所属单元、单元开始的块序号 -> 之前的固定文本
+    blocks: list[str] = []
+    block_units: list[int] = []
+    separators: dict[int, str] = {}
+
+    def flush_pending() -> None:
+        breaks = set(separators) - {0}
+        i = 0
+        for segment in plan_segments(previous, blocks, token_budget, breaks):
+            offsets = segment.get("breaks", [])
+            segment["lead"] = separators.get(i, "\n\n")
+            if offsets:
+                segment["separators"] = [separators[i + k] for k in offsets]
+            segments.append(segment)
+            owners.append([block_units[i + k] for k in [0, *offsets]])
+            i += len(segment["blocks"])
+        blocks.clear()
+        block_units.clear()
+        separators.clear()
+
+    for n, unit in enumerate(units):
+        text = unit["text"]
+        if not text.strip():
+            # 空白单元原样保留
+            lead += unit["lead"] + text
+            continue
+
+        unit_blocks = split_blocks(text, token_budget)
+        if unit["translation"] is not None:
+            flush_pending()
+            segments.append(
+                {
+                    "source": "\n\n".join(unit_blocks),
+                    "blocks": [segment_hash(block) for block in unit_blocks],
+                    "translation": unit["translation"],
+                    "lead": lead + unit["lead"],
+                }
+            )
+            owners.append([n])
+        else:
+            separators[len(blocks)] = lead + unit["lead"]
+            blocks.extend(unit_blocks)
+            block_units.extend(n for _ in unit_blocks)
+        lead = ""
+    flush_pending()
+
+    if lead:
+        segments.append({"source": "", "blocks": [], "translation": "", "lead": lead})
+        owners.append([])
+    return segments, owners
+
+
+def split_units(text: str) -> list[str]:
+    """按 UNIT_BREAK 将分段的文本拆分为各单元的片段.
+
+    Args:
+        text: 分段的源文本或译文
+
+    Returns:
+        各单元的片段（与 plan_units 返回的所属单元序号一一对应）
+    """
+    return UNIT_BREAK_RE.split(text)
+
+
+def render_segment(segment: dict[str, Any], text: str) -> str:
+    """将分段文本中的 UNIT_BREAK 替换为单元之间的固定文本（如页面标题）.
+
+    Args:
+        segment: 分段
+        text: 分段的源文本或译文
+
+    Returns:
+        文档中该分段的文本
+    """
+    separators = segment.get("separators")
+    if not separators:
+        return text
+    pieces = split_units(text)
+    parts = [pieces[0]]
+    for k, piece in enumerate(pieces[1:]):
+        parts.append(separators[k] if k < len(separators) else "\n\n")
+        parts.append(piece)
+    return "".join(parts)
+
+
+def join_segments(segments: list[dict[str, Any]], texts: list[str]) -> str:
+    """按分段的 lead 拼接各分段的文本.
+
+    没有 lead 的分段（如 _translate_batch 的分段）之间以空行分隔。
+
+    Args:
+        segments: 按文档顺序排列的分段
+        texts: 与 segments 对应的文本（译文或原文）
+
+    Returns:
+        完整文档
+    """
+    parts = []
+    for i, (segment, text) in enumerate(zip(segments, texts, strict=True)):
+        parts.append(segment.get("lead", "\n\n" if i else ""))
+        parts.append(render_segment(segment, text))
+    return "".join(parts)
+
+
+def segments_layout(segments: list[dict[str, Any]]) -> list[str | int]:
+    """生成与 join_segments 一致的流式输出布局（见 TranslationStream）.
+
+    Args:
+        segments: 按文档顺序排列的分段
+
+    Returns:
+        文档布局，整数为分段序号
+    """
+    layout: list[str | int] = []
+    for i, segment in enumerate(segments):
+        lead = segment.get("lead", "\n\n" if i else "")
+        if lead:
+            layout.append(lead)
+        layout.append(i)
+    return layout
@@ -0,0 +1,190 @@
+"""Translation stream - 按文档顺序转发流式译文并追加写入译文文件."""
+
+import asyncio
+import logging
+import os
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import TextIO
+
+logger = logging.getLogger(__name__)
+
+# 部分译文回调：(新增译文, 进度百分比)
+PartialCallback = Callable[[str, float], Awaitable[None]]
+
+# 翻译块文本的输出形式：(翻译块编号, 文本) -> 输出文本
+RenderCallback = Callable[[int, str], str]
+
+
+class TranslationStream:
+    """将并发到达的分块译文按文档顺序输出.
+
+    文档由布局描述：布局项为字符串（原样输出的固定文本，如页面标题和
+    分隔符）或整数（翻译块编号，同一块可出现多次）。各翻译块并发流式
+    翻译，只有位于输出位置的块会立即转发，其余块先缓存、轮到时再输出。
+    正在生成的块只输出到最后一个换行符，避免把半行文本写入文件。指定
+    render 时按 render 的结果输出，正在生成的块末尾的换行符暂不输出，
+    以免后续文本改变这些换行符的输出形式（如连同页面分隔标记替换为页面
+    标题）。
+
+    译文先写入译文文件旁的临时文件（``<译文文件>.part``），全部块完成后
+    才替换译文文件，翻译中途失败时上一次的译文不受影响。
+    """
+
+    def __init__(
+        self,
+        layout: list[str | int],
+        chunk_count: int,
+        output_file: Path | None = None,
+        on_partial: PartialCallback | None = None,
+        render: RenderCallback | None = None,
+    ):
+        """初始化 TranslationStream.
+
+        Args:
+            layout: 文档布局
+            chunk_count: 翻译块数量
+            output_file: 译文文件，None 表示不写文件
+            on_partial: 部分译文回调
+            render: 翻译块文本的输出形式，None 表示原样输出
+        """
+        self.layout = layout
+        self.output_file = output_file
+        self.part_file = (
+            output_file.with_name(f"{output_file.name}.part") if output_file else None
+        )
+        self.on_partial = on_partial
+        self.render = render
+        self.texts = [""] * chunk_count
+        self.done = [False] * chunk_count
+        self.position = 0  # 下一个待输出的布局项
+        self.offset = 0  # 当前布局项已输出的字符数
+        self.emitted_chars = 0
+        self._file: TextIO | None = None
+        # 保证并发到达的译文按输出顺序写入和回调
+        self._emit_lock = asyncio.Lock()
+
+    @property
+    def progress(self) -> float:
+        """已完成翻译块的百分比."""
+        if not self.done:
+            return 100.0
+        return round(100.0 * sum(self.done) / len(self.done), 1)
+
+    async def feed(self, index: int, delta: str) -> None:
+        """接收翻译块的一段增量译文.
+
+        Args:
+            index: 翻译块编号
+            delta: 增量译文
+        """
+        self.texts[index] += delta
+        await self.flush()
+
+    async def complete(self, index: int, text: str) -> None:
+        """标记翻译块完成.
+
+        Args:
+            index: 翻译块编号
+            text: 该块的最终文本（翻译失败时为原文）
+        """
+        if not text.startswith(self.texts[index]) and self._is_current(index):
+            # 已输出的部分译文作废（如流式翻译中途失败），从新行开始输出最终文本
+            self.offset = 0
+            await self._emit("\n")
+        self.texts[index] = text
+        self.done[index] = True
+        await self.flush()
+
+    async def close(self) -> None:
+        """输出剩余的全部内容，并用临时文件替换译文文件.
+
+        未完成的块按已收到的部分输出。
+        """
+        for index in range(len(self.done)):
+            self.done[index] = True
+        await self.flush()
+        async with self._emit_lock:
+            if self.part_file is not None:
+                try:
+                    await asyncio.to_thread(self._commit)
+                except OSError as e:
+                    logger.warning(f"Cannot save streamed translation: {e}")
+
+    def abort(self) -> None:
+        """翻译中断时删除临时文件，保留原有译文."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.part_file is not None and self.part_file.exists():
+            os.unlink(self.part_file)
+
+    def _is_current(self, index: int) -> bool:
+        """翻译块是否正在输出."""
+        return (
+            self.position < len(self.layout)
+            and self.layout[self.position] == index
+            and self.offset > 0
+        )
+
+    async def flush(self) -> None:
+        """按布局顺序输出所有可以输出的内容."""
+        parts = []
+        while self.position < len(self.layout):
+            item = self.layout[self.position]
+            if isinstance(item, str):
+                parts.append(item)
+            else:
+                text = self.texts[item]
+                if not self.done[item]:
+                    text = text[: text.rfind("\n") + 1]
+                    if self.render is not None:
+                        text = self.render(item, text.rstrip("\n"))
+                    if len(text) > self.offset:
+                        parts.append(text[self.offset :])
+                        self.offset = len(text)
+                    break
+                if self.render is not None:
+                    text = self.render(item, text)
+                parts.append(text[self.offset :])
+            self.position += 1
+            self.offset = 0
+        await self._emit("".join(parts))
+
+    def _write(self, text: str) -> None:
+        """追加写入临时文件（首次写入时创建）."""
+        if self._file is None:
+            self.part_file.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.part_file, "w", encoding="utf-8")
+        self._file.write(text)
+        self._file.flush()
+
+    def _commit(self) -> None:
+        """关闭临时文件并替换译文文件."""
+        if self._file is None:
+            # 没有任何输出，仍然生成（空的）译文文件
+            self._write("")
+        self._file.close()
+        self._file = None
+        os.replace(self.part_file, self.output_file)
+
+    async def _emit(self, text: str) -> None:
+        """追加写入临时文件并通知订阅者."""
+        if not text:
+            return
+        async with self._emit_lock:
+            self.emitted_chars += len(text)
+            if self.part_file is not None:
+                try:
+                    await asyncio.to_thread(self._write, text)
+                except OSError as e:
+                    logger.warning(
+                        f"Cannot stream translation to {self.part_file}: {e}"
+                    )
+                    self.abort()
+                    self.part_file = None
+            if self.on_partial is not None:
+                try:
+                    await self.on_partial(text, self.progress)
+                except Exception as e:
+                    logger.warning(f"Partial translation callback failed: {str(e)}")
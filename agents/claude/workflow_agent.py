@@ -1,6 +1,7 @@
 """Workflow Agent - 负责任务分解和流程编排."""
 
 import asyncio
+import json
 import logging
 import os
 from pathlib import Path
@@ -9,6 +10,8 @@ from typing import Any
 from .base import BaseAgent
 from .heartfelt_agent import HeartfeltAgent
 from .pdf_agent import PDFProcessingAgent
+from .revision_store import RevisionStore
+from .table_store import get_table_store
 from .translation_agent import TranslationAgent
 
 logger = logging.getLogger(__name__)
@@ -30,6 +33,10 @@ class WorkflowAgent(BaseAgent):
         self.pdf_agent = PDFProcessingAgent(config)
         self.translation_agent = TranslationAgent(config)
         self.heartfelt_agent = HeartfeltAgent(config)
+        # 论文各版本的逐页产物，新版本只重新处理修改过的页面
+        self.revisions = RevisionStore(self.papers_dir / "revisions")
+        # 提取的表格按列式存储，支持跨论文按表头查找
+        self.tables = get_table_store(self.papers_dir)
 
     async def validate_input(self, input_data: dict[str, Any]) -> bool:
         """验证输入数据.
@@ -55,7 +62,8 @@ class WorkflowAgent(BaseAgent):
         """处理文档的主入口.
 
         Args:
-            input_data: 包含 source_path 和 workflow 字段
+            input_data: 包含 source_path 和 workflow 字段，可选的 on_partial
+                回调用于接收流式译文（见 TranslationAgent.translate）
 
         Returns:
             处理结果
@@ -67,17 +75,18 @@ class WorkflowAgent(BaseAgent):
         source_path = input_data.get("source_path")
         workflow = input_data.get("workflow", "full")
         paper_id = input_data.get("paper_id")
+        on_partial = input_data.get("on_partial")
 
         if not source_path or not os.path.exists(source_path):
             return {"success": False, "error": f"Source file not found: {source_path}"}
 
         try:
             if workflow == "full":
-                return await self._full_workflow(source_path, paper_id)
+                return await self._full_workflow(source_path, paper_id, on_partial)
             elif workflow == "extract_only":
                 return await self._extract_workflow(source_path, paper_id)
             elif workflow == "translate_only":
-                return await self._translate_workflow(source_path, paper_id)
+                return await self._translate_workflow(source_path, paper_id, on_partial)
             elif workflow == "heartfelt_only":
                 return await self._heartfelt_workflow(source_path, paper_id)
             else:
@@ -87,13 +96,17 @@ class WorkflowAgent(BaseAgent):
             return {"success": False, "error": str(e)}
 
     async def _full_workflow(
-        self, source_path: str, paper_id: str | None = None
+        self,
+        source_path: str,
+        paper_id: str | None = None,
+        on_partial: Any = None,
     ) -> dict[str, Any]:
         """完整处理流程：提取 -> 翻译 -> 分析.
 
         Args:
             source_path: 源文件路径
             paper_id: 论文ID
+            on_partial: 流式译文回调
 
         Returns:
             处理结果
@@ -101,27 +114,22 @@ class WorkflowAgent(BaseAgent):
         logger.info(f"Starting full workflow for {source_path}")
 
         # 1. 内容提取
-        extract_result = await self.pdf_agent.extract_content(
+        extract_result, revision = await self._extract_revision(
+            source_path,
+            paper_id,
             {
-                "file_path": source_path,
-                "options": {
-                    "extract_images": True,
-                    "extract_tables": True,
-                    "extract_formulas": True,
-                },
-            }
+                "extract_images": True,
+                "extract_tables": True,
+                "extract_formulas": True,
+            },
         )
 
         if not extract_result["success"]:
             return extract_result
 
         # 2. 翻译
-        translate_result = await self.translation_agent.translate(
-            {
-                "content": extract_result["data"]["content"],
-                "preserve_format": True,
-                "paper_id": paper_id,
-            }
+        translate_result = await self._translate_revision(
+            extract_result["data"], paper_id, revision, on_partial
         )
 
         # 3. 深度分析（异步，不阻塞返回）
@@ -162,16 +170,17 @@ class WorkflowAgent(BaseAgent):
         """
         logger.info(f"Starting extract workflow for {source_path}")
 
-        result = await self.pdf_agent.extract_content(
+        result, revision = await self._extract_revision(
+            source_path,
+            paper_id,
             {
-                "file_path": source_path,
-                "options": {
-                    "extract_images": True,
-                    "extract_tables": True,
-                    "extract_formulas": True,
-                },
-            }
+                "extract_images": True,
+                "extract_tables": True,
+                "extract_formulas": True,
+            },
         )
+        if result["success"] and revision is not None:
+            await self._save_revision(paper_id, result["data"], revision)
 
         if result["success"] and paper_id:
             await self._save_extract_result(paper_id, result["data"])
@@ -185,13 +194,17 @@ class WorkflowAgent(BaseAgent):
         }
 
     async def _translate_workflow(
-        self, source_path: str, paper_id: str | None = None
+        self,
+        source_path: str,
+        paper_id: str | None = None,
+        on_partial: Any = None,
     ) -> dict[str, Any]:
         """仅翻译流程.
 
         Args:
             source_path: 源文件路径
             paper_id: 论文ID
+            on_partial: 流式译文回调
 
         Returns:
             翻译结果
@@ -199,20 +212,16 @@ class WorkflowAgent(BaseAgent):
         logger.info(f"Starting translate workflow for {source_path}")
 
         # 首先提取内容
-        extract_result = await self.pdf_agent.extract_content(
-            {"file_path": source_path, "options": {"extract_images": False}}
+        extract_result, revision = await self._extract_revision(
+            source_path, paper_id, {"extract_images": False}
         )
 
         if not extract_result["success"]:
             return extract_result
 
         # 然后翻译
-        translate_result = await self.translation_agent.translate(
-            {
-                "content": extract_result["data"]["content"],
-                "preserve_format": True,
-                "paper_id": paper_id,
-            }
+        translate_result = await self._translate_revision(
+            extract_result["data"], paper_id, revision, on_partial
         )
 
         if translate_result["success"] and paper_id:
@@ -228,6 +237,122 @@ class WorkflowAgent(BaseAgent):
             "workflow": "translate_only",
         }
 
+    async def _extract_revision(
+        self, source_path: str, paper_id: str | None, options: dict[str, Any]
+    ) -> tuple[dict[str, Any], dict[str, Any] | None]:
+        """提取内容，复用同一论文旧版本中文本层指纹未变的页面.
+
+        提取成功且指定 paper_id 时，同时将表格保存到表格存储。
+
+        Args:
+            source_path: 源文件路径
+            paper_id: 论文ID，为空时不做增量处理
+            options: 提取选项
+
+        Returns:
+            (提取结果, 旧版本产物)，没有 paper_id 时旧版本产物为 None
+        """
+        revision = None
+        if paper_id:
+            revision = await self.revisions.load(paper_id)
+            options = {**options, "include_pages": True}
+            if revision["pages"]:
+                options["reuse_pages"] = revision["pages"]
+                logger.info(
+                    f"Found previous revision {revision['paper_id']} for {paper_id}"
+                )
+
+        result = await self.pdf_agent.extract_content(
+            {"file_path": source_path, "options": options}
+        )
+        if paper_id and result["success"] and options.get("extract_tables", True):
+            await self._save_tables(paper_id, result["data"])
+        return result, revision
+
+    async def _save_tables(self, paper_id: str, data: dict[str, Any]) -> None:
+        """保存提取的表格，失败时只记录日志，不影响工作流.
+
+        Args:
+            paper_id: 论文ID
+            data: 提取数据
+        """
+        try:
+            await self.tables.save(paper_id, data.get("tables") or [])
+        except Exception as e:
+            logger.warning(f"Failed to save tables for {paper_id}: {str(e)}")
+
+    async def _translate_revision(
+        self,
+        extract_data: dict[str, Any],
+        paper_id: str | None,
+        revision: dict[str, Any] | None,
+        on_partial: Any = None,
+    ) -> dict[str, Any]:
+        """翻译提取结果，未修改页面复用旧版本的译文，并保存当前版本产物.
+
+        Args:
+            extract_data: 提取数据
+            paper_id: 论文ID
+            revision: 旧版本产物
+            on_partial: 流式译文回调，为空时不使用流式翻译
+
+        Returns:
+            翻译结果
+        """
+        if revision is None or "pages" not in extract_data:
+            return await self.translation_agent.translate(
+                {
+                    "content": extract_data["content"],
+                    "preserve_format": True,
+                    "paper_id": paper_id,
+                    "on_partial": on_partial,
+                }
+            )
+
+        result = await self.translation_agent.translate_pages(
+            {
+                "header": extract_data.get("header", ""),
+                "pages": extract_data["pages"],
+                "translations": revision["translations"],
+                "preserve_format": True,
+                "paper_id": paper_id,
+                "previous_paper_id": revision.get("paper_id"),
+                "on_partial": on_partial,
+            }
+        )
+        # 翻译失败时仍保存提取产物，下次只需重新翻译
+        translations = result["data"].pop("translations") if result["success"] else None
+        await self._save_revision(paper_id, extract_data, revision, translations)
+        return result
+
+    async def _save_revision(
+        self,
+        paper_id: str | None,
+        extract_data: dict[str, Any],
+        revision: dict[str, Any],
+        translations: dict[str, str] | None = None,
+    ) -> None:
+        """保存当前版本的逐页产物，并从返回数据中移除逐页记录.
+
+        Args:
+            paper_id: 论文ID
+            extract_data: 提取数据
+            revision: 旧版本产物
+            translations: 指纹 -> 译文
+        """
+        pages = extract_data.pop("pages", None)
+        extract_data.pop("header", None)
+        if not paper_id or pages is None:
+            return
+
+        if revision["pages"]:
+            reused = sum(1 for page in pages if page["reused"])
+            logger.info(
+                f"{paper_id}: reused {reused}/{len(pages)} pages from "
+                f"{revision['paper_id']}"
+            )
+        await self.revisions.save(paper_id, pages, translations)
+
     async def _heartfelt_workflow(
         self, source_path: str, paper_id: str | None = None
     ) -> dict[str, Any]:
@@ -342,11 +467,14 @@ class WorkflowAgent(BaseAgent):
         with open(output_file, "w", encoding="utf-8") as f:
             f.write(data.get("content", ""))
 
-        # 保存图片（如果有）
-        if "images" in data:
+        # 图片在提取时已写入 papers/images 下的内容寻址存储（跨论文去重），
+        # 这里只保存论文到图片文件的引用清单
+        if data.get("images"):
             images_dir = self.papers_dir / "images" / category
             images_dir.mkdir(parents=True, exist_ok=True)
-            # 这里应该处理图片保存逻辑
+            manifest_file = images_dir / f"{paper_id}.json"
+            with open(manifest_file, "w", encoding="utf-8") as f:
+                json.dump(data["images"], f, ensure_ascii=False, indent=2)
 
         logger.info(f"Extract result saved to {output_file}")
 
@@ -0,0 +1,184 @@
+"""Size-bounded on-disk LRU cache."""
+
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class DiskLRUCache:
+    """按总大小限制的磁盘 LRU 缓存.
+
+    每个条目保存为目录下的一个文件，文件的修改时间记录最近访问时间，
+    因此进程重启后仍能恢复 LRU 顺序。所有方法都是同步的，
+    在事件循环中应通过 ``asyncio.to_thread`` 调用。
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int, suffix: str = "") -> None:
+        """初始化缓存.
+
+        Args:
+            directory: 缓存目录
+            max_bytes: 缓存总大小上限（字节）
+            suffix: 条目文件扩展名
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        self._load()
+
+    def _load(self) -> None:
+        """扫描缓存目录，按最近访问时间恢复 LRU 顺序."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        files = []
+        for path in self.directory.glob(f"*{self.suffix}"):
+            if path.is_file():
+                stat = path.stat()
+                files.append((stat.st_mtime, self._key_for(path), stat.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._size += size
+
+    def _key_for(self, path: Path) -> str:
+        """从文件路径获取缓存键."""
+        return path.name[: -len(self.suffix)] if self.suffix else path.name
+
+    def path_for(self, key: str) -> Path:
+        """获取缓存条目的文件路径.
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            条目文件路径
+        """
+        return self.directory / f"{key}{self.suffix}"
+
+    def get(self, key: str) -> bytes | None:
+        """读取缓存条目，命中时刷新其 LRU 位置.
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            条目内容，未命中时返回 None
+        """
+        with self._lock:
+            path = self.path_for(key)
+            if key not in self._entries or not path.exists():
+                self._forget(key)
+                self.misses += 1
+                return None
+
+            data = path.read_bytes()
+            os.utime(path)
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def contains(self, key: str) -> bool:
+        """检查缓存条目是否存在（不影响统计和 LRU 顺序）.
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            是否存在
+        """
+        with self._lock:
+            return key in self._entries and self.path_for(key).exists()
+
+    def put(self, key: str, data: bytes) -> None:
+        """写入缓存条目，并按需淘汰最久未使用的条目.
+
+        Args:
+            key: 缓存键
+            data: 条目内容
+        """
+        if len(data) > self.max_bytes:
+            logger.debug(f"Cache entry {key} exceeds cache size, not stored")
+            return
+
+        with self._lock:
+            path = self.path_for(key)
+            # 先写临时文件再替换，避免读到写了一半的条目
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_name, path)
+            except Exception:
+                if os.path.exists(tmp_name):
+                    os.unlink(tmp_name)
+                raise
+
+            self._forget(key)
+            self._entries[key] = len(data)
+            self._size += len(data)
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        """删除缓存条目.
+
+        Args:
+            key: 缓存键
+        """
+        with self._lock:
+            path = self.path_for(key)
+            if path.exists():
+                path.unlink()
+            self._forget(key)
+
+    def clear(self) -> None:
+        """清空缓存."""
+        with self._lock:
+            for key in list(self._entries):
+                path = self.path_for(key)
+                if path.exists():
+                    path.unlink()
+            self._entries.clear()
+            self._size = 0
+
+    def _forget(self, key: str) -> None:
+        """从内存索引中移除条目."""
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._size -= size
+
+    def _evict(self) -> None:
+        """淘汰最久未使用的条目，直到总大小不超过上限."""
+        while self._size > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._size -= size
+            path = self.path_for(key)
+            if path.exists():
+                path.unlink()
+            self.evictions += 1
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取缓存统计信息.
+
+        Returns:
+            命中、未命中、淘汰次数以及条目数和总大小
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+        }
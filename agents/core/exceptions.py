@@ -72,6 +72,12 @@ class ServiceUnavailableError(BaseAPIException):
     pass
 
 
+class MemoryBudgetExceededError(ProcessingError):
+    """内存预算超限错误."""
+
+    pass
+
+
 class TaskError(BaseAPIException):
     """任务执行错误."""
 
@@ -0,0 +1,126 @@
+"""Shared HTTP client and streaming downloads."""
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import weakref
+from typing import Any
+
+import httpx
+
+from .exceptions import ValidationError
+
+logger = logging.getLogger(__name__)
+
+# 每个事件循环一个客户端：连接池绑定在创建它的事件循环上
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """获取当前事件循环共享的 HTTP 客户端（带连接池）.
+
+    Returns:
+        httpx.AsyncClient 实例
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        max_connections = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(float(os.getenv("HTTP_TIMEOUT", "60"))),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            follow_redirects=True,
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_http_client() -> None:
+    """关闭当前事件循环的共享 HTTP 客户端."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def default_download_limit() -> int:
+    """获取 URL 下载的默认大小上限.
+
+    Returns:
+        PDF_DOWNLOAD_MAX_MB 环境变量对应的字节数（默认 100 MB）
+    """
+    return int(os.getenv("PDF_DOWNLOAD_MAX_MB", "100")) * 1024 * 1024
+
+
+async def download_to_file(
+    url: str,
+    max_bytes: int | None = None,
+    suffix: str = "",
+    directory: str | None = None,
+) -> dict[str, Any]:
+    """流式下载 URL 到唯一命名的临时文件.
+
+    响应体按块写入磁盘，不在内存中缓存完整内容；下载过程中同时计算 SHA-256，
+    超过大小上限时立即中止并删除临时文件。调用方负责删除返回的文件。
+
+    Args:
+        url: 下载地址
+        max_bytes: 大小上限（字节），默认为 PDF_DOWNLOAD_MAX_MB
+        suffix: 临时文件扩展名
+        directory: 临时文件目录，默认为系统临时目录
+
+    Returns:
+        包含 path、size、sha256 和 content_type 的字典
+
+    Raises:
+        ValidationError: 响应超过大小上限
+        httpx.HTTPError: 请求失败
+    """
+    limit = default_download_limit() if max_bytes is None else max_bytes
+    fd, tmp_name = tempfile.mkstemp(prefix="download_", suffix=suffix, dir=directory)
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            async with get_http_client().stream("GET", url) as response:
+                response.raise_for_status()
+
+                declared = response.headers.get("Content-Length")
+                if declared and declared.isdigit() and int(declared) > limit:
+                    raise ValidationError(
+                        f"Download exceeds size limit: {int(declared)} > {limit} bytes",
+                        details={"url": url, "limit": limit},
+                    )
+
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > limit:
+                        raise ValidationError(
+                            f"Download exceeds size limit of {limit} bytes",
+                            details={"url": url, "limit": limit},
+                        )
+                    digest.update(chunk)
+                    await asyncio.to_thread(f.write, chunk)
+
+                content_type = response.headers.get("Content-Type", "")
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+    logger.debug(f"Downloaded {url} ({size} bytes) to {tmp_name}")
+    return {
+        "path": tmp_name,
+        "size": size,
+        "sha256": digest.hexdigest(),
+        "content_type": content_type,
+    }
@@ -9,10 +9,19 @@ import uuid
 from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
+
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
 
 logger = logging.getLogger(__name__)
 
+# PDF 文件头魔数，以及文件头/文件尾标记的查找范围
+PDF_MAGIC = b"%PDF-"
+PDF_HEADER_WINDOW = 1024
+PDF_TRAILER_WINDOW = 1024
+
 
 def generate_paper_id(filename: str, category: str) -> str:
     """生成论文ID.
@@ -60,20 +69,39 @@ def sanitize_filename(filename: str) -> str:
     return filename
 
 
-def get_file_hash(file_path: str) -> str:
+def get_file_hash(file_path: str, algorithm: str = "md5") -> str:
     """计算文件哈希值.
 
     Args:
         file_path: 文件路径
+        algorithm: hashlib 支持的哈希算法名称
 
     Returns:
         文件哈希值
     """
-    hash_md5 = hashlib.md5()
+    file_hash = hashlib.new(algorithm)
     with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hash_md5.update(chunk)
-    return hash_md5.hexdigest()
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def get_rss_bytes() -> int:
+    """获取当前进程的常驻内存（RSS）.
+
+    Returns:
+        RSS 字节数；无法读取 /proc 时返回进程的峰值 RSS
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        import sys
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS 以字节为单位，Linux 以 KB 为单位
+        return peak if sys.platform == "darwin" else peak * 1024
 
 
 def format_file_size(size_bytes: int) -> str:
@@ -125,20 +153,40 @@ def extract_text_summary(text: str, max_length: int = 200) -> str:
     return summary
 
 
+def _count_pages(f: BinaryIO, fallback: bool) -> int:
+    """读取 PDF 页面树的 /Count.
+
+    Args:
+        f: 以二进制模式打开的 PDF 文件
+        fallback: xref 无效时是否扫描全文重建 xref
+
+    Returns:
+        页数
+    """
+    f.seek(0)
+    document = PDFDocument(PDFParser(f), fallback=fallback)
+    pages = resolve1(document.catalog["Pages"])
+    return int(resolve1(pages["Count"]))
+
+
 def validate_pdf_file(file_path: str) -> dict[str, Any]:
     """验证 PDF 文件.
 
+    只读取文件头、trailer 和 xref 以及页面树根节点的 /Count，不解析任何
+    页面内容，单个文件通常只需几毫秒，可在提取前快速拒绝损坏的 PDF。
+
     Args:
         file_path: 文件路径
 
     Returns:
-        验证结果
+        验证结果（valid、error、size、pages、version）
     """
     result: dict[str, bool | str | int | None] = {
         "valid": False,
         "error": None,
         "size": 0,
         "pages": 0,
+        "version": None,
     }
 
     try:
@@ -153,19 +201,42 @@ def validate_pdf_file(file_path: str) -> dict[str, Any]:
             return result
 
         # 获取文件大小
-        result["size"] = os.path.getsize(file_path)
-
-        # 尝试读取 PDF 文件信息
-        try:
-            import pypdf2
-
-            with open(file_path, "rb") as f:
-                pdf_reader = pypdf2.PdfReader(f)
-                result["pages"] = len(pdf_reader.pages)
-        except Exception as e:
-            logger.warning(f"Could not read PDF info: {str(e)}")
-            # 即使无法读取，也可能是有效的 PDF
-            pass
+        size = os.path.getsize(file_path)
+        result["size"] = size
+        if size == 0:
+            result["error"] = "Empty file"
+            return result
+
+        with open(file_path, "rb") as f:
+            # 检查魔数（规范允许文件头前有少量无关字节）
+            header = f.read(PDF_HEADER_WINDOW)
+            offset = header.find(PDF_MAGIC)
+            if offset < 0:
+                result["error"] = "Missing %PDF header"
+                return result
+            version = header[offset + len(PDF_MAGIC) : offset + len(PDF_MAGIC) + 3]
+            result["version"] = version.decode("ascii", "replace")
+
+            # 截断的文件（如下载中断）缺少文件尾的 startxref 和 %%EOF
+            f.seek(max(0, size - PDF_TRAILER_WINDOW))
+            tail = f.read()
+            if b"%%EOF" not in tail or b"startxref" not in tail:
+                result["error"] = "Missing trailer (truncated file)"
+                return result
+
+            # 先只读取 xref 和 trailer；xref 损坏（如 startxref 偏移不准）时
+            # 与 pdfplumber 一样扫描全文重建 xref，仍找不到 /Root 才视为无效。
+            # 页数来自页面树的 /Count
+            try:
+                result["pages"] = _count_pages(f, fallback=False)
+            except Exception as e:
+                logger.info(f"Repairing xref of {file_path}: {str(e)}")
+                try:
+                    result["pages"] = _count_pages(f, fallback=True)
+                except Exception as e:
+                    result["error"] = f"Invalid PDF structure: {str(e)}"
+                    logger.warning(f"Invalid PDF {file_path}: {str(e)}")
+                    return result
 
         result["valid"] = True
 
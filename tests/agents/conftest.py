@@ -26,6 +26,14 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def isolated_translation_memory(tmp_path, monkeypatch):
+    """Keep each test's translation memory out of papers/ and other tests."""
+    monkeypatch.setenv(
+        "TRANSLATION_MEMORY_PATH", str(tmp_path / "translation_memory.sqlite3")
+    )
+
+
 @pytest.fixture
 def temp_dir():
     """Create a temporary directory for test files."""
@@ -143,11 +151,16 @@ def mock_paper_service():
         service.process_paper = AsyncMock()
         service.get_status = AsyncMock()
         service.get_content = AsyncMock()
+        service.get_page = AsyncMock()
+        service.get_page_thumbnail = AsyncMock()
+        service.get_tables = AsyncMock()
+        service.search_tables = AsyncMock()
         service.list_papers = AsyncMock()
         service.delete_paper = AsyncMock()
         service.batch_process_papers = AsyncMock()
         service.get_paper_report = AsyncMock()
         service.translate_paper = AsyncMock()
+        service.retry_translation = AsyncMock()
         service.analyze_paper = AsyncMock()
         mock.return_value = service
         yield service
@@ -280,7 +293,7 @@ def test_config():
 @pytest.fixture
 def mock_anthropic_client():
     """Mock Anthropic client."""
-    with patch("anthropic.Anthropic") as mock:
+    with patch("anthropic.AsyncAnthropic") as mock:
         client = MagicMock()
         client.messages = MagicMock()
         client.messages.create = AsyncMock()
@@ -0,0 +1,151 @@
+"""Factory for generating small but valid PDF documents for testing."""
+
+from pathlib import Path
+from typing import Any
+
+
+def _escape(text: str) -> str:
+    """Escape a string for use inside a PDF literal string."""
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _page_stream(page: dict[str, Any]) -> bytes:
+    """Build the content stream for a single page."""
+    ops: list[str] = []
+
+    # Text lines, top to bottom
+    lines = page.get("lines", [])
+    if lines:
+        ops.append("BT /F1 12 Tf 14 TL 72 720 Td")
+        for line in lines:
+            ops.append(f"({_escape(line)}) Tj T*")
+        ops.append("ET")
+
+    # Table grid: ruled lines plus one cell string per cell
+    table = page.get("table")
+    if table:
+        rows = len(table)
+        cols = len(table[0])
+        left, top, cell_w, cell_h = 72, 500, 120, 24
+        ops.append("0.5 w")
+        for r in range(rows + 1):
+            y = top - r * cell_h
+            ops.append(f"{left} {y} m {left + cols * cell_w} {y} l S")
+        for c in range(cols + 1):
+            x = left + c * cell_w
+            ops.append(f"{x} {top} m {x} {top - rows * cell_h} l S")
+        for r, row in enumerate(table):
+            for c, cell in enumerate(row):
+                x = left + c * cell_w + 4
+                y = top - (r + 1) * cell_h + 8
+                ops.append(f"BT /F1 10 Tf {x} {y} Td ({_escape(cell)}) Tj ET")
+
+    # Stroked rectangles (frames, highlights) given as (x, y, width, height)
+    for x, y, w, h in page.get("rects", []):
+        ops.append(f"{x} {y} {w} {h} re S")
+
+    # Image placement
+    if page.get("image"):
+        ops.append("q 100 0 0 100 300 100 cm /Im1 Do Q")
+
+    return "\n".join(ops).encode("latin-1")
+
+
+def make_pdf_bytes(
+    pages: list[dict[str, Any]] | list[str],
+    metadata: dict[str, str] | None = None,
+    image: tuple[int, int, bytes] | None = None,
+) -> bytes:
+    """Build a PDF document.
+
+    Args:
+        pages: One entry per page. A string becomes a single text line; a dict may
+            contain ``lines`` (list of text lines), ``table`` (list of rows),
+            ``rects`` (list of ``(x, y, width, height)`` stroked rectangles) and
+            ``image`` (bool, draw the shared image on this page).
+        metadata: Optional document info dictionary (e.g. ``{"Title": "x"}``)
+        image: Optional ``(width, height, rgb_bytes)`` raw image shared by pages
+
+    Returns:
+        PDF file bytes
+    """
+    page_specs: list[dict[str, Any]] = [
+        {"lines": [p]} if isinstance(p, str) else p for p in pages
+    ]
+
+    objects: list[bytes] = []
+
+    def add(obj: bytes) -> int:
+        objects.append(obj)
+        return len(objects)
+
+    catalog_id = add(b"")  # placeholder, filled below
+    pages_id = add(b"")
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    image_id = None
+    if image:
+        width, height, data = image
+        image_id = add(
+            f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} "
+            f"/ColorSpace /DeviceRGB /BitsPerComponent 8 /Length {len(data)} >>\n"
+            "stream\n".encode("latin-1")
+            + data
+            + b"\nendstream"
+        )
+
+    page_ids = []
+    for spec in page_specs:
+        stream = _page_stream(spec)
+        content_id = add(
+            f"<< /Length {len(stream)} >>\nstream\n".encode("latin-1")
+            + stream
+            + b"\nendstream"
+        )
+        xobjects = f"/XObject << /Im1 {image_id} 0 R >>" if image_id else ""
+        page_ids.append(
+            add(
+                (
+                    f"<< /Type /Page /Parent {pages_id} 0 R "
+                    f"/MediaBox [0 0 612 792] /Contents {content_id} 0 R "
+                    f"/Resources << /Font << /F1 {font_id} 0 R >> {xobjects} >> >>"
+                ).encode("latin-1")
+            )
+        )
+
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects[catalog_id - 1] = f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode()
+    objects[pages_id - 1] = (
+        f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+    )
+
+    info_id = None
+    if metadata:
+        entries = " ".join(f"/{k} ({_escape(v)})" for k, v in metadata.items())
+        info_id = add(f"<< {entries} >>".encode("latin-1"))
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for i, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n".encode() + obj + b"\nendobj\n"
+
+    xref_offset = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n".encode()
+    out += b"0000000000 65535 f \n"
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+
+    trailer = f"/Size {len(objects) + 1} /Root {catalog_id} 0 R"
+    if info_id:
+        trailer += f" /Info {info_id} 0 R"
+    out += f"trailer\n<< {trailer} >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def write_pdf(
+    path: Path, pages: list[dict[str, Any]] | list[str], **kwargs: Any
+) -> Path:
+    """Write a generated PDF to ``path`` and return the path."""
+    path.write_bytes(make_pdf_bytes(pages, **kwargs))
+    return path
@@ -0,0 +1,124 @@
+"""Benchmark of concurrent LLM skill calls against a local stub server.
+
+The stub answers every Messages API request after a fixed delay, so N chunks
+gathered by ``batch_call_skill`` should finish in roughly the time of one
+call when the skill client does not block the event loop. Run as a script to
+print the timings::
+
+    python -m tests.agents.performance.test_llm_client_benchmark 16
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from agents.claude.base import BaseAgent
+from agents.claude.skill_runtime import get_skill_runtime
+
+STUB_DELAY = 0.3
+
+
+class StubMessagesHandler(BaseHTTPRequestHandler):
+    """Answer ``POST /v1/messages`` with a canned reply after a delay."""
+
+    def do_POST(self) -> None:  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.server.delay)  # type: ignore[attr-defined]
+        reply = json.dumps(
+            {
+                "id": "msg_stub",
+                "type": "message",
+                "role": "assistant",
+                "model": body["model"],
+                "content": [{"type": "text", "text": "译文"}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": 1, "output_tokens": 1},
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@contextmanager
+def stub_server(delay: float = STUB_DELAY) -> Iterator[str]:
+    """Run the stub Messages API and point the Anthropic client at it."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubMessagesHandler)
+    server.delay = delay  # type: ignore[attr-defined]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with patch.dict(
+            os.environ,
+            {"ANTHROPIC_API_KEY": "stub-key", "ANTHROPIC_BASE_URL": base_url},
+        ):
+            yield base_url
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class BenchmarkAgent(BaseAgent):
+    """Minimal agent exposing ``batch_call_skill``."""
+
+    async def process(self, input_data: dict[str, Any]) -> dict[str, Any]:
+        return {"success": True}
+
+
+async def run_chunks(chunks: int, skill: str = "zh-translator") -> dict[str, Any]:
+    """Send ``chunks`` concurrent skill calls and time them."""
+    agent = BenchmarkAgent("benchmark")
+    calls = [
+        {"skill": skill, "params": {"content": f"Chunk {n} text"}}
+        for n in range(chunks)
+    ]
+    started = time.perf_counter()
+    results = await agent.batch_call_skill(calls)
+    elapsed = time.perf_counter() - started
+    return {
+        "chunks": chunks,
+        "succeeded": sum(1 for r in results if r.get("success")),
+        "seconds": round(elapsed, 3),
+        "mean_overhead_us": get_skill_runtime().get_stats()["mean_overhead_us"],
+    }
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("skill", ["zh-translator", "heartfelt"])
+async def test_concurrent_chunks_overlap(skill):
+    """N concurrent chunks finish in about the time of one call."""
+    chunks = 8
+    with stub_server():
+        # Warm up: the first call on a loop creates the shared client
+        await run_chunks(1, skill)
+        result = await run_chunks(chunks, skill)
+        await get_skill_runtime().aclose()
+    print(f"\n{skill}: {result}")
+
+    assert result["succeeded"] == chunks
+    # Serial execution would take chunks * STUB_DELAY = 2.4s
+    assert result["seconds"] < 3 * STUB_DELAY
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    with stub_server():
+        for n in (1, 1, count):
+            print(asyncio.run(run_chunks(n)))
@@ -0,0 +1,91 @@
+"""Benchmark of the PDF extraction backends.
+
+Reports pages/s for each ``method`` on the same corpus. Run as a script to
+benchmark real papers::
+
+    python -m tests.agents.performance.test_pdf_backends_benchmark papers/source
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import pypdfium2 as pdfium
+import pytest
+
+from agents.claude.pdf_backends import METHODS, PageExtractor
+from tests.agents.fixtures.factories.pdf_factory import write_pdf
+
+
+def build_corpus(directory: Path, documents: int = 3, pages: int = 12) -> list[Path]:
+    """Generate a corpus of text pages with a table on every fourth page."""
+    corpus = []
+    for doc in range(documents):
+        doc_pages: list[Any] = []
+        for page in range(pages):
+            lines = [f"Document {doc} page {page} line {n}" for n in range(40)]
+            if page % 4 == 3:
+                table = [["Model", "Score"]] + [[f"M{n}", f"0.{n}"] for n in range(8)]
+                doc_pages.append({"lines": lines[:10], "table": table})
+            else:
+                doc_pages.append({"lines": lines})
+        corpus.append(write_pdf(directory / f"doc{doc}.pdf", doc_pages))
+    return corpus
+
+
+def benchmark(files: list[Path], extract_tables: bool = True) -> dict[str, Any]:
+    """Extract every page of ``files`` with each method and time it."""
+    options = {"extract_tables": extract_tables}
+    results = {}
+    for method in METHODS:
+        pages = 0
+        tables = 0
+        backends: dict[str, int] = {}
+        started = time.perf_counter()
+        for file_path in files:
+            page_count = len(pdfium.PdfDocument(str(file_path)))
+            with PageExtractor(str(file_path), method) as extractor:
+                for index in range(page_count):
+                    page = extractor.extract_page(index, options)
+                    pages += 1
+                    tables += len(page["tables"])
+                    backends[page["backend"]] = backends.get(page["backend"], 0) + 1
+        elapsed = time.perf_counter() - started
+        results[method] = {
+            "pages": pages,
+            "tables": tables,
+            "seconds": round(elapsed, 3),
+            "pages_per_second": round(pages / elapsed, 2) if elapsed > 0 else 0,
+            "backends": backends,
+        }
+    return results
+
+
+def format_report(results: dict[str, Any]) -> str:
+    """Render benchmark results as a table."""
+    lines = [f"{'method':<8} {'pages':>6} {'tables':>6} {'seconds':>8} {'pages/s':>9}"]
+    for method, row in results.items():
+        lines.append(
+            f"{method:<8} {row['pages']:>6} {row['tables']:>6} "
+            f"{row['seconds']:>8} {row['pages_per_second']:>9}  {row['backends']}"
+        )
+    return "\n".join(lines)
+
+
+@pytest.mark.performance
+def test_backend_throughput(temp_dir):
+    """Fast backend outpaces layout analysis and auto keeps the tables."""
+    results = benchmark(build_corpus(temp_dir))
+    print("\n" + format_report(results))
+
+    assert results["fast"]["pages_per_second"] > results["layout"]["pages_per_second"]
+    assert results["auto"]["tables"] == results["layout"]["tables"] == 9
+    assert results["auto"]["backends"] == {"fast": 27, "layout": 9}
+
+
+if __name__ == "__main__":
+    paths = [Path(arg) for arg in sys.argv[1:]] or [Path("papers/source")]
+    files = sorted(f for p in paths for f in ([p] if p.is_file() else p.rglob("*.pdf")))
+    print(f"Benchmarking {len(files)} PDF files")
+    print(format_report(benchmark(files)))
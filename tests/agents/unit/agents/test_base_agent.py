@@ -181,6 +181,30 @@ class TestBaseAgent:
         assert "Skill failed" in results[1]["error"]
         assert results[2]["success"] is True
 
+    @pytest.mark.asyncio
+    async def test_batch_call_skill_reports_each_result(self):
+        """Test on_result is called as each call completes."""
+
+        class TestAgent(BaseAgent):
+            async def process(self, input_data):
+                return {"success": True, "data": input_data}
+
+            async def call_skill(self, skill_name, params):
+                return {"success": True, "data": f"Processed {skill_name}"}
+
+        agent = TestAgent("test_agent")
+        reported = []
+
+        async def on_result(index, result):
+            reported.append((index, result["data"]))
+
+        await agent.batch_call_skill(
+            [{"skill": "skill1", "params": {}}, {"skill": "skill2", "params": {}}],
+            on_result,
+        )
+
+        assert sorted(reported) == [(0, "Processed skill1"), (1, "Processed skill2")]
+
     @pytest.mark.asyncio
     async def test_batch_call_skill_empty_list(self):
         """Test batch skill call with empty list."""
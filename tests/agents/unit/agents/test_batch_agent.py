@@ -6,6 +6,7 @@ from unittest.mock import AsyncMock, patch
 import pytest
 
 from agents.claude.batch_agent import BatchProcessingAgent
+from tests.agents.fixtures.factories.pdf_factory import make_pdf_bytes
 
 
 @pytest.mark.unit
@@ -97,8 +98,8 @@ class TestBatchProcessingAgent:
         # Create temporary PDF files
         file1 = tmp_path / "file1.pdf"
         file2 = tmp_path / "file2.pdf"
-        file1.write_bytes(b"PDF content 1")
-        file2.write_bytes(b"PDF content 2")
+        file1.write_bytes(make_pdf_bytes(["Content 1"]))
+        file2.write_bytes(make_pdf_bytes(["Content 2"]))
 
         files = [str(file1), str(file2)]
         batch_agent.papers_dir = tmp_path
@@ -128,7 +129,7 @@ class TestBatchProcessingAgent:
     async def test_batch_process_with_progress_callback(self, batch_agent, tmp_path):
         """Test batch processing with progress callback."""
         file = tmp_path / "file.pdf"
-        file.write_bytes(b"PDF content")
+        file.write_bytes(make_pdf_bytes(["PDF content"]))
         files = [str(file)]
 
         # Mock progress callback
@@ -158,8 +159,8 @@ class TestBatchProcessingAgent:
         # Create temporary PDF files
         file1 = tmp_path / "file1.pdf"
         file2 = tmp_path / "file2.pdf"
-        file1.write_bytes(b"PDF content 1")
-        file2.write_bytes(b"PDF content 2")
+        file1.write_bytes(make_pdf_bytes(["Content 1"]))
+        file2.write_bytes(make_pdf_bytes(["Content 2"]))
 
         files = [str(file1), str(file2)]
         result = await batch_agent._validate_files(files)
@@ -173,12 +174,15 @@ class TestBatchProcessingAgent:
         """Test file validation with mixed valid/invalid files."""
         # Create one valid PDF
         valid_file = tmp_path / "valid.pdf"
-        valid_file.write_bytes(b"PDF content")
+        valid_file.write_bytes(make_pdf_bytes(["Content"]))
+        truncated_file = tmp_path / "truncated.pdf"
+        truncated_file.write_bytes(make_pdf_bytes(["Content"])[:200])
 
         files = [
             str(valid_file),
             "/nonexistent/file.pdf",
             str(tmp_path / "not_pdf.txt"),
+            str(truncated_file),
         ]
         # Write to text file
         (tmp_path / "not_pdf.txt").write_text("Not a PDF")
@@ -187,9 +191,11 @@ class TestBatchProcessingAgent:
 
         assert result["success"] is True
         assert len(result["files"]) == 1
-        assert len(result["invalid"]) == 2
+        assert len(result["invalid"]) == 3
         assert result["invalid"][0]["error"] == "File not found"
         assert result["invalid"][1]["error"] == "Not a PDF file"
+        assert result["invalid"][2]["path"] == str(truncated_file)
+        assert "Missing trailer" in result["invalid"][2]["error"]
 
     def test_create_batches(self, batch_agent):
         """Test batch creation."""
@@ -0,0 +1,117 @@
+"""Unit tests for the extraction cache."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from agents.claude.extraction_cache import (
+    ExtractionCache,
+    get_extraction_cache,
+    normalize_extraction_options,
+)
+from agents.claude.pdf_agent import PDFProcessingAgent
+
+
+@pytest.mark.unit
+class TestExtractionCache:
+    """Test cases for ExtractionCache."""
+
+    def test_normalize_options(self):
+        """Test only result-affecting options are kept, with defaults."""
+        assert normalize_extraction_options({"output_format": "markdown"}) == {
+            "page_range": None,
+            "extract_tables": True,
+            "method": "auto",
+            "image_dir": None,
+            "include_pages": False,
+        }
+        assert normalize_extraction_options(
+            {
+                "page_range": ("1", 3),
+                "extract_tables": 0,
+                "method": "fast",
+                "image_dir": "papers/images",
+                "include_pages": True,
+                "reuse_pages": {"abc": {}},
+            }
+        ) == {
+            "page_range": [1, 3],
+            "extract_tables": False,
+            "method": "fast",
+            "image_dir": "papers/images",
+            "include_pages": True,
+        }
+        assert (
+            normalize_extraction_options(
+                {"extract_images": False, "image_dir": "papers/images"}
+            )["image_dir"]
+            is None
+        )
+
+    def test_key_depends_on_content_options_and_version(self, temp_dir):
+        """Test cache keys change with content, options and extractor version."""
+        cache = ExtractionCache(temp_dir, max_bytes=1024)
+
+        key = cache.make_key("hash-a", {})
+        assert key == cache.make_key("hash-a", {"extract_images": False})
+        assert key != cache.make_key("hash-b", {})
+        assert key != cache.make_key("hash-a", {"page_range": [0, 1]})
+        with patch("agents.claude.extraction_cache.EXTRACTOR_VERSION", "next"):
+            assert key != cache.make_key("hash-a", {})
+
+    @pytest.mark.asyncio
+    async def test_extract_content_uses_cache(self, temp_dir):
+        """Test repeat extractions of the same content skip the pdf-reader skill."""
+        first = temp_dir / "a.pdf"
+        second = temp_dir / "copy.pdf"
+        first.write_bytes(b"%PDF-1.4\nsame content")
+        second.write_bytes(b"%PDF-1.4\nsame content")
+
+        agent = PDFProcessingAgent({"papers_dir": str(temp_dir)})
+        agent.call_skill = AsyncMock(
+            return_value={
+                "success": True,
+                "data": {"content": "Extracted text", "page_count": 1},
+            }
+        )
+
+        first_result = await agent.extract_content({"file_path": str(first)})
+        second_result = await agent.extract_content({"file_path": str(second)})
+
+        assert agent.call_skill.call_count == 1
+        assert second_result["data"]["content"] == "Extracted text"
+        assert second_result["data"]["metadata"]["file_name"] == "copy.pdf"
+        assert first_result["data"]["metadata"]["file_name"] == "a.pdf"
+        stats = agent.extraction_cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+        await agent.extract_content(
+            {"file_path": str(first), "options": {"extract_tables": False}}
+        )
+        assert agent.call_skill.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_extraction_not_cached(self, temp_dir):
+        """Test failed skill results are not cached."""
+        pdf_file = temp_dir / "a.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4\nbroken")
+
+        agent = PDFProcessingAgent({"papers_dir": str(temp_dir)})
+        agent.call_skill = AsyncMock(return_value={"success": False, "error": "bad"})
+
+        await agent.extract_content({"file_path": str(pdf_file)})
+        await agent.extract_content({"file_path": str(pdf_file)})
+
+        assert agent.call_skill.call_count == 2
+
+    def test_cache_disabled_without_papers_dir(self, temp_dir):
+        """Test the cache is opt-out and off unless papers_dir is configured."""
+        assert PDFProcessingAgent().extraction_cache is None
+        assert (
+            PDFProcessingAgent(
+                {"papers_dir": str(temp_dir), "extraction_cache": False}
+            ).extraction_cache
+            is None
+        )
+        assert get_extraction_cache(temp_dir) is get_extraction_cache(temp_dir)
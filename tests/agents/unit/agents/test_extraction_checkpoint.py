@@ -0,0 +1,165 @@
+"""Unit tests for resumable per-page extraction checkpoints."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from agents.claude.extraction_checkpoint import ExtractionCheckpoint
+from agents.claude.pdf_engine import PDFExtractionEngine
+from agents.claude.skills import SkillInvoker
+from tests.agents.fixtures.factories.pdf_factory import write_pdf
+
+OPTIONS = {"page_range": None, "extract_tables": True, "method": "auto"}
+
+
+@pytest.fixture
+def sample_pdf(temp_dir):
+    """Create a six page PDF."""
+    pages = [f"Page {n} text" for n in range(1, 7)]
+    return write_pdf(temp_dir / "sample.pdf", pages)
+
+
+class FailingEngine(PDFExtractionEngine):
+    """Inline engine whose extraction fails after a number of pages."""
+
+    def __init__(self, fail_after=None):
+        super().__init__(max_workers=0, pages_per_shard=2)
+        self.fail_after = fail_after
+        self.extracted = []
+
+    async def iter_pages(self, file_path, options=None, info=None):
+        async for page in super().iter_pages(file_path, options, info):
+            if self.fail_after is not None and len(self.extracted) >= self.fail_after:
+                raise RuntimeError("worker crashed")
+            self.extracted.append(page["page"])
+            yield page
+
+
+@pytest.mark.unit
+class TestExtractionCheckpoint:
+    """Test cases for ExtractionCheckpoint."""
+
+    @pytest.mark.asyncio
+    async def test_append_load_remove(self, sample_pdf):
+        """Test pages round-trip and a torn last line is ignored."""
+        checkpoint = ExtractionCheckpoint(str(sample_pdf), OPTIONS)
+        assert checkpoint.path.parent == sample_pdf.parent
+        assert await checkpoint.load() == []
+
+        await checkpoint.append({"page": 1, "text": "one"})
+        await checkpoint.append({"page": 2, "text": "two"})
+        checkpoint.close()
+        with open(checkpoint.path, "a", encoding="utf-8") as f:
+            f.write('{"page": 3, "te')
+
+        restored = ExtractionCheckpoint(str(sample_pdf), OPTIONS)
+        assert [p["page"] for p in await restored.load()] == [1, 2]
+
+        restored.remove()
+        assert not checkpoint.path.exists()
+
+    @pytest.mark.asyncio
+    async def test_only_one_run_owns_the_checkpoint(self, sample_pdf):
+        """Test a second run is refused until the owner releases the lock."""
+        owner = ExtractionCheckpoint(str(sample_pdf), OPTIONS)
+        other = ExtractionCheckpoint(str(sample_pdf), OPTIONS)
+
+        assert await owner.acquire() is True
+        assert await other.acquire() is False
+
+        owner.close()
+        assert not owner.lock_path.exists()
+        assert await other.acquire() is True
+        other.remove()
+
+    @pytest.mark.asyncio
+    async def test_stale_lock_is_taken_over(self, sample_pdf):
+        """Test the lock of a crashed process does not block resuming."""
+        checkpoint = ExtractionCheckpoint(str(sample_pdf), OPTIONS)
+        checkpoint.lock_path.write_text("999999999", encoding="utf-8")
+
+        assert await checkpoint.acquire() is True
+        assert checkpoint.lock_path.read_text(encoding="utf-8") == str(os.getpid())
+        checkpoint.remove()
+        assert not checkpoint.lock_path.exists()
+
+    @pytest.mark.asyncio
+    async def test_own_pid_lock_from_previous_run_is_stale(self, sample_pdf):
+        """Test a leftover lock holding our own PID (PID 1 in Docker) is stale."""
+        checkpoint = ExtractionCheckpoint(str(sample_pdf), OPTIONS)
+        checkpoint.lock_path.write_text(str(os.getpid()), encoding="utf-8")
+
+        assert await checkpoint.acquire() is True
+        # A lock this process really holds still blocks other runs
+        assert await ExtractionCheckpoint(str(sample_pdf), OPTIONS).acquire() is False
+        checkpoint.remove()
+        assert not checkpoint.lock_path.exists()
+
+    @pytest.mark.asyncio
+    async def test_load_keeps_contiguous_pages_only(self, sample_pdf):
+        """Test interleaved or out-of-range pages are not reused."""
+        checkpoint = ExtractionCheckpoint(str(sample_pdf), OPTIONS)
+        assert await checkpoint.acquire() is True
+        for page in (1, 2, 4, 3):
+            await checkpoint.append({"page": page})
+
+        assert [p["page"] for p in await checkpoint.load(end_page=1)] == [1]
+        assert [p["page"] for p in await checkpoint.load()] == [1, 2]
+        # The discarded tail is dropped so new pages follow page 2
+        await checkpoint.append({"page": 3})
+        assert [p["page"] for p in await checkpoint.load()] == [1, 2, 3]
+        checkpoint.remove()
+
+    def test_key_depends_on_options_and_file(self, sample_pdf):
+        """Test a changed PDF or changed options use a different checkpoint."""
+        path = ExtractionCheckpoint(str(sample_pdf), OPTIONS).path
+        other = ExtractionCheckpoint(str(sample_pdf), {**OPTIONS, "method": "fast"})
+        assert other.path != path
+
+        os.utime(sample_pdf, ns=(0, 0))
+        assert ExtractionCheckpoint(str(sample_pdf), OPTIONS).path != path
+
+    @pytest.mark.asyncio
+    async def test_pdf_reader_resumes_after_failure(self, sample_pdf):
+        """Test a retry only extracts the pages the failed attempt missed."""
+        failing = FailingEngine(fail_after=4)
+        with patch("agents.claude.skills.get_extraction_engine", return_value=failing):
+            with pytest.raises(RuntimeError, match="worker crashed"):
+                await SkillInvoker()._handle_pdf_reader({"file_path": str(sample_pdf)})
+
+        checkpoint = ExtractionCheckpoint(str(sample_pdf), OPTIONS)
+        assert len(await checkpoint.load()) == 4
+
+        engine = FailingEngine()
+        with patch("agents.claude.skills.get_extraction_engine", return_value=engine):
+            result = await SkillInvoker()._handle_pdf_reader(
+                {"file_path": str(sample_pdf)}
+            )
+
+        assert result["success"] is True
+        assert engine.extracted == [5, 6]
+        content = result["data"]["content"]
+        for n in range(1, 7):
+            assert f"Page {n} text" in content
+        assert content.index("Page 4 text") < content.index("Page 5 text")
+        assert result["data"]["statistics"]["resumed_pages"] == 4
+        assert result["data"]["statistics"]["pages"] == 2
+        assert not checkpoint.path.exists()
+
+        fresh = FailingEngine()
+        with patch("agents.claude.skills.get_extraction_engine", return_value=fresh):
+            await SkillInvoker()._handle_pdf_reader({"file_path": str(sample_pdf)})
+        assert fresh.extracted == [1, 2, 3, 4, 5, 6]
+
+    @pytest.mark.asyncio
+    async def test_pdf_reader_checkpoint_disabled(self, sample_pdf):
+        """Test checkpointing can be turned off."""
+        engine = FailingEngine(fail_after=2)
+        with patch("agents.claude.skills.get_extraction_engine", return_value=engine):
+            with pytest.raises(RuntimeError):
+                await SkillInvoker()._handle_pdf_reader(
+                    {"file_path": str(sample_pdf), "checkpoint": False}
+                )
+
+        assert list(sample_pdf.parent.glob(".sample.pdf.*")) == []
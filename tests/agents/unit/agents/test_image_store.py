@@ -0,0 +1,94 @@
+"""Unit tests for image extraction and the content-addressed image store."""
+
+from unittest.mock import patch
+
+import pytest
+
+from agents.claude.image_store import ImageStore
+from agents.claude.pdf_backends import PageExtractor
+from agents.claude.pdf_engine import PDFExtractionEngine
+from agents.claude.skills import SkillInvoker
+from tests.agents.fixtures.factories.pdf_factory import write_pdf
+
+IMAGE = (32, 24, bytes(range(256)) * 9)
+
+
+@pytest.fixture
+def image_pdfs(temp_dir):
+    """Create two papers that share the same figure."""
+    pages = [{"lines": ["Figure page"], "image": True}, "Text page"]
+    return [write_pdf(temp_dir / f"paper{n}.pdf", pages, image=IMAGE) for n in range(2)]
+
+
+@pytest.mark.unit
+class TestImageStore:
+    """Test cases for ImageStore and image extraction."""
+
+    def test_put_bytes_deduplicates(self, temp_dir):
+        """Test identical content is written once."""
+        store = ImageStore(temp_dir)
+
+        path, new = store.put_bytes(b"png-data", "png")
+        again, new_again = store.put_bytes(b"png-data", "png")
+
+        assert new is True
+        assert new_again is False
+        assert again == path
+        assert path.read_bytes() == b"png-data"
+        assert path.parent.parent == temp_dir / "sha256"
+        assert store.find(path.stem) == path
+        assert store.find("0" * 64) is None
+        assert [p.name for p in path.parent.iterdir()] == [path.name]
+
+    def test_extract_images_across_papers(self, image_pdfs, temp_dir):
+        """Test the same figure in two papers is stored once."""
+        options = {"image_dir": str(temp_dir / "images")}
+        results = []
+        for pdf in image_pdfs:
+            with PageExtractor(str(pdf), "fast") as extractor:
+                results.append([extractor.extract_page(i, options) for i in range(2)])
+
+        first, second = (pages[0]["images"] for pages in results)
+        assert [p["images"] for p in (results[0][1], results[1][1])] == [[], []]
+        assert first[0]["new"] is True
+        assert second[0]["new"] is False
+        assert first[0]["file_path"] == second[0]["file_path"]
+        assert first[0]["size"] == [32, 24]
+        assert first[0]["page"] == 1
+        assert len(list((temp_dir / "images").rglob("*.png"))) == 1
+
+    def test_images_need_store(self, image_pdfs):
+        """Test images are only boxed, not extracted, without a store directory."""
+        boxes = []
+        for method in ("fast", "layout"):
+            with PageExtractor(str(image_pdfs[0]), method) as extractor:
+                page = extractor.extract_page(0, {})
+            assert page["images"] == []
+            assert page["counts"]["images"] == 1
+            boxes.append(page["image_boxes"])
+        assert boxes[0] == boxes[1]
+
+    @pytest.mark.asyncio
+    async def test_pdf_reader_reports_images(self, image_pdfs, temp_dir):
+        """Test pdf-reader returns image references and dedup statistics."""
+        engine = PDFExtractionEngine(max_workers=0)
+        invoker = SkillInvoker()
+        image_dir = str(temp_dir / "images")
+        with patch("agents.claude.skills.get_extraction_engine", return_value=engine):
+            results = [
+                await invoker._handle_pdf_reader(
+                    {"pdf_source": str(pdf), "image_dir": image_dir}
+                )
+                for pdf in image_pdfs
+            ]
+
+        images = results[1]["data"]["images"]
+        assert len(images) == 1
+        assert "data" not in images[0]
+        assert images[0]["file_path"].startswith(image_dir)
+        assert results[0]["statistics"]["images"] == {
+            "total": 1,
+            "unique": 1,
+            "written": 1,
+        }
+        assert results[1]["statistics"]["images"]["written"] == 0
@@ -0,0 +1,85 @@
+"""Unit tests for the markdown-aware translation chunker."""
+
+from unittest.mock import patch
+
+import pytest
+
+from agents.claude.markdown_chunker import estimate_tokens, split_markdown
+
+TABLE = "| Model | Score |\n|---|---|\n" + "".join(
+    f"| model-{n} | {n}.0 |\n" for n in range(40)
+)
+CODE = "```python\ndef f():\n\n    return 1\n```"
+MATH = "$$\na = b\n\nc = d\n$$"
+
+
+@pytest.fixture(params=["gfm", "fallback"])
+def parser(request):
+    """Run each test with the GFM parser and with the line scanner."""
+    if request.param == "fallback":
+        with patch("agents.claude.markdown_chunker._parse_blocks", return_value=None):
+            yield request.param
+    else:
+        yield request.param
+
+
+@pytest.mark.unit
+class TestMarkdownChunker:
+    """Test cases for split_markdown."""
+
+    def test_estimate_tokens(self):
+        """Test CJK characters count as one token each."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcdefgh") == 2
+        assert estimate_tokens("中文翻译") == 4
+
+    def test_packs_whole_blocks(self, parser):
+        """Test small documents become a single chunk with blocks intact."""
+        content = f"# Title\n\nIntro text.\n\n{CODE}\n\n{MATH}\n\n{TABLE}"
+        assert split_markdown(content, 2000) == [content.strip("\n")]
+        assert split_markdown(" \n\n ", 2000) == []
+
+    def test_never_splits_fences_or_math(self, parser):
+        """Test blank lines inside code and display math do not end a block."""
+        content = f"Intro text.\n\n{CODE}\n\n{MATH}\n\nOutro text."
+        assert split_markdown(content, 9) == [
+            "Intro text.",
+            CODE,
+            f"{MATH}\n\nOutro text.",
+        ]
+
+    def test_splits_oversized_table_with_header(self, parser):
+        """Test a table larger than the budget repeats its header per chunk."""
+        chunks = split_markdown(TABLE, 80)
+
+        assert len(chunks) > 1
+        for chunk in chunks:
+            assert chunk.startswith("| Model | Score |\n|---|---|\n")
+            assert estimate_tokens(chunk) <= 80
+        rows = [line for chunk in chunks for line in chunk.split("\n")[2:]]
+        assert rows == TABLE.strip("\n").split("\n")[2:]
+
+    def test_splits_oversized_code_inside_fences(self, parser):
+        """Test a long code block is split into separately fenced chunks."""
+        code = "```text\n" + "\n".join(f"line {n}" for n in range(60)) + "\n```"
+        chunks = split_markdown(code, 40)
+
+        assert len(chunks) > 1
+        assert all(c.startswith("```text\n") and c.endswith("\n```") for c in chunks)
+
+    def test_splits_long_paragraph_by_sentence(self, parser):
+        """Test English prose is split at sentence ends within the budget."""
+        paragraph = " ".join(f"Sentence number {n} ends here." for n in range(50))
+        chunks = split_markdown(paragraph, 50)
+
+        assert len(chunks) > 1
+        assert all(c.endswith(".") and estimate_tokens(c) <= 50 for c in chunks)
+        assert " ".join(chunks) == paragraph
+
+    def test_splits_long_list_by_item(self):
+        """Test GFM lists are split between items."""
+        items = [f"- item {n} with some text" for n in range(40)]
+        chunks = split_markdown("\n".join(items), 60)
+
+        assert len(chunks) > 1
+        assert [line for c in chunks for line in c.split("\n")] == items
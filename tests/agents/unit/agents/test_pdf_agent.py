@@ -1,10 +1,12 @@
 """Unit tests for PDFProcessingAgent."""
 
+import base64
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
 from agents.claude.pdf_agent import PDFProcessingAgent
+from tests.agents.fixtures.factories.pdf_factory import make_pdf_bytes
 
 
 @pytest.mark.unit
@@ -217,6 +219,62 @@ class TestPDFProcessingAgent:
             assert call_args["extract_formulas"] is True  # Default
             assert call_args["output_format"] == "markdown"  # Default
 
+    @pytest.mark.asyncio
+    async def test_stream_content(self, pdf_agent, temp_dir):
+        """Test streaming extraction forwards pdf-reader events."""
+        pdf_file = temp_dir / "test.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4\nmock pdf content")
+        events = [
+            {"type": "start", "metadata": {}, "page_count": 1},
+            {"type": "page", "page": 1, "markdown": "## Page 1", "tables": []},
+            {"type": "complete", "page_count": 1, "statistics": {}},
+        ]
+
+        async def fake_stream(skill_name, params):
+            assert skill_name == "pdf-reader"
+            assert params["pdf_source"] == str(pdf_file)
+            assert params["extract_tables"] is False
+            for event in events:
+                yield event
+
+        with patch.object(pdf_agent, "stream_skill", side_effect=fake_stream):
+            received = [
+                event
+                async for event in pdf_agent.stream_content(
+                    {
+                        "file_path": str(pdf_file),
+                        "options": {"extract_tables": False},
+                    }
+                )
+            ]
+
+        assert received == events
+
+    @pytest.mark.asyncio
+    async def test_extract_content_to_output_file(self, pdf_agent, temp_dir):
+        """Test the streaming output mode is forwarded and reported."""
+        pdf_file = temp_dir / "test.pdf"
+        pdf_file.write_bytes(b"%PDF-1.4\nmock pdf content")
+        output_path = str(temp_dir / "test.md")
+
+        with patch.object(pdf_agent, "call_skill", new_callable=AsyncMock) as mock_call:
+            mock_call.return_value = {
+                "success": True,
+                "data": {"content": "", "output_path": output_path, "word_count": 42},
+            }
+            result = await pdf_agent.extract_content(
+                {
+                    "file_path": str(pdf_file),
+                    "options": {"output_path": output_path, "memory_budget_mb": 256},
+                }
+            )
+
+        params = mock_call.call_args[0][1]
+        assert params["output_path"] == output_path
+        assert params["memory_budget_mb"] == 256
+        assert result["data"]["output_path"] == output_path
+        assert result["data"]["word_count"] == 42
+
     @pytest.mark.asyncio
     async def test_validate_input(self, pdf_agent):
         """Test input validation."""
@@ -450,6 +508,27 @@ class TestPDFProcessingAgent:
         assert processed[0]["embedded"] is False
         assert "general" in processed[0]["path"]  # Should use "general" category
 
+    def test_process_images_from_store(self, temp_dir):
+        """Test stored images are referenced by path and large data is stored."""
+        agent = PDFProcessingAgent({"papers_dir": str(temp_dir)})
+        stored = temp_dir / "images" / "sha256" / "ab" / "abcd.png"
+        large = base64.b64encode(b"x" * 100_000).decode()
+
+        processed = agent._process_images(
+            [
+                {"page": 1, "file_path": str(stored), "hash": "abcd"},
+                {"page": 2, "format": "png", "data": large},
+                {"page": 3, "format": "png", "data": "c21hbGw="},
+            ],
+            str(temp_dir / "paper.pdf"),
+        )
+
+        assert processed[0]["path"] == "images/sha256/ab/abcd.png"
+        assert processed[0]["embedded"] is False
+        assert "data" not in processed[1]
+        assert (temp_dir / processed[1]["path"]).read_bytes() == b"x" * 100_000
+        assert processed[2]["data"] == "c21hbGw="
+
     def test_count_words(self, pdf_agent):
         """Test word counting."""
         assert pdf_agent._count_words("") == 0
@@ -481,11 +560,19 @@ class TestPDFProcessingAgent:
         assert result["valid"] is False
         assert "Empty file" in result["error"]
 
+        # Test truncated PDF file
+        broken_pdf = temp_dir / "broken.pdf"
+        broken_pdf.write_bytes(b"%PDF-1.4\nmock pdf content")
+        result = await pdf_agent.validate_pdf(str(broken_pdf))
+        assert result["valid"] is False
+        assert "Missing trailer" in result["error"]
+
         # Test valid PDF file
         valid_pdf = temp_dir / "valid.pdf"
-        valid_pdf.write_bytes(b"%PDF-1.4\nmock pdf content")
+        valid_pdf.write_bytes(make_pdf_bytes(["One", "Two"]))
         result = await pdf_agent.validate_pdf(str(valid_pdf))
         assert result["valid"] is True
+        assert result["page_count"] == 2
 
     @pytest.mark.asyncio
     async def test_extract_content_exception_handling(self, pdf_agent):
@@ -0,0 +1,165 @@
+"""Unit tests for the PDF extraction backends."""
+
+from unittest.mock import patch
+
+import pdfplumber
+import pytest
+
+from agents.claude.pdf_backends import (
+    BACKENDS,
+    FastBackend,
+    LayoutBackend,
+    PageExtractor,
+    analyze_text,
+    is_table_candidate,
+)
+from agents.claude.pdf_engine import PDFExtractionEngine
+from agents.claude.skills import SkillInvoker
+from tests.agents.fixtures.factories.pdf_factory import write_pdf
+
+TABLE = [["Model", "Accuracy"], ["A", "0.91"], ["B", "0.85"]]
+
+
+@pytest.fixture
+def sample_pdf(temp_dir):
+    """Create a three page PDF with a table on page two."""
+    pages = ["Plain text page", {"lines": ["Results"], "table": TABLE}, "Last page"]
+    return write_pdf(temp_dir / "sample.pdf", pages)
+
+
+@pytest.mark.unit
+class TestExtractionBackends:
+    """Test cases for the extraction backends."""
+
+    def test_registry(self):
+        """Test both built-in backends are registered."""
+        assert BACKENDS["fast"] is FastBackend
+        assert BACKENDS["layout"] is LayoutBackend
+
+    def test_fast_backend_text(self, sample_pdf):
+        """Test the fast backend reads the text layer without tables."""
+        with FastBackend(str(sample_pdf)) as backend:
+            page = backend.extract_page(1, {"extract_tables": True})
+
+        assert page["page"] == 2
+        assert "Results" in page["text"]
+        assert "\r" not in page["text"]
+        assert page["tables"] == []
+
+    def test_layout_backend_tables(self, sample_pdf):
+        """Test the layout backend extracts tables."""
+        with LayoutBackend(str(sample_pdf)) as backend:
+            page = backend.extract_page(1, {"extract_tables": True})
+            no_tables = backend.extract_page(1, {"extract_tables": False})
+
+        assert page["tables"] == [TABLE]
+        assert no_tables["tables"] == []
+
+    def test_table_candidate_prefilter(self, sample_pdf):
+        """Test only ruled pages with text inside the grid are scanned."""
+        with pdfplumber.open(str(sample_pdf)) as pdf:
+            assert [is_table_candidate(p) for p in pdf.pages] == [False, True, False]
+
+        with LayoutBackend(str(sample_pdf)) as backend:
+            pages = [backend.extract_page(i, {}) for i in range(3)]
+        assert [p["tables_scanned"] for p in pages] == [False, True, False]
+        assert pages[1]["tables"] == [TABLE]
+
+    def test_framed_figure_is_not_table_candidate(self, temp_dir):
+        """Test a single frame with a highlight inside is not a 2x2 grid."""
+        pages = [
+            {
+                "lines": ["Figure 1: Overview", "of the full pipeline"],
+                "rects": [(60, 680, 300, 60), (70, 702, 120, 16)],
+            }
+        ]
+        path = write_pdf(temp_dir / "figure.pdf", pages)
+
+        with pdfplumber.open(str(path)) as pdf:
+            assert len(pdf.pages[0].rects) == 2
+            assert is_table_candidate(pdf.pages[0]) is False
+
+    def test_needs_layout(self, sample_pdf):
+        """Test table rulings route a page to the layout backend."""
+        with FastBackend(str(sample_pdf)) as backend:
+            assert backend.needs_layout(0, {}) is False
+            assert backend.needs_layout(1, {"extract_tables": True}) is True
+            assert backend.needs_layout(1, {"extract_tables": False}) is False
+
+    def test_auto_policy(self, sample_pdf):
+        """Test auto picks a backend per page."""
+        with PageExtractor(str(sample_pdf)) as extractor:
+            pages = [extractor.extract_page(i, {}) for i in range(3)]
+
+        assert [p["backend"] for p in pages] == ["fast", "layout", "fast"]
+        assert pages[1]["tables"] == [TABLE]
+
+    def test_analyze_text(self):
+        """Test words, lines and formula candidates come from one text pass."""
+        text = (
+            "Attention is computed as\n"
+            "\n"
+            "softmax(QKᵀ/√d) · V = A (1)\n"
+            "𝐿(𝜃) = E[𝑟𝑡]\n"
+            "where d = 64 is the key size."
+        )
+
+        analysis = analyze_text(text)
+
+        assert analysis["word_count"] == len(text.split())
+        assert analysis["line_count"] == 4
+        assert analysis["formulas"] == ["softmax(QKᵀ/√d) · V = A (1)", "𝐿(𝜃) = E[𝑟𝑡]"]
+
+    def test_page_counts(self, sample_pdf):
+        """Test each backend reports the same per-page counts."""
+        for method in ("fast", "layout", "auto"):
+            with PageExtractor(str(sample_pdf), method) as extractor:
+                page = extractor.extract_page(0, {})
+            assert page["counts"]["words"] == page["word_count"] == 3
+            assert page["counts"]["lines"] == 1
+            assert page["formulas"] == []
+            assert page["image_boxes"] == []
+
+    def test_unknown_method(self, sample_pdf):
+        """Test unknown methods are rejected."""
+        with pytest.raises(ValueError, match="Unsupported extraction method"):
+            PageExtractor(str(sample_pdf), "ocr")
+
+    @pytest.mark.asyncio
+    async def test_pdf_reader_honours_method(self, sample_pdf):
+        """Test the pdf-reader skill forwards the method option."""
+        engine = PDFExtractionEngine(max_workers=0)
+        invoker = SkillInvoker()
+        with patch("agents.claude.skills.get_extraction_engine", return_value=engine):
+            fast = await invoker._handle_pdf_reader(
+                {"pdf_source": str(sample_pdf), "method": "fast"}
+            )
+            auto = await invoker._handle_pdf_reader({"pdf_source": str(sample_pdf)})
+            invalid = await invoker.call_skill(
+                "pdf-reader", {"pdf_source": str(sample_pdf), "method": "ocr"}
+            )
+
+        assert fast["statistics"]["backends"] == {"fast": 3}
+        assert fast["assets"]["tables"] == 0
+        assert auto["statistics"]["backends"] == {"fast": 2, "layout": 1}
+        assert "| Model | Accuracy |" in auto["data"]["content"]
+        assert invalid["success"] is False
+
+    @pytest.mark.asyncio
+    async def test_pdf_reader_reports_table_prefilter(self, sample_pdf):
+        """Test scanned and skipped table pages are reported per document."""
+        engine = PDFExtractionEngine(max_workers=0)
+        invoker = SkillInvoker()
+        with patch("agents.claude.skills.get_extraction_engine", return_value=engine):
+            layout = await invoker._handle_pdf_reader(
+                {"pdf_source": str(sample_pdf), "method": "layout"}
+            )
+            no_tables = await invoker._handle_pdf_reader(
+                {"pdf_source": str(sample_pdf), "extract_tables": False}
+            )
+
+        assert layout["statistics"]["table_pages_scanned"] == 1
+        assert layout["statistics"]["table_pages_skipped"] == 2
+        assert layout["data"]["statistics"]["table_pages_skipped"] == 2
+        assert no_tables["statistics"]["table_pages_scanned"] == 0
+        assert no_tables["statistics"]["table_pages_skipped"] == 0
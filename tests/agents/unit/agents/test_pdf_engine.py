@@ -0,0 +1,229 @@
+"""Unit tests for the PDF extraction engine."""
+
+from unittest.mock import patch
+
+import pytest
+
+from agents.claude.pdf_engine import (
+    PDFExtractionEngine,
+    get_extraction_engine,
+    resolve_page_range,
+    shutdown_extraction_engine,
+)
+from agents.claude.skills import SkillInvoker
+from tests.agents.fixtures.factories.pdf_factory import write_pdf
+
+
+@pytest.fixture
+def sample_pdf(temp_dir):
+    """Create a five page PDF with a table on page three."""
+    pages = [
+        "First page text",
+        "Second page text",
+        {
+            "lines": ["Results"],
+            "table": [["Model", "Accuracy"], ["A", "0.91"], ["B", "0.85"]],
+        },
+        "Fourth page text",
+        "Fifth page text",
+    ]
+    return write_pdf(temp_dir / "sample.pdf", pages, metadata={"Title": "Sample"})
+
+
+@pytest.mark.unit
+class TestPDFExtractionEngine:
+    """Test cases for PDFExtractionEngine."""
+
+    def test_resolve_page_range(self):
+        """Test page range resolution."""
+        assert resolve_page_range(None, 10) == (0, 10)
+        assert resolve_page_range([2, 4], 10) == (2, 5)
+        assert resolve_page_range([-1, 99], 10) == (0, 10)
+        assert resolve_page_range([8, 2], 10) == (8, 8)
+
+    def test_plan_shards(self):
+        """Test pages are split into contiguous shards."""
+        engine = PDFExtractionEngine(max_workers=2, pages_per_shard=3)
+
+        assert engine.plan_shards(0, 10) == [(0, 3), (3, 6), (6, 9), (9, 10)]
+        assert engine.plan_shards(0, 4) == [(0, 2), (2, 4)]
+        assert engine.plan_shards(5, 5) == []
+
+    @pytest.mark.asyncio
+    async def test_extract_inline(self, sample_pdf):
+        """Test extraction without a process pool."""
+        engine = PDFExtractionEngine(max_workers=0, pages_per_shard=2)
+
+        result = await engine.extract(str(sample_pdf))
+
+        assert result["metadata"]["title"] == "Sample"
+        assert result["total_pages"] == 5
+        assert [p["page"] for p in result["pages"]] == [1, 2, 3, 4, 5]
+        assert result["pages"][0]["text"] == "First page text"
+        assert result["pages"][2]["tables"] == [
+            [["Model", "Accuracy"], ["A", "0.91"], ["B", "0.85"]]
+        ]
+        assert result["stats"]["pages"] == 5
+        assert result["stats"]["shards"] == 3
+
+        stats = engine.get_stats()
+        assert stats["documents"] == 1
+        assert stats["pages"] == 5
+        assert stats["pages_per_second"] > 0
+
+    @pytest.mark.asyncio
+    async def test_extract_process_pool_preserves_order(self, sample_pdf):
+        """Test shards extracted in worker processes are reassembled in order."""
+        engine = PDFExtractionEngine(max_workers=2, pages_per_shard=1)
+        try:
+            result = await engine.extract(
+                str(sample_pdf), {"page_range": [1, 3], "extract_tables": False}
+            )
+        finally:
+            engine.shutdown()
+
+        assert [p["page"] for p in result["pages"]] == [2, 3, 4]
+        assert all(p["tables"] == [] for p in result["pages"])
+        assert result["stats"]["workers"] == 2
+
+    def test_shared_engine(self):
+        """Test the process-wide engine honours PDF_WORKERS."""
+        shutdown_extraction_engine()
+        with patch.dict("os.environ", {"PDF_WORKERS": "0"}):
+            engine = get_extraction_engine()
+        assert engine.max_workers == 0
+        assert get_extraction_engine() is engine
+        shutdown_extraction_engine()
+
+    @pytest.mark.asyncio
+    async def test_pdf_reader_skill_uses_engine(self, sample_pdf):
+        """Test the pdf-reader skill renders engine output as Markdown."""
+        engine = PDFExtractionEngine(max_workers=0)
+        with patch("agents.claude.skills.get_extraction_engine", return_value=engine):
+            result = await SkillInvoker()._handle_pdf_reader(
+                {"pdf_source": str(sample_pdf)}
+            )
+
+        assert result["success"] is True
+        content = result["data"]["content"]
+        assert content.index("## Page 1") < content.index("## Page 5")
+        assert "| Model | Accuracy |" in content
+        assert result["data"]["page_count"] == 5
+        assert result["data"]["tables"] == [
+            {
+                "page": 3,
+                "index": 0,
+                "rows": [["Model", "Accuracy"], ["A", "0.91"], ["B", "0.85"]],
+            }
+        ]
+        assert result["data"]["word_count"] == result["statistics"]["total_words"]
+        assert result["statistics"]["workers"] == 0
+        assert result["data"]["statistics"]["pages"] == 5
+
+    @pytest.mark.asyncio
+    async def test_iter_pages_streams_in_order(self, sample_pdf):
+        """Test pages are streamed in order and early exit stops extraction."""
+        engine = PDFExtractionEngine(max_workers=0, pages_per_shard=1)
+
+        pages = [p["page"] async for p in engine.iter_pages(str(sample_pdf))]
+        assert pages == [1, 2, 3, 4, 5]
+
+        stream = engine.iter_pages(str(sample_pdf))
+        first = await anext(stream)
+        await stream.aclose()
+        assert first["page"] == 1
+        assert engine.get_stats()["pages"] == 6
+
+    @pytest.mark.asyncio
+    async def test_pdf_reader_stream(self, sample_pdf):
+        """Test the streaming mode of the pdf-reader skill."""
+        engine = PDFExtractionEngine(max_workers=0, pages_per_shard=2)
+        with patch("agents.claude.skills.get_extraction_engine", return_value=engine):
+            events = [
+                event
+                async for event in SkillInvoker().stream_skill(
+                    "pdf-reader", {"pdf_source": str(sample_pdf), "page_range": [1, 2]}
+                )
+            ]
+
+        assert [e["type"] for e in events] == ["start", "page", "page", "complete"]
+        assert events[0]["metadata"]["title"] == "Sample"
+        assert events[0]["page_count"] == 2
+        assert events[1]["page"] == 2
+        assert "## Page 2" in events[1]["markdown"]
+        assert events[2]["tables"][0][0] == ["Model", "Accuracy"]
+        assert events[2]["stats"]["pages_done"] == 2
+        assert events[3]["statistics"]["pages"] == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_skill_errors(self, temp_dir):
+        """Test streaming failures are reported as error events."""
+        invoker = SkillInvoker()
+
+        unknown = [e async for e in invoker.stream_skill("heartfelt", {})]
+        assert unknown[0]["type"] == "error"
+        assert unknown[0]["error_type"] == "SkillNotFoundError"
+
+        missing = [
+            e
+            async for e in invoker.stream_skill(
+                "pdf-reader", {"pdf_source": str(temp_dir / "missing.pdf")}
+            )
+        ]
+        assert missing[-1]["type"] == "error"
+        assert missing[-1]["success"] is False
+
+    @pytest.mark.asyncio
+    async def test_iter_pages_bounded_in_flight(self, sample_pdf):
+        """Test a one-shard window still yields every page in order."""
+        engine = PDFExtractionEngine(max_workers=0, pages_per_shard=1, max_in_flight=1)
+
+        result = await engine.extract(str(sample_pdf))
+
+        assert [p["page"] for p in result["pages"]] == [1, 2, 3, 4, 5]
+        assert all(p["rss_bytes"] > 0 for p in result["pages"])
+        assert result["stats"]["peak_rss_mb"] > 0
+
+    @pytest.mark.asyncio
+    async def test_pdf_reader_writes_output_incrementally(self, sample_pdf, temp_dir):
+        """Test the output_path mode writes the same Markdown to disk."""
+        engine = PDFExtractionEngine(max_workers=0, pages_per_shard=2)
+        invoker = SkillInvoker()
+        output_path = temp_dir / "out" / "sample.md"
+        with patch("agents.claude.skills.get_extraction_engine", return_value=engine):
+            in_memory = await invoker._handle_pdf_reader(
+                {"pdf_source": str(sample_pdf)}
+            )
+            streamed = await invoker._handle_pdf_reader(
+                {"pdf_source": str(sample_pdf), "output_path": str(output_path)}
+            )
+
+        assert streamed["success"] is True
+        assert streamed["data"]["content"] == ""
+        assert streamed["data"]["output_path"] == str(output_path)
+        assert output_path.read_text(encoding="utf-8") == in_memory["data"]["content"]
+        assert list(output_path.parent.iterdir()) == [output_path]
+        assert (
+            streamed["statistics"]["total_words"]
+            == (in_memory["statistics"]["total_words"])
+        )
+        assert streamed["statistics"]["peak_rss_mb"] > 0
+
+    @pytest.mark.asyncio
+    async def test_pdf_reader_memory_budget(self, sample_pdf, temp_dir):
+        """Test exceeding the memory budget fails without a partial output."""
+        engine = PDFExtractionEngine(max_workers=0)
+        output_path = temp_dir / "sample.md"
+        with patch("agents.claude.skills.get_extraction_engine", return_value=engine):
+            result = await SkillInvoker().call_skill(
+                "pdf-reader",
+                {
+                    "pdf_source": str(sample_pdf),
+                    "output_path": str(output_path),
+                    "memory_budget_mb": 1,
+                },
+            )
+
+        assert result["success"] is False
+        assert result["error_type"] == "MemoryBudgetExceededError"
+        assert list(temp_dir.glob("*.md*")) == []
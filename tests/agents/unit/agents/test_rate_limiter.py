@@ -0,0 +1,192 @@
+"""Unit tests for the process-wide LLM rate limiter."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from agents.claude.rate_limiter import AIMDController, LLMGovernor, TokenBucket
+from agents.claude.skills import SkillInvoker
+
+
+async def hold(governor, seconds, tokens=0, active=None):
+    """Occupy a governor slot for a while, tracking peak concurrency."""
+    async with governor.slot(tokens):
+        if active is not None:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(seconds)
+        if active is not None:
+            active["now"] -= 1
+
+
+@pytest.mark.unit
+class TestLLMGovernor:
+    """Test cases for LLMGovernor."""
+
+    def test_token_bucket_delay(self):
+        """Test the bucket refills continuously at its per-minute rate."""
+        bucket = TokenBucket(60)
+        bucket.take(60, bucket.updated)
+
+        assert bucket.delay(1, bucket.updated) == pytest.approx(1.0)
+        assert bucket.delay(1, bucket.updated + 1) == 0
+        # Requests larger than the bucket are capped at its capacity
+        assert bucket.delay(1000, bucket.updated) == pytest.approx(59.0)
+
+    @pytest.mark.asyncio
+    async def test_limits_in_flight_calls(self):
+        """Test no more than max_in_flight calls run at once."""
+        governor = LLMGovernor(max_in_flight=2)
+        active = {"now": 0, "peak": 0}
+
+        await asyncio.gather(*(hold(governor, 0.02, active=active) for _ in range(6)))
+
+        stats = governor.get_stats()
+        assert active["peak"] == 2
+        assert stats["requests"] == 6
+        assert stats["throttled"] == 4
+        assert stats["in_flight"] == 0
+        assert stats["max_queue_wait_ms"] >= 30
+
+    @pytest.mark.asyncio
+    async def test_waits_for_input_token_budget(self):
+        """Test a call waits until enough input tokens have been refilled."""
+        governor = LLMGovernor(input_tokens_per_minute=6000)
+        await hold(governor, 0, tokens=6000)
+
+        started = time.monotonic()
+        await hold(governor, 0, tokens=50)
+
+        # 50 tokens at 100 tokens/s
+        assert time.monotonic() - started == pytest.approx(0.5, abs=0.15)
+        assert governor.get_stats()["mean_queue_wait_ms"] > 200
+
+    @pytest.mark.asyncio
+    async def test_waits_for_request_budget(self):
+        """Test requests beyond the per-minute budget are spread out."""
+        governor = LLMGovernor(requests_per_minute=600)
+        started = time.monotonic()
+
+        await asyncio.gather(*(hold(governor, 0) for _ in range(603)))
+
+        # The burst allowance is used up, then 10 requests/s
+        assert time.monotonic() - started == pytest.approx(0.3, abs=0.15)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_frees_queue(self):
+        """Test cancelling a queued call does not leak its place or slot."""
+        governor = LLMGovernor(max_in_flight=1)
+        first = asyncio.create_task(hold(governor, 0.05))
+        queued = asyncio.create_task(hold(governor, 0))
+        await asyncio.sleep(0.01)
+        queued.cancel()
+
+        await first
+        await hold(governor, 0)
+
+        stats = governor.get_stats()
+        assert stats["queued"] == 0
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_llm_calls_go_through_governor(self):
+        """Test SkillInvoker waits for the governor before calling Claude."""
+        governor = LLMGovernor(max_in_flight=1)
+        invoker = SkillInvoker()
+        invoker.anthropic_client = MagicMock()
+        invoker.anthropic_client.messages.create = AsyncMock(
+            return_value=MagicMock(content=[MagicMock(text="译文")])
+        )
+
+        with patch("agents.claude.skills.get_llm_governor", return_value=governor):
+            results = await asyncio.gather(
+                *(
+                    invoker.call_skill("zh-translator", {"content": f"Text {n}"})
+                    for n in range(3)
+                )
+            )
+
+        assert all(r["success"] for r in results)
+        assert governor.get_stats()["requests"] == 3
+
+
+class OverloadedError(Exception):
+    """Stand-in for an API error carrying an HTTP status code."""
+
+    status_code = 529
+
+
+@pytest.mark.unit
+class TestAIMDController:
+    """Test cases for AIMDController."""
+
+    def test_additive_increase_only_when_saturated(self):
+        """Test the limit grows by about one per window of saturated calls."""
+        controller = AIMDController(initial=2, max_limit=4)
+
+        for _ in range(10):
+            controller.on_success(0.1, saturated=False)
+        assert controller.current == 2
+
+        for _ in range(3):
+            controller.on_success(0.1, saturated=True)
+        assert controller.current == 3
+
+        for _ in range(50):
+            controller.on_success(0.1, saturated=True)
+        assert controller.current == 4
+        assert controller.get_stats()["increases"] == 2
+
+    def test_overload_halves_once_per_round_trip(self):
+        """Test a burst of 429/529 errors only cuts the limit once."""
+        controller = AIMDController(initial=16, max_limit=16)
+        controller.on_success(5.0, saturated=False)
+
+        for _ in range(8):
+            controller.on_overload()
+
+        assert controller.current == 8
+        assert controller.decreases == 1
+
+    def test_rising_latency_cuts_limit(self):
+        """Test latency well above the baseline lowers the limit."""
+        controller = AIMDController(initial=8, max_limit=8, warmup=3)
+        for _ in range(10):
+            controller.on_success(0.001, saturated=True)
+
+        for _ in range(3):
+            controller.on_success(0.05, saturated=True)
+
+        assert controller.current == 6
+        assert controller.get_stats()["recent_latency_ms"] > 10
+
+    @pytest.mark.asyncio
+    async def test_converges_below_server_capacity(self):
+        """Test the governor backs off when the API rejects excess calls."""
+        controller = AIMDController(initial=12, max_limit=12, warmup=1000)
+        governor = LLMGovernor(controller=controller)
+        active = {"now": 0}
+        rejected = []
+
+        async def call():
+            try:
+                async with governor.slot():
+                    active["now"] += 1
+                    try:
+                        if active["now"] > 3:
+                            raise OverloadedError()
+                        await asyncio.sleep(0.01)
+                    finally:
+                        active["now"] -= 1
+            except OverloadedError:
+                rejected.append(1)
+
+        for _ in range(10):
+            await asyncio.gather(*(call() for _ in range(12)))
+
+        stats = governor.get_stats()
+        assert stats["concurrency_limit"] <= 4
+        assert stats["adaptive"]["decreases"] >= 2
+        assert len(rejected) < 60
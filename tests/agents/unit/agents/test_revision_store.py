@@ -0,0 +1,246 @@
+"""Unit tests for page fingerprints and incremental re-processing of revisions."""
+
+from unittest.mock import patch
+
+import pytest
+
+from agents.claude.pdf_backends import PageExtractor, page_fingerprint
+from agents.claude.pdf_engine import PDFExtractionEngine
+from agents.claude.revision_store import RevisionStore, revision_key
+from agents.claude.skills import SkillInvoker
+from agents.claude.translation_agent import TranslationAgent
+from agents.claude.translation_segments import UNIT_BREAK
+from agents.claude.workflow_agent import WorkflowAgent
+from tests.agents.fixtures.factories.pdf_factory import write_pdf
+
+V1_PAGES = ["Introduction text", "Method text", "Results text"]
+V2_PAGES = ["Introduction text", "Method text revised", "Extra page", "Results text"]
+
+
+def fake_translator(calls):
+    """Build a zh-translator stand-in that records what it translates."""
+
+    async def call_skill(skill_name, params):
+        if skill_name != "zh-translator":
+            return await SkillInvoker().call_skill(skill_name, params)
+        calls.append(params["content"])
+        paragraphs = [
+            part if part == UNIT_BREAK else f"ZH[{part}]"
+            for part in params["content"].strip().split("\n\n")
+        ]
+        return {"success": True, "data": "\n\n".join(paragraphs)}
+
+    return call_skill
+
+
+@pytest.mark.unit
+class TestRevisionStore:
+    """Test cases for page fingerprints and the revision store."""
+
+    def test_revision_key(self):
+        """Test revisions of the same paper share a key."""
+        assert revision_key("llm_20240115_143022_2301.12345v2.pdf") == "llm/2301.12345"
+        assert revision_key("llm_20240301_090000_2301.12345v3") == "llm/2301.12345"
+        assert revision_key("rag_20240301_090000_survey.pdf") == "rag/survey"
+        assert revision_key("standalone") == "general/standalone"
+
+    def test_fingerprint_ignores_whitespace_and_position(self, temp_dir):
+        """Test unchanged text keeps its fingerprint on a different page."""
+        assert page_fingerprint("a  b\nc") == page_fingerprint("a b c")
+        assert page_fingerprint("a b") != page_fingerprint("a c")
+
+        v1 = write_pdf(temp_dir / "v1.pdf", V1_PAGES)
+        v2 = write_pdf(temp_dir / "v2.pdf", V2_PAGES)
+        with PageExtractor(str(v1)) as old, PageExtractor(str(v2)) as new:
+            results = old.extract_page(2, {}), new.extract_page(3, {})
+        assert results[0]["fingerprint"] == results[1]["fingerprint"]
+
+    def test_extractor_skips_known_pages(self, temp_dir):
+        """Test pages with a known fingerprint are not extracted again."""
+        pdf = write_pdf(temp_dir / "paper.pdf", V1_PAGES)
+        with PageExtractor(str(pdf)) as extractor:
+            fingerprint = extractor.extract_page(0, {})["fingerprint"]
+            stub = extractor.extract_page(0, {"reuse_fingerprints": [fingerprint]})
+        assert stub == {
+            "page": 1,
+            "fingerprint": fingerprint,
+            "reused": True,
+            "backend": "reused",
+        }
+
+    @pytest.mark.asyncio
+    async def test_store_keeps_translations_of_remaining_pages(self, temp_dir):
+        """Test saving a revision drops translations of removed pages."""
+        store = RevisionStore(temp_dir / "revisions")
+        assert (await store.load("llm_20240115_143022_a.pdf"))["pages"] == {}
+
+        pages = [
+            {"fingerprint": fp, "result": {"page": n, "rss_bytes": 1}}
+            for n, fp in enumerate(["f1", "f2"], 1)
+        ]
+        await store.save(
+            "llm_20240115_143022_av1.pdf", pages, {"f1": "one", "f2": "two"}
+        )
+        await store.save("llm_20240301_090000_av2.pdf", pages[1:], {"f3": "three"})
+
+        record = await store.load("llm_20240401_000000_av3.pdf")
+        assert record["paper_id"] == "llm_20240301_090000_av2.pdf"
+        assert record["pages"] == {"f2": {"page": 2}}
+        assert record["translations"] == {"f2": "two", "f3": "three"}
+
+    @pytest.mark.asyncio
+    async def test_delete_only_removes_own_revision(self, temp_dir):
+        """Test deleting an older version keeps the latest version's record."""
+        store = RevisionStore(temp_dir / "revisions")
+        await store.save("llm_20240301_090000_paperv2.pdf", [], {"f": "译文"})
+
+        await store.delete("llm_20240115_143022_paperv1.pdf")
+        assert (await store.load("llm_20240115_143022_paperv1.pdf"))[
+            "translations"
+        ] == {"f": "译文"}
+
+        await store.delete("llm_20240301_090000_paperv2.pdf")
+        assert (await store.load("llm_20240115_143022_paperv1.pdf"))["paper_id"] is None
+
+    @pytest.mark.asyncio
+    async def test_translate_pages_reuses_translations(self):
+        """Test only pages without a known translation are translated."""
+        agent = TranslationAgent()
+        calls = []
+        pages = [
+            {"fingerprint": "f1", "heading": "\n\n## Page 1\n\n", "body": "Old"},
+            {"fingerprint": "f2", "heading": "\n\n## Page 2\n\n", "body": "New"},
+            {"fingerprint": "f3", "heading": "\n\n## Page 3\n\n", "body": ""},
+        ]
+        with patch.object(agent, "call_skill", side_effect=fake_translator(calls)):
+            result = await agent.translate_pages(
+                {"header": "", "pages": pages, "translations": {"f1": "旧"}}
+            )
+
+        assert calls == ["New"]
+        assert result["data"]["content"] == (
+            "\n\n## Page 1\n\n\n旧\n\n\n## Page 2\n\n\nZH[New]\n\n\n## Page 3\n\n"
+        )
+        assert result["data"]["translations"] == {"f1": "旧", "f2": "ZH[New]"}
+        assert result["data"]["reused_units"] == 1
+        assert result["data"]["translated_units"] == 1
+
+    @pytest.mark.asyncio
+    async def test_new_revision_only_processes_changed_pages(self, temp_dir):
+        """Test a v2 upload re-extracts and re-translates only changed pages."""
+        papers_dir = temp_dir / "papers"
+        source_dir = papers_dir / "source" / "llm"
+        source_dir.mkdir(parents=True)
+        v1 = write_pdf(source_dir / "llm_20240115_143022_paperv1.pdf", V1_PAGES)
+        v2 = write_pdf(source_dir / "llm_20240301_090000_paperv2.pdf", V2_PAGES)
+
+        agent = WorkflowAgent({"papers_dir": str(papers_dir)})
+        engine = PDFExtractionEngine(max_workers=0)
+        calls = []
+        translator = fake_translator(calls)
+        with (
+            patch("agents.claude.skills.get_extraction_engine", return_value=engine),
+            patch.object(agent.pdf_agent, "call_skill", side_effect=translator),
+            patch.object(agent.translation_agent, "call_skill", side_effect=translator),
+        ):
+            first = await agent.process(
+                {
+                    "source_path": str(v1),
+                    "workflow": "translate_only",
+                    "paper_id": v1.name,
+                }
+            )
+            first_calls = list(calls)
+            calls.clear()
+            second = await agent.process(
+                {
+                    "source_path": str(v2),
+                    "workflow": "translate_only",
+                    "paper_id": v2.name,
+                }
+            )
+
+        assert first["success"] and second["success"]
+        # 同一次翻译的页面跨页合并为一次调用
+        assert len(first_calls) == 1
+        assert calls == [f"Method text revised\n\n{UNIT_BREAK}\n\nExtra page"]
+        assert second["data"]["reused_units"] == 2
+
+        content = second["data"]["content"]
+        for page, text in enumerate(V2_PAGES, 1):
+            assert f"## Page {page}\n\n\nZH[{text}]" in content
+
+        record = await agent.revisions.load(v2.name)
+        assert record["paper_id"] == v2.name
+        assert len(record["pages"]) == 4
+
+    @pytest.mark.asyncio
+    async def test_revised_page_reuses_unchanged_segments(self, temp_dir):
+        """Test a revised page only re-translates the paragraphs that changed."""
+        papers_dir = temp_dir / "papers"
+        agent = WorkflowAgent({"papers_dir": str(papers_dir)})
+        agent.translation_agent.default_options["token_budget"] = 8
+
+        def extraction(bodies):
+            pages = [
+                {
+                    "fingerprint": page_fingerprint(body),
+                    "heading": f"\n\n## Page {n}\n\n",
+                    "body": body,
+                    "reused": False,
+                    "result": {},
+                }
+                for n, body in enumerate(bodies, 1)
+            ]
+            return {
+                "success": True,
+                "data": {"content": "", "header": "", "pages": pages},
+            }
+
+        source = temp_dir / "paper.pdf"
+        source.write_bytes(b"%PDF-1.4")
+        v1 = ["Introduction text here", "First paragraph\n\nSecond paragraph"]
+        v2 = ["Introduction text here", "First paragraph\n\nSecond paragraph revised"]
+        calls = []
+        with (
+            patch.object(
+                agent.pdf_agent,
+                "extract_content",
+                side_effect=[extraction(v1), extraction(v2)],
+            ),
+            patch.object(
+                agent.translation_agent,
+                "call_skill",
+                side_effect=fake_translator(calls),
+            ),
+        ):
+            first = await agent.process(
+                {
+                    "source_path": str(source),
+                    "workflow": "translate_only",
+                    "paper_id": "llm_20240115_143022_paperv1",
+                }
+            )
+            calls.clear()
+            second = await agent.process(
+                {
+                    "source_path": str(source),
+                    "workflow": "translate_only",
+                    "paper_id": "llm_20240301_090000_paperv2",
+                }
+            )
+
+        assert first["success"] and second["success"]
+        assert calls == ["Second paragraph revised"]
+        assert second["data"]["reused_units"] == 1
+        assert second["data"]["reused_segments"] == 2
+        assert second["data"]["content"].endswith(
+            "## Page 2\n\n\nZH[First paragraph]\n\nZH[Second paragraph revised]"
+        )
+        segments = (
+            papers_dir
+            / "translation"
+            / "llm"
+            / ("llm_20240301_090000_paperv2.segments.json")
+        )
+        assert segments.exists()
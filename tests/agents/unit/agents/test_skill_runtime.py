@@ -0,0 +1,141 @@
+"""Unit tests for the process-wide skill runtime."""
+
+import asyncio
+import sys
+import types
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from agents.claude.base import BaseAgent
+from agents.claude.rate_limiter import LLMGovernor
+from agents.claude.skill_runtime import SkillRuntime, get_skill_runtime
+
+
+class EchoAgent(BaseAgent):
+    """Agent used to exercise BaseAgent.call_skill."""
+
+    async def process(self, input_data):
+        return {"success": True, "data": input_data}
+
+
+def sdk_module(**attrs):
+    """Build a stand-in ``claude_agent_sdk.tools`` module."""
+    module = types.ModuleType("claude_agent_sdk.tools")
+    for name, value in attrs.items():
+        setattr(module, name, value)
+    return module
+
+
+@pytest.mark.unit
+class TestSkillRuntime:
+    """Test cases for SkillRuntime."""
+
+    def test_falls_back_without_sdk(self):
+        """Test the local skills are used when the SDK is not installed."""
+        with patch.dict(sys.modules, {"claude_agent_sdk.tools": None}):
+            assert SkillRuntime().backend == "fallback"
+
+    def test_falls_back_when_sdk_fails_to_load(self):
+        """Test a broken SDK install is resolved to the fallback once."""
+        broken = sdk_module()
+        broken.__getattr__ = MagicMock(side_effect=KeyError("schema"))
+        with patch.dict(sys.modules, {"claude_agent_sdk.tools": broken}):
+            assert SkillRuntime().backend == "fallback"
+
+    @pytest.mark.asyncio
+    async def test_uses_sdk_when_available(self):
+        """Test SDK skills are called and wrapped in a result dict."""
+        skill = AsyncMock(return_value={"content": "done"})
+        with patch.dict(
+            sys.modules, {"claude_agent_sdk.tools": sdk_module(Skill=skill)}
+        ):
+            runtime = SkillRuntime()
+
+        result = await runtime.call("pdf-reader", {"file_path": "a.pdf"})
+
+        assert runtime.backend == "sdk"
+        assert result == {"success": True, "data": {"content": "done"}}
+        skill.assert_awaited_once_with("pdf-reader", {"file_path": "a.pdf"})
+
+    @pytest.mark.asyncio
+    async def test_sdk_llm_skills_are_rate_limited(self):
+        """Test SDK calls to LLM skills wait for the shared governor."""
+        skill = AsyncMock(return_value={"content": "译文"})
+        governor = LLMGovernor(max_in_flight=1)
+        with patch.dict(
+            sys.modules, {"claude_agent_sdk.tools": sdk_module(Skill=skill)}
+        ):
+            runtime = SkillRuntime()
+
+        with patch(
+            "agents.claude.skill_runtime.get_llm_governor", return_value=governor
+        ):
+            await runtime.call("zh-translator", {"content": "Hello"})
+            await runtime.call("pdf-reader", {"file_path": "a.pdf"})
+
+        assert governor.get_stats()["requests"] == 1
+
+    @pytest.mark.asyncio
+    async def test_reuses_invoker_within_event_loop(self):
+        """Test one SkillInvoker (and client) serves every call on a loop."""
+        with patch.dict(sys.modules, {"claude_agent_sdk.tools": None}):
+            runtime = SkillRuntime()
+
+        results = await asyncio.gather(
+            *(
+                runtime.call("markdown-formatter", {"content": f"# T{n}\ntext"})
+                for n in range(50)
+            )
+        )
+        await runtime.call("no-such-skill", {})
+
+        assert all(r["success"] for r in results)
+        stats = runtime.get_stats()
+        assert stats["invokers"] == 1
+        assert stats["calls"] == 51
+        assert stats["errors"] == 1
+        assert 0 < stats["mean_overhead_us"] < 5000
+
+    def test_separate_invoker_per_event_loop(self):
+        """Test each event loop gets its own invoker (pools are loop-bound)."""
+        with patch.dict(sys.modules, {"claude_agent_sdk.tools": None}):
+            runtime = SkillRuntime()
+
+        async def invoker():
+            return runtime.get_invoker()
+
+        first = asyncio.run(invoker())
+        second = asyncio.run(invoker())
+        assert first is not second
+        assert runtime.get_stats()["invokers"] == 2
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_client(self):
+        """Test closing the runtime closes the loop's Anthropic client."""
+        with patch.dict(sys.modules, {"claude_agent_sdk.tools": None}):
+            runtime = SkillRuntime()
+        invoker = runtime.get_invoker()
+        invoker.anthropic_client = MagicMock(close=AsyncMock())
+
+        await runtime.aclose()
+
+        invoker.anthropic_client.close.assert_awaited_once()
+        assert runtime.get_invoker() is not invoker
+
+    @pytest.mark.asyncio
+    async def test_base_agent_uses_shared_runtime(self):
+        """Test BaseAgent.call_skill dispatches through the shared runtime."""
+        runtime = get_skill_runtime()
+        assert get_skill_runtime() is runtime
+
+        agent = EchoAgent("echo")
+        await agent.call_skill("test_skill", {})
+        with patch(
+            "agents.claude.skills.SkillInvoker.__init__", side_effect=AssertionError
+        ):
+            result = await agent.call_skill("test_skill", {})
+
+        # Later calls on the loop reuse the invoker instead of building a new one
+        assert result["success"] is False
+        assert "Unknown skill: test_skill" in result["error"]
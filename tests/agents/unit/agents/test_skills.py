@@ -26,7 +26,7 @@ class TestSkillInvoker:
         """Create a SkillInvoker instance with API key."""
         with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}):
             with patch(
-                "agents.claude.skills.anthropic.Anthropic",
+                "agents.claude.skills.anthropic.AsyncAnthropic",
                 return_value=mock_anthropic_client,
             ):
                 return SkillInvoker()
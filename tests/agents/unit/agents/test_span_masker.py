@@ -0,0 +1,160 @@
+"""Unit tests for placeholder masking of untranslatable spans."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from agents.claude.markdown_chunker import estimate_tokens
+from agents.claude.skills import SkillInvoker
+from agents.claude.span_masker import lost_spans, mask_spans, unmask_spans
+from agents.claude.translation_agent import TranslationAgent
+
+CODE = "```python\ndef area(r):\n    return 3.14 * r ** 2  # see `math`\n```"
+TABLE = "| Model | BLEU |\n|---|---|\n| base | 27.3 |\n| big | 28.4 |"
+DOCUMENT = f"""## Setup
+
+Clone https://github.com/org/repo and edit `config.yaml` or ./conf/app.yml.
+
+{CODE}
+
+{TABLE}
+
+Energy $E=mc^2$ costs $5 and $10, see
+$$
+\\int_0^1 f(x)\\,dx
+$$
+"""
+
+
+def translator_client(translate):
+    """Build an Anthropic client stand-in that translates the prompt body."""
+    client = MagicMock()
+
+    async def create(**kwargs):
+        prompt = kwargs["messages"][0]["content"]
+        body = prompt.split("Here is the content to translate:\n\n")[1]
+        body = body.split("\n\nPlease provide only")[0]
+        return MagicMock(content=[MagicMock(text=translate(body))])
+
+    client.messages.create = AsyncMock(side_effect=create)
+    return client
+
+
+@pytest.mark.unit
+class TestSpanMasker:
+    """Test cases for mask_spans and unmask_spans."""
+
+    def test_masks_and_restores_exactly(self):
+        """Test every protected span is replaced and restored verbatim."""
+        masked, spans = mask_spans(DOCUMENT)
+
+        assert [kind for kind, _ in spans] == [
+            "code",
+            "table",
+            "math",
+            "code",
+            "math",
+            "url",
+            "path",
+        ]
+        assert "def area" not in masked and "BLEU" not in masked
+        assert "$5 and $10" in masked
+        assert estimate_tokens(masked) < estimate_tokens(DOCUMENT) / 2
+        assert unmask_spans(masked, spans) == (DOCUMENT, [])
+
+    def test_keeps_block_structure(self):
+        """Test masked tables and fences stay separate blocks."""
+        masked, _ = mask_spans(f"Intro.\n\n{TABLE}\n\nOutro.")
+        assert masked == "Intro.\n\n⟦0⟧\n\nOutro."
+
+    def test_existing_placeholder_text_is_protected(self):
+        """Test source text that looks like a placeholder survives."""
+        masked, spans = mask_spans("Keep ⟦0⟧ and `x`.")
+
+        assert masked == "Keep ⟦0⟧ and ⟦1⟧."
+        assert unmask_spans("保留 ⟦0⟧ 和 ⟦1⟧。", spans) == ("保留 ⟦0⟧ 和 `x`。", [])
+
+    def test_reports_missing_placeholders(self):
+        """Test dropped placeholders are reported by number."""
+        _, spans = mask_spans("Run `make` then `test`.")
+
+        restored, missing = unmask_spans("运行 ⟦ 0 ⟧。", spans)
+
+        assert restored == "运行 `make`。"
+        assert missing == [1]
+
+    def test_plain_prose_is_untouched(self):
+        """Test fractions, and/or and prices are not mistaken for spans."""
+        text = "Use 1/2 of the data and/or the rest; it costs $5 or $10."
+        assert mask_spans(text) == (text, [])
+
+    def test_url_keeps_balanced_parentheses(self):
+        """Test a URL with a parenthesised segment is masked as a whole."""
+        url = "https://en.wikipedia.org/wiki/Mamba_(deep_learning)"
+        masked, spans = mask_spans(f"See {url} and (also https://example.com/a).")
+
+        assert masked == "See ⟦0⟧ and (also ⟦1⟧)."
+        assert spans == [("url", url), ("url", "https://example.com/a")]
+
+    def test_numbers_are_not_paths(self):
+        """Test fractions and ratios with dots are not masked as paths."""
+        text = "Scale by 1/2.5 or 3/4.25 at 16/9, then edit conf/app.yml."
+        masked, spans = mask_spans(text)
+
+        assert spans == [("path", "conf/app.yml")]
+        assert masked == "Scale by 1/2.5 or 3/4.25 at 16/9, then edit ⟦0⟧."
+
+    def test_lost_spans_counts_occurrences(self):
+        """Test a span used twice must appear twice in the translation."""
+        original = "Call `f` here and `f` there."
+        assert lost_spans(original, "在这里调用 `f`。") == [("code", "`f`")]
+        assert lost_spans(original, "`f` 和 `f`") == []
+
+
+@pytest.mark.unit
+class TestMaskedTranslation:
+    """Test zh-translator only sends masked text to the model."""
+
+    @pytest.mark.asyncio
+    async def test_model_never_sees_protected_spans(self):
+        """Test code and tables are masked in the prompt and restored after."""
+        invoker = SkillInvoker()
+        invoker.anthropic_client = translator_client(lambda body: f"译：{body}")
+
+        result = await invoker.call_skill("zh-translator", {"content": DOCUMENT})
+
+        prompt = invoker.anthropic_client.messages.create.call_args.kwargs["messages"][
+            0
+        ]["content"]
+        assert "def area" not in prompt and "github.com" not in prompt
+        assert result["success"] is True
+        assert result["data"] == f"译：{DOCUMENT}"
+        assert result["metadata"]["protected_spans"] == 7
+
+    @pytest.mark.asyncio
+    async def test_dropped_placeholder_fails_translation(self):
+        """Test a translation that loses a span is reported as failed."""
+        invoker = SkillInvoker()
+        invoker.anthropic_client = translator_client(lambda body: "译文")
+
+        result = await invoker.call_skill("zh-translator", {"content": DOCUMENT})
+
+        assert result["success"] is False
+        assert result["error_type"] == "PlaceholderError"
+        assert "7 of 7" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_validation_checks_exact_spans(self):
+        """Test validate_translation flags a rewritten URL only."""
+        agent = TranslationAgent()
+        original = "See https://example.com/a and run `make test`."
+
+        result = await agent.validate_translation(
+            original, "参见 https://example.com/b 并运行 `make test`。"
+        )
+
+        assert result["stats"]["code_blocks_preserved"] is True
+        assert result["stats"]["lost_spans"] == [
+            {"type": "url", "text": "https://example.com/a"}
+        ]
+        assert "Protected spans were altered: url" in result["warnings"]
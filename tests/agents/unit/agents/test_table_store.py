@@ -0,0 +1,172 @@
+"""Unit tests for the columnar table store."""
+
+import asyncio
+import multiprocessing
+from unittest.mock import patch
+
+import pytest
+
+from agents.claude.pdf_engine import PDFExtractionEngine
+from agents.claude.skills import SkillInvoker
+from agents.claude.table_store import (
+    TableStore,
+    decode_tables,
+    encode_tables,
+    get_table_store,
+)
+from agents.claude.workflow_agent import WorkflowAgent
+from tests.agents.fixtures.factories.pdf_factory import write_pdf
+
+RESULTS = [["Model", "Accuracy"], ["A", "91.2"], ["B", None, "extra"]]
+ABLATION = [["Setting", "accuracy "], ["no pretrain", "80.1"]]
+
+
+def save_papers(root, prefix, count):
+    """Save tables for several papers from a separate process."""
+
+    async def save():
+        store = TableStore(root)
+        for n in range(count):
+            await store.save(
+                f"{prefix}_{n}", [{"page": 1, "index": 0, "rows": RESULTS}]
+            )
+
+    asyncio.run(save())
+
+
+@pytest.mark.unit
+class TestTableStore:
+    """Test cases for TableStore."""
+
+    def test_encode_round_trip(self):
+        """Test tables survive encoding, with short rows padded."""
+        tables = [
+            {"page": 3, "index": 0, "rows": RESULTS},
+            {"page": 5, "index": 1, "rows": []},
+        ]
+
+        decoded = decode_tables(encode_tables(tables))
+
+        assert decoded[0]["page"] == 3
+        assert decoded[0]["header"] == ["Model", "Accuracy", ""]
+        assert decoded[0]["rows"] == [
+            ["Model", "Accuracy", ""],
+            ["A", "91.2", ""],
+            ["B", "", "extra"],
+        ]
+        assert decoded[1] == {"page": 5, "index": 1, "header": [], "rows": []}
+
+    def test_encoding_is_compact(self):
+        """Test repeated cell values are stored once in the string pool."""
+        rows = [["Metric", "Value"]] + [["Accuracy", "0.5"]] * 500
+        data = encode_tables([{"page": 1, "index": 0, "rows": rows}])
+        assert data.count(b"Accuracy") == 1
+        assert len(data) < 5000
+
+    def test_decode_rejects_invalid_data(self):
+        """Test truncated or foreign files raise ValueError."""
+        data = encode_tables([{"page": 1, "index": 0, "rows": RESULTS}])
+        with pytest.raises(ValueError):
+            decode_tables(data[:-3])
+        with pytest.raises(ValueError):
+            decode_tables(b"%PDF-1.4 not a table file")
+
+    @pytest.mark.asyncio
+    async def test_find_by_header_across_papers(self, temp_dir):
+        """Test tables are found by normalized header via the index."""
+        store = TableStore(temp_dir / "tables")
+        await store.save("llm_1", [{"page": 3, "index": 0, "rows": RESULTS}])
+        await store.save("rag_2", [{"page": 7, "index": 2, "rows": ABLATION}])
+
+        hits = await store.find(column="ACCURACY")
+        assert {(h["paper_id"], h["page"], h["index"], h["column"]) for h in hits} == {
+            ("llm_1", 3, 0, 1),
+            ("rag_2", 7, 2, 1),
+        }
+        assert await store.find(column="accuracy", paper_id="rag_2", page=3) == []
+        assert len(await store.find(page=7)) == 1
+
+        # A fresh store instance answers from the persisted index
+        reopened = TableStore(temp_dir / "tables")
+        assert len(await reopened.find(column="Accuracy")) == 2
+
+        with patch("agents.claude.table_store.decode_tables") as decode:
+            await reopened.find(column="Accuracy")
+        decode.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_processes_keep_all_index_entries(self, temp_dir):
+        """Test two processes saving different papers do not drop entries."""
+        root = temp_dir / "tables"
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(target=save_papers, args=(root, prefix, 15))
+            for prefix in ("llm", "rag")
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=120)
+            assert process.exitcode == 0
+
+        hits = await TableStore(root).find(column="Model")
+        assert len(hits) == 30
+
+    @pytest.mark.asyncio
+    async def test_save_replaces_and_delete_removes(self, temp_dir):
+        """Test re-saving a paper replaces its tables and delete drops them."""
+        store = TableStore(temp_dir / "tables")
+        await store.save("llm_1", [{"page": 3, "index": 0, "rows": RESULTS}])
+        await store.save("llm_1", [{"page": 4, "index": 0, "rows": ABLATION}])
+
+        tables = await store.load("llm_1")
+        assert [(t["page"], t["header"]) for t in tables] == [
+            (4, ["Setting", "accuracy "])
+        ]
+        assert await store.find(column="Model") == []
+
+        await store.delete("llm_1")
+        assert await store.load("llm_1") == []
+        assert await store.find() == []
+        assert not (temp_dir / "tables" / "llm" / "llm_1.tbl").exists()
+
+    @pytest.mark.asyncio
+    async def test_extraction_persists_tables(self, temp_dir):
+        """Test extracting a paper stores its tables for later lookup."""
+        papers_dir = temp_dir / "papers"
+        source_dir = papers_dir / "source" / "llm"
+        source_dir.mkdir(parents=True)
+        paper_id = "llm_20240115_143022_tables.pdf"
+        pdf = write_pdf(
+            source_dir / paper_id,
+            [
+                {"lines": ["Intro"]},
+                {
+                    "lines": ["Results"],
+                    "table": [["Model", "Accuracy"], ["A", "91.2"], ["B", "88.0"]],
+                },
+            ],
+        )
+
+        agent = WorkflowAgent({"papers_dir": str(papers_dir)})
+        engine = PDFExtractionEngine(max_workers=0)
+        with (
+            patch("agents.claude.skills.get_extraction_engine", return_value=engine),
+            patch.object(
+                agent.pdf_agent, "call_skill", side_effect=SkillInvoker().call_skill
+            ),
+        ):
+            result = await agent.process(
+                {
+                    "source_path": str(pdf),
+                    "workflow": "extract_only",
+                    "paper_id": paper_id,
+                }
+            )
+
+        assert result["success"]
+        store = get_table_store(papers_dir)
+        hits = await store.find(column="accuracy")
+        assert [(h["paper_id"], h["page"]) for h in hits] == [(paper_id, 2)]
+        tables = await store.load(paper_id, page=2)
+        assert tables[0]["rows"][1] == ["A", "91.2"]
@@ -0,0 +1,102 @@
+"""Unit tests for the page thumbnail cache."""
+
+import asyncio
+import io
+import os
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+from agents.claude.pdf_engine import PDFExtractionEngine
+from agents.claude.thumbnail_cache import ThumbnailCache, get_thumbnail_cache
+from tests.agents.fixtures.factories.pdf_factory import write_pdf
+
+
+@pytest.mark.unit
+class TestThumbnailCache:
+    """Test cases for ThumbnailCache."""
+
+    @pytest.fixture
+    def engine(self):
+        """Inline extraction engine (no process pool)."""
+        return PDFExtractionEngine(max_workers=0)
+
+    @pytest.mark.asyncio
+    async def test_renders_once_then_serves_from_disk(self, temp_dir, engine):
+        """Test a thumbnail is rendered on first request and cached afterwards."""
+        pdf = write_pdf(temp_dir / "paper.pdf", ["Page one", "Page two"])
+        cache = ThumbnailCache(temp_dir / "thumbs", 1024 * 1024, engine=engine)
+
+        with patch.object(
+            engine, "render_thumbnail", wraps=engine.render_thumbnail
+        ) as render:
+            first = await cache.get(str(pdf), 2, 120)
+            second = await cache.get(str(pdf), 2, 120)
+
+        assert render.await_count == 1
+        assert first == second
+        image = Image.open(io.BytesIO(first))
+        assert image.format == "JPEG"
+        assert image.width == 120
+        assert cache.get_stats()["entries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_render(self, temp_dir, engine):
+        """Test concurrent requests for one thumbnail render it only once."""
+        pdf = write_pdf(temp_dir / "paper.pdf", ["Page one"])
+        cache = ThumbnailCache(temp_dir / "thumbs", 1024 * 1024, engine=engine)
+
+        with patch.object(
+            engine, "render_thumbnail", wraps=engine.render_thumbnail
+        ) as render:
+            results = await asyncio.gather(
+                *(cache.get(str(pdf), 1, 64) for _ in range(5))
+            )
+
+        assert render.await_count == 1
+        assert len(set(results)) == 1
+
+    def test_modified_file_is_rendered_again(self, temp_dir, engine):
+        """Test the key changes when the PDF is replaced."""
+        pdf = write_pdf(temp_dir / "paper.pdf", ["Page one"])
+        cache = ThumbnailCache(temp_dir / "thumbs", 1024 * 1024, engine=engine)
+        key = cache.make_key(str(pdf), 1, 64)
+
+        write_pdf(pdf, ["Page one", "Page two"])
+        stat = os.stat(pdf)
+        os.utime(pdf, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert cache.make_key(str(pdf), 1, 64) != key
+        assert cache.make_key(str(pdf), 1, 128) != cache.make_key(str(pdf), 1, 64)
+
+    @pytest.mark.asyncio
+    async def test_page_out_of_range(self, temp_dir, engine):
+        """Test requesting a missing page raises ValueError and caches nothing."""
+        pdf = write_pdf(temp_dir / "paper.pdf", ["Page one"])
+        cache = ThumbnailCache(temp_dir / "thumbs", 1024 * 1024, engine=engine)
+
+        with pytest.raises(ValueError, match="out of range"):
+            await cache.get(str(pdf), 3, 64)
+        assert cache.get_stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_evicts_by_total_size(self, temp_dir, engine):
+        """Test least recently used thumbnails are evicted beyond the size limit."""
+        pdf = write_pdf(temp_dir / "paper.pdf", ["One", "Two", "Three"])
+        probe = ThumbnailCache(temp_dir / "probe", 1024 * 1024, engine=engine)
+        size = len(await probe.get(str(pdf), 1, 200))
+
+        cache = ThumbnailCache(temp_dir / "thumbs", int(size * 2.5), engine=engine)
+        for page in (1, 2, 3):
+            await cache.get(str(pdf), page, 200)
+
+        stats = cache.get_stats()
+        assert stats["evictions"] >= 1
+        assert stats["size_bytes"] <= stats["max_bytes"]
+
+    def test_shared_cache_under_papers_dir(self, temp_dir):
+        """Test the shared cache lives under the papers directory."""
+        cache = get_thumbnail_cache(temp_dir)
+        assert get_thumbnail_cache(temp_dir) is cache
+        assert (temp_dir / ".cache" / "thumbnails").is_dir()
@@ -32,7 +32,7 @@ class TestTranslationAgent:
         assert translation_agent.default_options["preserve_format"] is True
         assert translation_agent.default_options["preserve_code"] is True
         assert translation_agent.default_options["preserve_formulas"] is True
-        assert translation_agent.default_options["batch_size"] == 5000
+        assert translation_agent.default_options["token_budget"] == 2000
 
     def test_translation_agent_initialization_with_config(
         self, translation_agent_with_config
@@ -108,8 +108,8 @@ class TestTranslationAgent:
     @pytest.mark.asyncio
     async def test_translate_large_content(self, translation_agent):
         """Test translate with large content (multiple batches)."""
-        # Create content larger than batch_size
-        content = "x" * 6000
+        # Create content larger than the token budget
+        content = "\n\n".join(["word " * 1000] * 3)
         params = {"content": content, "target_language": "zh", "paper_id": "test_paper"}
 
         # Mock _translate_batch
@@ -203,7 +203,7 @@ class TestTranslationAgent:
         params = {
             "content": content,
             "target_language": "zh",
-            "batch_size": 20,  # Small batch size for testing
+            "token_budget": 4,  # Small token budget for testing
             "paper_id": "test_paper",
             "preserve_format": True,
             "preserve_code": True,
@@ -223,7 +223,7 @@ class TestTranslationAgent:
         result = await translation_agent._translate_batch(params)
 
         assert result["success"] is True
-        assert result["data"]["content"] == "翻译段落1翻译段落2翻译段落3"
+        assert result["data"]["content"] == "翻译段落1\n\n翻译段落2\n\n翻译段落3"
         assert result["data"]["word_count"] == 3  # Each has 1 word
         assert result["data"]["batch_count"] == 3
 
@@ -238,7 +238,7 @@ class TestTranslationAgent:
         params = {
             "content": content,
             "target_language": "zh",
-            "batch_size": 20,
+            "token_budget": 4,
             "paper_id": "test_paper",
             "preserve_format": True,
             "preserve_code": True,
@@ -298,9 +298,9 @@ class TestTranslationAgent:
     def test_split_content_paragraphs(self, translation_agent):
         """Test content splitting by paragraphs."""
         content = "Paragraph 1\n\nParagraph 2\n\nParagraph 3"
-        batch_size = 20  # Small batch size
+        token_budget = 4  # Each paragraph is about 3 tokens
 
-        batches = translation_agent._split_content(content, batch_size)
+        batches = translation_agent._split_content(content, token_budget)
 
         assert len(batches) == 3
         assert batches[0] == "Paragraph 1"
@@ -310,9 +310,9 @@ class TestTranslationAgent:
     def test_split_content_long_paragraph(self, translation_agent):
         """Test content splitting with long paragraph that needs sentence splitting."""
         content = "First sentence。Second sentence。Third sentence。Fourth sentence。"
-        batch_size = 30  # Small batch size
+        token_budget = 8  # Small token budget
 
-        batches = translation_agent._split_content(content, batch_size)
+        batches = translation_agent._split_content(content, token_budget)
 
         assert len(batches) > 1  # Should be split into multiple batches
 
@@ -324,9 +324,9 @@ class TestTranslationAgent:
     def test_split_content_single_paragraph(self, translation_agent):
         """Test content splitting with single paragraph."""
         content = "Single paragraph"
-        batch_size = 5000
+        token_budget = 2000
 
-        batches = translation_agent._split_content(content, batch_size)
+        batches = translation_agent._split_content(content, token_budget)
 
         assert len(batches) == 1
         assert batches[0] == content
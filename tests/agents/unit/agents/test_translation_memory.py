@@ -0,0 +1,158 @@
+"""Unit tests for the SQLite translation memory."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from agents.claude.translation_agent import TranslationAgent
+from agents.claude.translation_memory import (
+    TranslationMemory,
+    get_translation_memory,
+    segment_hash,
+)
+
+OPTIONS = {
+    "target_language": "zh",
+    "preserve_format": True,
+    "preserve_code": True,
+    "preserve_formulas": True,
+}
+
+
+def echo_translations(calls):
+    """Translate each batch call by tagging its content."""
+    return [{"success": True, "data": f"译:{c['params']['content']}"} for c in calls]
+
+
+@pytest.mark.unit
+class TestTranslationMemory:
+    """Test cases for TranslationMemory."""
+
+    def test_hash_ignores_line_endings_only(self):
+        """Test CRLF and trailing spaces are ignored but layout is not."""
+        assert segment_hash("Acknowledgements  \r\nWe thank\n") == segment_hash(
+            "Acknowledgements\nWe thank"
+        )
+        assert segment_hash("Introduction") != segment_hash("introduction")
+        # Indentation, table rows and list items change the Markdown structure
+        assert segment_hash("    code") != segment_hash("code")
+        assert segment_hash("| a |\n| b |") != segment_hash("| a | | b |")
+        assert segment_hash("- a\n- b") != segment_hash("- a - b")
+
+    def test_hash_keeps_fenced_code_verbatim(self):
+        """Test trailing whitespace inside a code fence is significant."""
+        fenced = "```\nx = 1  \n```"
+        assert segment_hash(fenced) != segment_hash("```\nx = 1\n```")
+        assert segment_hash("```\ny\n```  \nText  ") == segment_hash(
+            "```\ny\n```\nText"
+        )
+
+    @pytest.mark.asyncio
+    async def test_store_and_lookup_by_language(self, temp_dir):
+        """Test translations are keyed by segment and target language."""
+        memory = TranslationMemory(temp_dir / "tm.sqlite3")
+        await memory.store([("Abstract", "摘要")], "zh")
+
+        assert await memory.lookup(["Abstract", "Methods"], "zh") == ["摘要", None]
+        assert await memory.lookup(["Abstract"], "ja") == [None]
+        assert memory.get_stats()["hits"] == 1
+
+        # Later results replace earlier ones and survive reopening
+        await memory.store([("Abstract", "概要")], "zh")
+        memory.close()
+        reopened = TranslationMemory(temp_dir / "tm.sqlite3")
+        assert await reopened.lookup(["Abstract \r\n"], "zh") == ["概要"]
+        assert await reopened.count() == 1
+
+    @pytest.mark.asyncio
+    async def test_lookup_composes_known_blocks(self, temp_dir):
+        """Test a new chunk made only of known paragraphs needs no call."""
+        memory = TranslationMemory(temp_dir / "tm.sqlite3")
+        await memory.store(
+            [
+                (
+                    "## Acknowledgements\n\nWe thank the reviewers.",
+                    "## 致谢\n\n感谢审稿人。",
+                )
+            ],
+            "zh",
+        )
+        await memory.store([("## License\n\nCC BY 4.0", "许可证")], "zh")
+
+        found = await memory.lookup(
+            ["We thank the reviewers.\n\n## Acknowledgements", "CC BY 4.0"], "zh"
+        )
+
+        assert found == ["感谢审稿人。\n\n## 致谢", None]
+
+    def test_shared_instance_per_path(self, temp_dir, monkeypatch):
+        """Test the getter honours TRANSLATION_MEMORY_PATH and caches instances."""
+        monkeypatch.delenv("TRANSLATION_MEMORY_PATH")
+        memory = get_translation_memory(temp_dir)
+        assert memory is get_translation_memory(temp_dir)
+        assert memory.db_path == temp_dir / ".cache" / "translation_memory.sqlite3"
+
+
+@pytest.mark.unit
+class TestTranslationAgentMemory:
+    """Test TranslationAgent reuses remembered translations."""
+
+    @pytest.mark.asyncio
+    async def test_single_translation_is_remembered(self, temp_dir):
+        """Test a repeated single translation does not call the skill."""
+        agent = TranslationAgent({"papers_dir": str(temp_dir)})
+        agent.call_skill = AsyncMock(return_value={"success": True, "data": "你好"})
+
+        first = await agent._translate_single({"content": "Hello", **OPTIONS})
+        second = await agent._translate_single({"content": "Hello ", **OPTIONS})
+
+        assert first["data"]["memory_hits"] == 0
+        assert second["data"] == {
+            "content": "你好",
+            "word_count": 1,
+            "batch_count": 1,
+            "memory_hits": 1,
+        }
+        agent.call_skill.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_batch_only_translates_misses(self, temp_dir):
+        """Test known batches are reused and failures are not remembered."""
+        agent = TranslationAgent({"papers_dir": str(temp_dir)})
+        content = "Intro " * 20 + "\n\n" + "Body " * 20 + "\n\n" + "End " * 20
+        params = {"content": content, "token_budget": 40, **OPTIONS}
+
+        agent.batch_call_skill = AsyncMock(
+            return_value=[
+                {"success": True, "data": "译1"},
+                {"success": False, "error": "rate limited"},
+                {"success": True, "data": "译3"},
+            ]
+        )
+        first = await agent._translate_batch(params)
+        assert first["data"]["batch_count"] == 3
+
+        agent.batch_call_skill = AsyncMock(side_effect=echo_translations)
+        second = await agent._translate_batch(params)
+
+        calls = agent.batch_call_skill.call_args[0][0]
+        assert [c["params"]["content"] for c in calls] == ["Body " * 20]
+        assert second["data"]["memory_hits"] == 2
+        assert second["data"]["content"] == "\n\n".join(
+            ["译1", "译:" + "Body " * 20, "译3"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_memory_failure_does_not_fail_translation(self, temp_dir):
+        """Test translation proceeds when the memory cannot be opened."""
+        agent = TranslationAgent({"papers_dir": str(temp_dir)})
+        agent.call_skill = AsyncMock(return_value={"success": True, "data": "你好"})
+
+        with patch(
+            "agents.claude.translation_agent.get_translation_memory",
+            side_effect=OSError("read-only file system"),
+        ):
+            result = await agent._translate_single({"content": "Hello", **OPTIONS})
+
+        assert result["success"] is True
+        assert result["data"]["content"] == "你好"
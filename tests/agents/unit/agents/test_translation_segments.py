@@ -0,0 +1,323 @@
+"""Unit tests for incremental re-translation via segment diff."""
+
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from agents.claude.markdown_chunker import split_blocks, split_markdown
+from agents.claude.translation_agent import TranslationAgent
+from agents.claude.translation_segments import (
+    UNIT_BREAK,
+    TranslationCheckpoint,
+    join_segments,
+    plan_segments,
+    plan_units,
+)
+
+OPTIONS = {
+    "target_language": "zh",
+    "preserve_format": True,
+    "preserve_code": True,
+    "preserve_formulas": True,
+    "token_budget": 12,
+}
+P1, P2, P3, P4 = (
+    "Alpha beta gamma.",
+    "Delta epsilon mu.",
+    "Sigma omega rho.",
+    "Theta kappa psi.",
+)
+NEW = "Zeta lambda pi."
+
+
+async def echo_translations(calls, on_result=None):
+    """Translate each batch call by tagging its content."""
+    results = []
+    for n, call in enumerate(calls):
+        results.append({"success": True, "data": f"译:{call['params']['content']}"})
+        if on_result is not None:
+            await on_result(n, results[-1])
+    return results
+
+
+def failing_on(source):
+    """Build an echo translator that fails the batch holding source."""
+
+    async def translate(calls, on_result=None):
+        results = []
+        for n, call in enumerate(calls):
+            content = call["params"]["content"]
+            if source in content:
+                results.append({"success": False, "error": "overloaded"})
+            else:
+                results.append({"success": True, "data": f"译:{content}"})
+            if on_result is not None:
+                await on_result(n, results[-1])
+        return results
+
+    return translate
+
+
+def document(*paragraphs):
+    """Join paragraphs into a Markdown document."""
+    return "\n\n".join(paragraphs)
+
+
+def translated(segments):
+    """Mark every planned segment as translated."""
+    return [{**s, "translation": f"译:{s['source']}"} for s in segments]
+
+
+@pytest.mark.unit
+class TestPlanSegments:
+    """Test cases for plan_segments."""
+
+    def test_first_translation_matches_chunker(self):
+        """Test without previous segments the plan is the regular chunking."""
+        content = document(P1, P2, P3, P4)
+        plan = plan_segments([], split_blocks(content, 12), 12)
+
+        assert [s["source"] for s in plan] == split_markdown(content, 12)
+        assert all(s["translation"] is None for s in plan)
+
+    def test_inserted_block_keeps_neighbours(self):
+        """Test an insertion only adds a segment instead of shifting chunks."""
+        previous = translated(
+            plan_segments([], split_blocks(document(P1, P2, P3, P4), 12), 12)
+        )
+        content = document(P1, P2, NEW, P3, P4)
+        plan = plan_segments(previous, split_blocks(content, 12), 12)
+
+        assert [(s["source"], s["translation"]) for s in plan] == [
+            (document(P1, P2), f"译:{document(P1, P2)}"),
+            (NEW, None),
+            (document(P3, P4), f"译:{document(P3, P4)}"),
+        ]
+        # Plain re-chunking would have moved P3 into the new chunk
+        assert split_markdown(content, 12)[1] == document(NEW, P3)
+
+    def test_changed_and_removed_blocks(self):
+        """Test a segment is re-translated when any of its blocks changes."""
+        previous = translated(
+            plan_segments([], split_blocks(document(P1, P2, P3, P4), 12), 12)
+        )
+        plan = plan_segments(previous, split_blocks(document(P1, P2, P3), 12), 12)
+
+        assert [(s["source"], s["translation"]) for s in plan] == [
+            (document(P1, P2), f"译:{document(P1, P2)}"),
+            (P3, None),
+        ]
+
+    def test_failed_segments_are_not_reused(self):
+        """Test segments saved without a translation are translated again."""
+        previous = plan_segments([], split_blocks(document(P1, P2), 12), 12)
+        plan = plan_segments(previous, split_blocks(document(P1, P2), 12), 12)
+
+        assert plan[0]["translation"] is None
+
+
+@pytest.mark.unit
+class TestPlanUnits:
+    """Test cases for packing page units into segments."""
+
+    def units(self, *bodies, known=None):
+        """Build one unit per page body."""
+        known = known or {}
+        return [
+            {
+                "lead": f"## Page {n}\n",
+                "text": body,
+                "translation": known.get(n),
+            }
+            for n, body in enumerate(bodies)
+        ]
+
+    def test_pages_are_packed_across_page_breaks(self):
+        """Test short pages share a segment and map back to their pages."""
+        segments, owners = plan_units([], self.units(P1, P2, P3), 12)
+
+        assert [s["source"] for s in segments] == [
+            f"{P1}\n\n{UNIT_BREAK}\n\n{P2}",
+            P3,
+        ]
+        assert owners == [[0, 1], [2]]
+        assert segments[0]["breaks"] == [1]
+        assert join_segments(segments, [s["source"] for s in segments]) == (
+            f"## Page 0\n{P1}## Page 1\n{P2}## Page 2\n{P3}"
+        )
+
+    def test_known_page_splits_the_packing(self):
+        """Test pages with a known translation are kept as their own segment."""
+        segments, owners = plan_units([], self.units(P1, P2, P3, known={1: "二"}), 12)
+
+        assert [s["source"] for s in segments] == [P1, P2, P3]
+        assert [s["translation"] for s in segments] == [None, "二", None]
+        assert owners == [[0], [1], [2]]
+
+    def test_reuse_requires_the_same_page_breaks(self):
+        """Test a packed segment is only reused with the same page boundaries."""
+        previous = translated(plan_units([], self.units(P1, P2), 12)[0])
+        same, _ = plan_units(previous, self.units(P1, P2), 12)
+        moved, _ = plan_units(previous, self.units(document(P1, P2)), 12)
+
+        assert same[0]["translation"] == f"译:{P1}\n\n{UNIT_BREAK}\n\n{P2}"
+        assert moved[0]["translation"] is None
+
+
+@pytest.mark.unit
+class TestIncrementalTranslation:
+    """Test TranslationAgent only re-translates changed segments."""
+
+    @pytest.mark.asyncio
+    async def test_retranslation_sends_only_changes(self, temp_dir):
+        """Test a revised document reuses translations of unchanged segments."""
+        agent = TranslationAgent({"papers_dir": str(temp_dir)})
+        agent.batch_call_skill = AsyncMock(side_effect=echo_translations)
+        paper_id = "llm_paper"
+
+        await agent._translate_batch(
+            {"content": document(P1, P2, P3, P4), "paper_id": paper_id, **OPTIONS}
+        )
+        result = await agent._translate_batch(
+            {"content": document(P1, P2, NEW, P3), "paper_id": paper_id, **OPTIONS}
+        )
+
+        calls = agent.batch_call_skill.call_args[0][0]
+        assert [c["params"]["content"] for c in calls] == [document(NEW, P3)]
+        assert result["data"]["reused_segments"] == 1
+        assert result["data"]["content"] == (
+            f"译:{document(P1, P2)}\n\n译:{document(NEW, P3)}"
+        )
+
+        output_dir = temp_dir / "translation" / "llm"
+        saved = (output_dir / f"{paper_id}.md").read_text(encoding="utf-8")
+        assert saved == result["data"]["content"]
+        record = json.loads(
+            (output_dir / f"{paper_id}.segments.json").read_text(encoding="utf-8")
+        )
+        assert [s["source"] for s in record["segments"]] == [
+            document(P1, P2),
+            document(NEW, P3),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_other_language_is_not_reused(self, temp_dir):
+        """Test segments saved for another target language are ignored."""
+        agent = TranslationAgent({"papers_dir": str(temp_dir)})
+        agent.batch_call_skill = AsyncMock(side_effect=echo_translations)
+        params = {"content": document(P1, P2, P3), "paper_id": "llm_paper", **OPTIONS}
+
+        await agent._translate_batch(params)
+        result = await agent._translate_batch({**params, "target_language": "ja"})
+
+        assert result["data"]["reused_segments"] == 0
+        assert len(agent.batch_call_skill.call_args[0][0]) == 2
+
+
+@pytest.mark.unit
+class TestFailedChunkRetry:
+    """Test checkpoints and retrying only failed chunks."""
+
+    @pytest.mark.asyncio
+    async def test_failed_chunks_are_recorded_and_retried(self, temp_dir):
+        """Test retry_failed re-sends only the chunk that failed."""
+        agent = TranslationAgent({"papers_dir": str(temp_dir)})
+        agent.default_options["token_budget"] = 12
+        agent.batch_call_skill = AsyncMock(side_effect=failing_on(P3))
+        paper_id = "llm_paper"
+
+        result = await agent._translate_batch(
+            {"content": document(P1, P2, P3, P4), "paper_id": paper_id, **OPTIONS}
+        )
+
+        assert result["success"] is True
+        assert result["data"]["failed_chunks"] == [{"index": 1, "error": "overloaded"}]
+        assert result["data"]["content"] == (
+            f"译:{document(P1, P2)}\n\n{document(P3, P4)}"
+        )
+        output_dir = temp_dir / "translation" / "llm"
+        record = json.loads(
+            (output_dir / f"{paper_id}.segments.json").read_text(encoding="utf-8")
+        )
+        assert [s.get("error") for s in record["segments"]] == [None, "overloaded"]
+        # The checkpoint is removed once the segments are saved
+        assert list(output_dir.glob("*.jsonl")) == []
+
+        agent.batch_call_skill = AsyncMock(side_effect=echo_translations)
+        retry = await agent.retry_failed({"paper_id": paper_id})
+
+        calls = agent.batch_call_skill.call_args[0][0]
+        assert [c["params"]["content"] for c in calls] == [document(P3, P4)]
+        assert retry["data"]["retried"] == 1
+        assert retry["data"]["failed_chunks"] == []
+        assert (output_dir / f"{paper_id}.md").read_text(encoding="utf-8") == (
+            f"译:{document(P1, P2)}\n\n译:{document(P3, P4)}"
+        )
+
+    @pytest.mark.asyncio
+    async def test_failed_pages_are_recorded_and_retried(self, temp_dir):
+        """Test page translation reports failed chunks and retry_failed fixes them."""
+        agent = TranslationAgent({"papers_dir": str(temp_dir)})
+        agent.default_options["token_budget"] = 12
+        agent.batch_call_skill = AsyncMock(side_effect=failing_on(P1))
+        paper_id = "llm_paper"
+        pages = [
+            {"fingerprint": f"f{n}", "heading": f"## Page {n}", "body": body}
+            for n, body in enumerate([P1, P2, P3], 1)
+        ]
+
+        result = await agent.translate_pages(
+            {"header": "", "pages": pages, "paper_id": paper_id}
+        )
+
+        assert result["success"] is True
+        assert result["data"]["failed_chunks"] == [{"index": 0, "error": "overloaded"}]
+        assert result["data"]["failed_units"] == 2
+        assert result["data"]["translations"] == {"f3": f"译:{P3}"}
+        output_dir = temp_dir / "translation" / "llm"
+        assert list(output_dir.glob("*.jsonl")) == []
+
+        agent.batch_call_skill = AsyncMock(side_effect=echo_translations)
+        retry = await agent.retry_failed({"paper_id": paper_id})
+
+        assert retry["data"]["retried"] == 1
+        assert (output_dir / f"{paper_id}.md").read_text(encoding="utf-8") == (
+            f"## Page 1\n译:{P1}\n## Page 2\n{P2}\n## Page 3\n译:{P3}"
+        )
+
+    @pytest.mark.asyncio
+    async def test_retry_without_segments(self, temp_dir):
+        """Test retry_failed reports papers that were never translated."""
+        agent = TranslationAgent({"papers_dir": str(temp_dir)})
+
+        result = await agent.retry_failed({"paper_id": "llm_paper"})
+
+        assert result["success"] is False
+        assert "No translation segments" in result["error"]
+        assert (await agent.retry_failed({}))["success"] is False
+
+    @pytest.mark.asyncio
+    async def test_interrupted_translation_resumes_from_checkpoint(self, temp_dir):
+        """Test chunks checkpointed before a crash are not translated again."""
+        agent = TranslationAgent({"papers_dir": str(temp_dir)})
+        paper_id = "llm_paper"
+        checkpoint = TranslationCheckpoint(
+            agent._translation_file(paper_id), OPTIONS["target_language"]
+        )
+        await checkpoint.record(document(P1, P2), {"success": True, "data": "已译"})
+        await checkpoint.record(document(P3, P4), {"success": False, "error": "x"})
+        # Simulate a crash while the last line was being written
+        with open(checkpoint.path, "a", encoding="utf-8") as f:
+            f.write('{"hash": "trunc')
+        agent.batch_call_skill = AsyncMock(side_effect=echo_translations)
+
+        result = await agent._translate_batch(
+            {"content": document(P1, P2, P3, P4), "paper_id": paper_id, **OPTIONS}
+        )
+
+        calls = agent.batch_call_skill.call_args[0][0]
+        assert [c["params"]["content"] for c in calls] == [document(P3, P4)]
+        assert result["data"]["resumed_segments"] == 1
+        assert result["data"]["content"] == f"已译\n\n译:{document(P3, P4)}"
+        assert not checkpoint.path.exists()
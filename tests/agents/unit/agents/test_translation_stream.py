@@ -0,0 +1,310 @@
+"""Unit tests for streaming translation output."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from agents.claude.skills import SkillInvoker
+from agents.claude.translation_agent import TranslationAgent
+from agents.claude.translation_segments import UNIT_BREAK
+from agents.claude.translation_stream import TranslationStream
+
+OPTIONS = {
+    "target_language": "zh",
+    "preserve_format": True,
+    "preserve_code": True,
+    "preserve_formulas": True,
+}
+
+
+class Recorder:
+    """Collect partial translation callbacks."""
+
+    def __init__(self):
+        self.texts = []
+        self.progress = []
+
+    async def __call__(self, text, progress):
+        self.texts.append(text)
+        self.progress.append(progress)
+
+
+def fake_stream(deltas, gates=None):
+    """Build a stream_skill replacement that yields canned deltas per chunk."""
+
+    async def stream_skill(skill_name, params):
+        content = params["content"]
+        if gates and content in gates:
+            await gates[content].wait()
+        if content not in deltas:
+            yield {"type": "error", "success": False, "error": "overloaded"}
+            return
+        for delta in deltas[content]:
+            yield {"type": "delta", "text": delta}
+            await asyncio.sleep(0)
+        yield {"type": "complete", "success": True, "data": "".join(deltas[content])}
+
+    return stream_skill
+
+
+@pytest.mark.unit
+class TestTranslationStream:
+    """Test cases for TranslationStream."""
+
+    @pytest.mark.asyncio
+    async def test_emits_in_document_order(self, temp_dir):
+        """Test later chunks are held back until earlier ones are written."""
+        output = temp_dir / "out.md"
+        output.write_text("旧译文", encoding="utf-8")
+        recorder = Recorder()
+        stream = TranslationStream([0, "\n\n", 1], 2, output, recorder)
+
+        await stream.feed(1, "第二段\n")
+        assert recorder.texts == []
+
+        await stream.feed(0, "第一段第一行\n第一")
+        assert recorder.texts == ["第一段第一行\n"]
+        assert stream.part_file.read_text(encoding="utf-8") == "第一段第一行\n"
+        # The previous translation stays in place until the stream completes
+        assert output.read_text(encoding="utf-8") == "旧译文"
+
+        await stream.complete(0, "第一段第一行\n第一段第二行")
+        await stream.complete(1, "第二段\n结束")
+        await stream.close()
+
+        assert "".join(recorder.texts) == "第一段第一行\n第一段第二行\n\n第二段\n结束"
+        assert output.read_text(encoding="utf-8") == "".join(recorder.texts)
+        assert not stream.part_file.exists()
+        assert recorder.progress[-1] == 100.0
+
+    @pytest.mark.asyncio
+    async def test_abort_keeps_previous_translation(self, temp_dir):
+        """Test an interrupted stream leaves the existing file untouched."""
+        output = temp_dir / "out.md"
+        output.write_text("旧译文", encoding="utf-8")
+        stream = TranslationStream([0], 1, output)
+
+        await stream.feed(0, "新译文\n")
+        stream.abort()
+
+        assert output.read_text(encoding="utf-8") == "旧译文"
+        assert list(temp_dir.iterdir()) == [output]
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_restarts_on_new_line(self):
+        """Test a chunk whose final text differs from the streamed prefix."""
+        recorder = Recorder()
+        stream = TranslationStream([0], 1, on_partial=recorder)
+
+        await stream.feed(0, "部分译文\n")
+        await stream.complete(0, "Original text")
+
+        assert "".join(recorder.texts) == "部分译文\n\nOriginal text"
+
+    @pytest.mark.asyncio
+    async def test_callback_errors_are_ignored(self, temp_dir):
+        """Test a failing subscriber does not stop the file from being written."""
+        output = temp_dir / "out.md"
+        stream = TranslationStream(
+            [0], 1, output, AsyncMock(side_effect=RuntimeError("socket closed"))
+        )
+
+        await stream.complete(0, "译文")
+        await stream.close()
+
+        assert output.read_text(encoding="utf-8") == "译文"
+
+
+@pytest.mark.unit
+class TestTranslationAgentStreaming:
+    """Test TranslationAgent streams translations when given on_partial."""
+
+    @pytest.mark.asyncio
+    async def test_translate_streams_to_callback_and_file(self, temp_dir):
+        """Test chunks are streamed in order and the file holds the result."""
+        agent = TranslationAgent({"papers_dir": str(temp_dir)})
+        agent.default_options["token_budget"] = 8
+        first, second = "First paragraph here.", "Second paragraph here."
+        gates = {first: asyncio.Event()}
+        agent.stream_skill = fake_stream(
+            {first: ["第一", "段。\n"], second: ["第二段。"]}, gates
+        )
+        agent.batch_call_skill = AsyncMock()
+        recorder = Recorder()
+
+        task = asyncio.create_task(
+            agent.translate(
+                {
+                    "content": f"{first}\n\n{second}",
+                    "paper_id": "ml_paper",
+                    "on_partial": recorder,
+                    **OPTIONS,
+                }
+            )
+        )
+        # The second chunk finishes first but waits for the first one
+        await asyncio.sleep(0.01)
+        assert recorder.texts == []
+        gates[first].set()
+        result = await task
+
+        expected = "第一段。\n\n\n第二段。"
+        assert result["data"]["content"] == expected
+        assert "".join(recorder.texts) == expected
+        output = temp_dir / "translation" / "ml" / "ml_paper.md"
+        assert output.read_text(encoding="utf-8") == expected
+        agent.batch_call_skill.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_falls_back_to_source(self, temp_dir):
+        """Test a chunk whose stream fails is written as the original text."""
+        agent = TranslationAgent({"papers_dir": str(temp_dir)})
+        recorder = Recorder()
+        agent.stream_skill = fake_stream({})
+
+        result = await agent.translate(
+            {"content": "Hello", "on_partial": recorder, **OPTIONS}
+        )
+
+        assert result["data"]["content"] == "Hello"
+        assert recorder.texts == ["Hello"]
+
+    @pytest.mark.asyncio
+    async def test_translate_pages_streams_page_layout(self, temp_dir):
+        """Test page headings and reused translations are streamed in place."""
+        agent = TranslationAgent({"papers_dir": str(temp_dir)})
+        agent.stream_skill = fake_stream({"Page two.": ["第二页。"]})
+        recorder = Recorder()
+
+        result = await agent.translate_pages(
+            {
+                "header": "",
+                "pages": [
+                    {"fingerprint": "a", "heading": "## Page 1", "body": "Page one."},
+                    {"fingerprint": "b", "heading": "## Page 2", "body": "Page two."},
+                ],
+                "translations": {"a": "第一页。"},
+                "on_partial": recorder,
+            }
+        )
+
+        assert result["data"]["content"] == "## Page 1\n第一页。\n## Page 2\n第二页。"
+        assert "".join(recorder.texts) == result["data"]["content"]
+        # The reused page is sent before the translated one is requested
+        assert recorder.texts[0] == "## Page 1\n第一页。\n## Page 2\n"
+
+    @pytest.mark.asyncio
+    async def test_packed_pages_stream_with_headings(self, temp_dir):
+        """Test page breaks inside a packed chunk are streamed as page headings."""
+        agent = TranslationAgent({"papers_dir": str(temp_dir)})
+        source = f"Page one.\n\n{UNIT_BREAK}\n\nPage two."
+        agent.stream_skill = fake_stream(
+            {source: ["第一页。\n\n", f"{UNIT_BREAK}\n\n", "第二页。"]}
+        )
+        recorder = Recorder()
+
+        result = await agent.translate_pages(
+            {
+                "header": "",
+                "pages": [
+                    {"fingerprint": "a", "heading": "## Page 1", "body": "Page one."},
+                    {"fingerprint": "b", "heading": "## Page 2", "body": "Page two."},
+                ],
+                "on_partial": recorder,
+            }
+        )
+
+        assert result["data"]["content"] == "## Page 1\n第一页。\n## Page 2\n第二页。"
+        assert "".join(recorder.texts) == result["data"]["content"]
+        assert result["data"]["translations"] == {"a": "第一页。", "b": "第二页。"}
+
+    @pytest.mark.asyncio
+    async def test_lost_page_break_fails_the_chunk(self, temp_dir):
+        """Test a translation that drops a page break falls back to the source."""
+        agent = TranslationAgent({"papers_dir": str(temp_dir)})
+        source = f"Page one.\n\n{UNIT_BREAK}\n\nPage two."
+        agent.stream_skill = fake_stream({source: ["第一页。第二页。"]})
+
+        result = await agent.translate_pages(
+            {
+                "header": "",
+                "pages": [
+                    {"fingerprint": "a", "heading": "## Page 1", "body": "Page one."},
+                    {"fingerprint": "b", "heading": "## Page 2", "body": "Page two."},
+                ],
+                "on_partial": Recorder(),
+            }
+        )
+
+        assert result["data"]["content"] == "## Page 1\nPage one.\n## Page 2\nPage two."
+        assert result["data"]["failed_units"] == 2
+        assert result["data"]["failed_chunks"][0]["error"] == (
+            "Translation lost page breaks"
+        )
+
+
+@pytest.mark.unit
+class TestStreamingTranslatorSkill:
+    """Test the streaming zh-translator skill."""
+
+    @pytest.mark.asyncio
+    async def test_streams_restored_lines(self):
+        """Test deltas are restored line by line from the messages stream."""
+
+        async def text_stream():
+            for text in ["你好，", "⟦0", "⟧\n", "再见"]:
+                yield text
+
+        message_stream = MagicMock()
+        message_stream.__aenter__ = AsyncMock(
+            return_value=MagicMock(text_stream=text_stream())
+        )
+        message_stream.__aexit__ = AsyncMock(return_value=False)
+        invoker = SkillInvoker()
+        invoker.anthropic_client = MagicMock()
+        invoker.anthropic_client.messages.stream = MagicMock(
+            return_value=message_stream
+        )
+
+        events = [
+            event
+            async for event in invoker.stream_skill(
+                "zh-translator", {"content": "Hello, `world`\nBye"}
+            )
+        ]
+
+        assert [e["text"] for e in events if e["type"] == "delta"] == [
+            "你好，`world`\n",
+            "再见",
+        ]
+        assert events[-1] == {
+            "type": "complete",
+            "success": True,
+            "data": "你好，`world`\n再见",
+            "content": "你好，`world`\n再见",
+        }
+        kwargs = invoker.anthropic_client.messages.stream.call_args.kwargs
+        assert "Hello, ⟦0⟧" in kwargs["messages"][0]["content"]
+
+    @pytest.mark.asyncio
+    async def test_stream_without_client_reports_error(self):
+        """Test streaming without an API key yields a configuration error."""
+        invoker = SkillInvoker()
+        invoker.anthropic_client = None
+
+        events = [
+            event
+            async for event in invoker.stream_skill(
+                "zh-translator", {"content": "Hello"}
+            )
+        ]
+
+        assert events == [
+            {
+                "type": "error",
+                "success": False,
+                "error": "Anthropic API key not configured",
+                "error_type": "ConfigurationError",
+            }
+        ]
@@ -139,6 +139,7 @@ class TestWorkflowAgent:
                         "extract_images": True,
                         "extract_tables": True,
                         "extract_formulas": True,
+                        "include_pages": True,
                     },
                 }
             )
@@ -217,6 +217,92 @@ class TestPapersRoutes:
 
         assert response.status_code == 404
 
+    def test_get_paper_page_success(self, client, mock_paper_service):
+        """Test single page retrieval."""
+        mock_paper_service.get_page.return_value = {
+            "paper_id": "test_paper",
+            "page": 3,
+            "total_pages": 400,
+            "content": "## Page 3",
+        }
+
+        response = client.get("/api/papers/test_paper/pages/3")
+
+        assert response.status_code == 200
+        assert response.json()["total_pages"] == 400
+        mock_paper_service.get_page.assert_awaited_once_with("test_paper", 3)
+
+    def test_get_paper_page_errors(self, client, mock_paper_service):
+        """Test invalid, missing and failing page requests."""
+        assert client.get("/api/papers/test_paper/pages/0").status_code == 422
+
+        mock_paper_service.get_page.side_effect = ValueError("Page 9 out of range")
+        assert client.get("/api/papers/test_paper/pages/9").status_code == 404
+
+        mock_paper_service.get_page.side_effect = Exception("Corrupt PDF")
+        response = client.get("/api/papers/test_paper/pages/1")
+        assert response.status_code == 500
+        assert "Corrupt PDF" in response.json()["detail"]
+
+    def test_get_paper_page_thumbnail(self, client, mock_paper_service):
+        """Test page thumbnails are served as cacheable JPEG images."""
+        mock_paper_service.get_page_thumbnail.return_value = b"\xff\xd8jpeg"
+
+        response = client.get("/api/papers/test_paper/pages/2/thumbnail?width=128")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/jpeg"
+        assert "max-age" in response.headers["cache-control"]
+        assert response.content == b"\xff\xd8jpeg"
+        mock_paper_service.get_page_thumbnail.assert_awaited_once_with(
+            "test_paper", 2, 128
+        )
+
+    def test_get_paper_page_thumbnail_errors(self, client, mock_paper_service):
+        """Test invalid, missing and failing thumbnail requests."""
+        url = "/api/papers/test_paper/pages/1/thumbnail"
+        assert client.get(f"{url}?width=4096").status_code == 422
+
+        mock_paper_service.get_page_thumbnail.side_effect = ValueError("Not found")
+        assert client.get(url).status_code == 404
+
+        mock_paper_service.get_page_thumbnail.side_effect = Exception("Corrupt PDF")
+        assert client.get(url).status_code == 500
+
+    def test_search_tables(self, client, mock_paper_service):
+        """Test table search by column header."""
+        mock_paper_service.search_tables.return_value = {
+            "results": [{"paper_id": "p1", "page": 3, "index": 0, "column": 1}],
+            "total": 1,
+        }
+
+        response = client.get("/api/papers/tables/search?column=Accuracy&page=3")
+
+        assert response.status_code == 200
+        assert response.json()["total"] == 1
+        mock_paper_service.search_tables.assert_awaited_once_with(
+            column="Accuracy", paper_id=None, page=3
+        )
+
+        mock_paper_service.search_tables.side_effect = Exception("Corrupt index")
+        assert client.get("/api/papers/tables/search").status_code == 500
+
+    def test_get_paper_tables(self, client, mock_paper_service):
+        """Test retrieving a paper's tables."""
+        mock_paper_service.get_tables.return_value = {
+            "paper_id": "test_paper",
+            "tables": [],
+            "total": 0,
+        }
+
+        response = client.get("/api/papers/test_paper/tables?page=2")
+
+        assert response.status_code == 200
+        mock_paper_service.get_tables.assert_awaited_once_with("test_paper", page=2)
+
+        mock_paper_service.get_tables.side_effect = ValueError("Paper not found")
+        assert client.get("/api/papers/missing/tables").status_code == 404
+
     def test_list_papers_success(self, client, mock_paper_service):
         """Test successful paper listing."""
         papers = [
@@ -417,6 +503,28 @@ class TestPapersRoutes:
         data = response.json()
         assert data["task_id"] == "translate_task_123"
 
+    def test_retry_translation_endpoint(self, client, mock_paper_service):
+        """Test the translation retry endpoint."""
+        paper_id = "test_paper_123"
+
+        mock_response = {"task_id": "retry_123", "status": "completed", "retried": 1}
+        mock_paper_service.retry_translation.return_value = mock_response
+
+        response = client.post(f"/api/papers/{paper_id}/translate/retry")
+
+        assert response.status_code == 200
+        assert response.json()["retried"] == 1
+
+    def test_retry_translation_without_segments(self, client, mock_paper_service):
+        """Test retrying a paper that has no recorded segments."""
+        mock_paper_service.retry_translation.side_effect = ValueError(
+            "No translation segments found"
+        )
+
+        response = client.post("/api/papers/test_paper_123/translate/retry")
+
+        assert response.status_code == 404
+
     def test_analyze_paper_endpoint(self, client, mock_paper_service):
         """Test the analyze paper endpoint."""
         paper_id = "test_paper_123"
@@ -463,3 +571,5 @@ class TestPapersRoutes:
         data = response.json()
         assert "status" in data
         assert data["status"] == "healthy"
+        assert "mean_queue_wait_ms" in data["llm"]
+        assert data["llm"]["concurrency_limit"] >= 1
@@ -2,7 +2,7 @@
 
 import io
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi import UploadFile
@@ -136,6 +136,7 @@ class TestPaperService:
                             "workflow": workflow,
                             "paper_id": paper_id,
                             "options": {},
+                            "on_partial": ANY,
                         }
                     )
 
@@ -199,12 +200,42 @@ class TestPaperService:
                             "workflow": workflow,
                             "paper_id": paper_id,
                             "options": options,
+                            "on_partial": ANY,
                         }
                     )
                 assert result["paper_id"] == paper_id
                 assert result["workflow"] == workflow
                 assert result["status"] == "completed"
 
+    @pytest.mark.asyncio
+    async def test_process_paper_streams_partial_translation(
+        self, paper_service, temp_dir
+    ):
+        """Test partial translations are pushed to the paper's subscribers."""
+        source_path = temp_dir / "papers/source/test/test_paper_123.pdf"
+
+        async def process(input_data):
+            await input_data["on_partial"]("# 标题\n", 50.0)
+            return {"success": True}
+
+        paper_service.workflow_agent.process = AsyncMock(side_effect=process)
+        with (
+            patch.object(paper_service, "_get_source_path", return_value=source_path),
+            patch.object(paper_service, "_update_status", new_callable=AsyncMock),
+            patch.object(paper_service, "_create_task_record", new_callable=AsyncMock),
+            patch(
+                "agents.api.routes.websocket.send_task_update", new_callable=AsyncMock
+            ) as mock_send,
+            patch_file_operations(),
+        ):
+            mock_file_manager.add_file(str(source_path), b"PDF content")
+            await paper_service.process_paper("test_paper_123", "full")
+
+        # The task ID is only returned once processing finishes
+        mock_send.assert_awaited_once_with(
+            "test_paper_123", "translating", 50.0, "# 标题\n"
+        )
+
     @pytest.mark.asyncio
     async def test_get_paper_status(self, paper_service):
         """Test getting paper status."""
@@ -412,6 +443,138 @@ class TestPaperService:
 
                         assert result is True
 
+    @pytest.mark.asyncio
+    async def test_delete_paper_removes_translation_state(self, temp_dir):
+        """Test deleting a paper removes its segments and checkpoints."""
+        with patch("agents.api.services.paper_service.settings") as mock_settings:
+            mock_settings.PAPERS_DIR = str(temp_dir / "papers")
+            service = PaperService()
+
+        paper_id = "llm_20240115_143022_paper"
+        output_dir = temp_dir / "papers" / "translation" / "llm"
+        output_dir.mkdir(parents=True)
+        files = [
+            output_dir / f"{paper_id}.md",
+            output_dir / f"{paper_id}.md.part",
+            output_dir / f"{paper_id}.segments.json",
+            output_dir / f".{paper_id}.zh.translate.jsonl",
+            output_dir / f".{paper_id}.en.translate.jsonl",
+        ]
+        source_dir = temp_dir / "papers" / "source" / "llm"
+        source_dir.mkdir(parents=True)
+        files += [
+            source_dir / paper_id,
+            source_dir / f".{paper_id}.0123456789abcdef.extract.jsonl",
+            source_dir / f".{paper_id}.0123456789abcdef.extract.jsonl.lock",
+        ]
+        for path in files:
+            path.write_text("x", encoding="utf-8")
+        other = output_dir / ".llm_20240301_090000_other.zh.translate.jsonl"
+        other.write_text("x", encoding="utf-8")
+        revisions = service.workflow_agent.revisions
+        await revisions.save(paper_id, [], {"f1": "译文"})
+        assert revisions._path(paper_id).exists()
+
+        with (
+            patch.object(
+                service,
+                "_get_metadata",
+                new_callable=AsyncMock,
+                return_value={"paper_id": paper_id, "category": "llm"},
+            ),
+            patch.object(service, "_delete_metadata", new_callable=AsyncMock),
+        ):
+            assert await service.delete_paper(paper_id) is True
+
+        assert not any(path.exists() for path in files)
+        assert other.exists()
+        assert (await revisions.load(paper_id))["paper_id"] is None
+
+    @pytest.mark.asyncio
+    async def test_retry_translation(self, paper_service):
+        """Test retry_translation re-translates only the failed chunks."""
+        paper_id = "test_paper_123"
+        translation_agent = MagicMock()
+        translation_agent.retry_failed = AsyncMock(
+            return_value={
+                "success": True,
+                "data": {"content": "译文", "retried": 2, "failed_chunks": []},
+            }
+        )
+        paper_service.workflow_agent.translation_agent = translation_agent
+
+        with (
+            patch.object(
+                paper_service,
+                "_get_metadata",
+                new_callable=AsyncMock,
+                return_value={"paper_id": paper_id},
+            ),
+            patch.object(paper_service, "_update_status", new_callable=AsyncMock),
+        ):
+            result = await paper_service.retry_translation(paper_id)
+
+        assert result["status"] == "completed"
+        assert result["retried"] == 2
+        assert result["failed_chunks"] == []
+        assert translation_agent.retry_failed.await_args[0][0]["paper_id"] == paper_id
+
+    @pytest.mark.asyncio
+    async def test_retry_translation_with_remaining_failures(self, paper_service):
+        """Test a retry that still fails a chunk leaves the paper retryable."""
+        paper_id = "test_paper_123"
+        failed_chunks = [{"index": 3, "error": "overloaded"}]
+        translation_agent = MagicMock()
+        translation_agent.retry_failed = AsyncMock(
+            return_value={
+                "success": True,
+                "data": {
+                    "content": "译文",
+                    "retried": 2,
+                    "failed_chunks": failed_chunks,
+                },
+            }
+        )
+        paper_service.workflow_agent.translation_agent = translation_agent
+
+        with (
+            patch.object(
+                paper_service,
+                "_get_metadata",
+                new_callable=AsyncMock,
+                return_value={"paper_id": paper_id},
+            ),
+            patch.object(
+                paper_service, "_update_status", new_callable=AsyncMock
+            ) as update_status,
+        ):
+            result = await paper_service.retry_translation(paper_id)
+
+        assert result["status"] == "partial"
+        assert result["failed_chunks"] == failed_chunks
+        assert update_status.await_args[0][:3] == (paper_id, "partial", "translate")
+
+    @pytest.mark.asyncio
+    async def test_retry_translation_without_segments(self, paper_service):
+        """Test retry_translation fails when there is nothing to retry."""
+        translation_agent = MagicMock()
+        translation_agent.retry_failed = AsyncMock(
+            return_value={"success": False, "error": "No translation segments found"}
+        )
+        paper_service.workflow_agent.translation_agent = translation_agent
+
+        with (
+            patch.object(
+                paper_service,
+                "_get_metadata",
+                new_callable=AsyncMock,
+                return_value={"paper_id": "test_paper_123"},
+            ),
+            patch.object(paper_service, "_update_status", new_callable=AsyncMock),
+            pytest.raises(ValueError, match="No translation segments found"),
+        ):
+            await paper_service.retry_translation("test_paper_123")
+
     @pytest.mark.asyncio
     async def test_delete_paper_not_found(self, paper_service):
         """Test deleting non-existent paper."""
@@ -712,6 +875,31 @@ class TestPaperService:
                     assert "translated_content" in result["result"]
                     paper_service.workflow_agent.process.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_translate_paper_streams_to_paper_subscribers(
+        self, paper_service, temp_dir
+    ):
+        """Test partial translations are pushed under the paper ID."""
+        paper_id = "test_paper_123"
+        source_path = temp_dir / "test_paper_123.pdf"
+        source_path.write_bytes(b"%PDF-1.4")
+
+        async def process(input_data):
+            await input_data["on_partial"]("译文", 50.0)
+            return {"success": True, "data": {}}
+
+        paper_service.workflow_agent.process = AsyncMock(side_effect=process)
+        with (
+            patch.object(paper_service, "_get_source_path", return_value=source_path),
+            patch.object(paper_service, "_update_status", new_callable=AsyncMock),
+            patch("agents.api.routes.websocket.send_task_update") as send_update,
+        ):
+            await paper_service.translate_paper(paper_id)
+
+        input_data = paper_service.workflow_agent.process.await_args[0][0]
+        assert input_data["workflow"] == "translate_only"
+        send_update.assert_awaited_once_with(paper_id, "translating", 50.0, "译文")
+
     @pytest.mark.asyncio
     async def test_translate_paper_not_extracted(self, paper_service):
         """Test translating a paper that hasn't been extracted."""
@@ -996,3 +1184,79 @@ class TestPaperService:
             # Should complete quickly due to concurrency
             assert (end_time - start_time) < 0.05  # Much less than 3 * 0.01
             assert result["total_success"] == 3
+
+    @pytest.mark.asyncio
+    async def test_get_page_extracts_single_page(self, temp_dir):
+        """Test a page is extracted on its own and served from the cache."""
+        from agents.claude.pdf_engine import PDFExtractionEngine
+        from agents.claude.skills import SkillInvoker
+        from tests.agents.fixtures.factories.pdf_factory import write_pdf
+
+        with patch("agents.api.services.paper_service.settings") as mock_settings:
+            mock_settings.PAPERS_DIR = str(temp_dir / "papers")
+            service = PaperService()
+
+        paper_id = "llm_20240115_143022_paper.pdf"
+        source_dir = temp_dir / "papers" / "source" / "llm"
+        source_dir.mkdir(parents=True)
+        write_pdf(source_dir / paper_id, [f"Page {n} body" for n in range(1, 6)])
+
+        engine = PDFExtractionEngine(max_workers=0)
+        pdf_agent = service.workflow_agent.pdf_agent
+        with (
+            patch("agents.claude.skills.get_extraction_engine", return_value=engine),
+            patch.object(
+                pdf_agent, "call_skill", side_effect=SkillInvoker().call_skill
+            ) as call_skill,
+        ):
+            page = await service.get_page(paper_id, 4)
+            cached = await service.get_page(paper_id, 4)
+
+            with pytest.raises(ValueError, match="out of range"):
+                await service.get_page(paper_id, 6)
+
+        assert page == cached
+        assert page["page"] == 4
+        assert page["total_pages"] == 5
+        assert "Page 4 body" in page["content"]
+        assert "Page 3 body" not in page["content"]
+        assert call_skill.await_count == 2
+
+        with pytest.raises(ValueError, match="Paper not found"):
+            await service.get_page("llm_missing.pdf", 1)
+
+    @pytest.mark.asyncio
+    async def test_get_page_thumbnail_is_cached(self, temp_dir):
+        """Test thumbnails are rendered once and cached under the papers dir."""
+        from agents.claude.pdf_engine import PDFExtractionEngine
+        from agents.claude.thumbnail_cache import get_thumbnail_cache
+        from tests.agents.fixtures.factories.pdf_factory import write_pdf
+
+        with patch("agents.api.services.paper_service.settings") as mock_settings:
+            mock_settings.PAPERS_DIR = str(temp_dir / "papers")
+            service = PaperService()
+
+        paper_id = "llm_20240115_143022_paper.pdf"
+        source_dir = temp_dir / "papers" / "source" / "llm"
+        source_dir.mkdir(parents=True)
+        write_pdf(source_dir / paper_id, ["Page 1 body", "Page 2 body"])
+
+        cache = get_thumbnail_cache(service.papers_dir)
+        engine = PDFExtractionEngine(max_workers=0)
+        with patch.object(
+            engine, "render_thumbnail", wraps=engine.render_thumbnail
+        ) as render:
+            cache._engine = engine
+            first = await service.get_page_thumbnail(paper_id, 2, 96)
+            second = await service.get_page_thumbnail(paper_id, 2, 96)
+
+            with pytest.raises(ValueError, match="out of range"):
+                await service.get_page_thumbnail(paper_id, 3, 96)
+
+        assert first == second
+        assert first.startswith(b"\xff\xd8")
+        assert render.await_count == 2
+        assert any((temp_dir / "papers" / ".cache" / "thumbnails").glob("*.jpg"))
+
+        with pytest.raises(ValueError, match="Paper not found"):
+            await service.get_page_thumbnail("llm_missing.pdf", 1)
@@ -0,0 +1,75 @@
+"""Unit tests for the on-disk LRU cache."""
+
+import os
+
+import pytest
+
+from agents.core.cache import DiskLRUCache
+
+
+@pytest.mark.unit
+class TestDiskLRUCache:
+    """Test cases for DiskLRUCache."""
+
+    def test_put_and_get(self, temp_dir):
+        """Test entries round-trip and are counted as hits and misses."""
+        cache = DiskLRUCache(temp_dir, max_bytes=100, suffix=".bin")
+
+        assert cache.get("a") is None
+        cache.put("a", b"hello")
+
+        assert cache.get("a") == b"hello"
+        assert (temp_dir / "a.bin").exists()
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+        assert stats["size_bytes"] == 5
+
+    def test_evicts_least_recently_used(self, temp_dir):
+        """Test the oldest entry is evicted once the size bound is exceeded."""
+        cache = DiskLRUCache(temp_dir, max_bytes=10)
+        cache.put("a", b"aaaa")
+        cache.put("b", b"bbbb")
+        cache.get("a")  # "b" is now least recently used
+        cache.put("c", b"cccc")
+
+        assert cache.contains("a")
+        assert not cache.contains("b")
+        assert cache.contains("c")
+        assert cache.get_stats()["evictions"] == 1
+        assert cache.get_stats()["size_bytes"] == 8
+
+    def test_oversized_entry_not_stored(self, temp_dir):
+        """Test entries larger than the cache are skipped."""
+        cache = DiskLRUCache(temp_dir, max_bytes=4)
+        cache.put("big", b"too large")
+
+        assert not cache.contains("big")
+
+    def test_restores_lru_order_from_disk(self, temp_dir):
+        """Test a new instance rebuilds the index from file access times."""
+        cache = DiskLRUCache(temp_dir, max_bytes=10)
+        cache.put("old", b"1234")
+        cache.put("new", b"5678")
+        os.utime(temp_dir / "old", (1, 1))
+
+        reloaded = DiskLRUCache(temp_dir, max_bytes=10)
+        reloaded.put("next", b"abcd")
+
+        assert reloaded.get_stats()["entries"] == 2
+        assert not reloaded.contains("old")
+        assert reloaded.contains("new")
+
+    def test_delete_and_clear(self, temp_dir):
+        """Test deleting single entries and clearing the cache."""
+        cache = DiskLRUCache(temp_dir, max_bytes=100)
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+
+        cache.delete("a")
+        assert not cache.contains("a")
+
+        cache.clear()
+        assert cache.get_stats()["entries"] == 0
+        assert list(temp_dir.iterdir()) == []
@@ -0,0 +1,131 @@
+"""Unit tests for the shared HTTP client and streaming downloads."""
+
+import asyncio
+import hashlib
+import os
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from agents.claude.pdf_engine import PDFExtractionEngine
+from agents.claude.skills import SkillInvoker
+from agents.core.exceptions import ValidationError
+from agents.core.http_client import (
+    close_http_client,
+    download_to_file,
+    get_http_client,
+)
+from tests.agents.fixtures.factories.pdf_factory import make_pdf_bytes
+
+
+def mock_client(handler):
+    """Create a client that routes requests to ``handler``."""
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def chunked(data, size=1000):
+    """Yield ``data`` in chunks without a Content-Length header."""
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+@pytest.mark.unit
+class TestHTTPClient:
+    """Test cases for the HTTP client helpers."""
+
+    @pytest.mark.asyncio
+    async def test_shared_client(self):
+        """Test the client is shared per event loop and can be closed."""
+        client = get_http_client()
+        assert get_http_client() is client
+
+        await close_http_client()
+        assert client.is_closed
+        assert get_http_client() is not client
+        await close_http_client()
+
+    @pytest.mark.asyncio
+    async def test_download_streams_to_unique_files(self, temp_dir):
+        """Test concurrent downloads get their own files and checksums."""
+        bodies = {f"/{n}.pdf": bytes([n]) * 5000 for n in range(4)}
+        client = mock_client(
+            lambda request: httpx.Response(
+                200, content=chunked(bodies[request.url.path])
+            )
+        )
+
+        with patch("agents.core.http_client.get_http_client", return_value=client):
+            results = await asyncio.gather(
+                *(
+                    download_to_file(f"https://example.com{path}", directory=temp_dir)
+                    for path in bodies
+                )
+            )
+
+        assert len({r["path"] for r in results}) == 4
+        for path, result in zip(bodies, results, strict=True):
+            with open(result["path"], "rb") as f:
+                assert f.read() == bodies[path]
+            assert result["size"] == 5000
+            assert result["sha256"] == hashlib.sha256(bodies[path]).hexdigest()
+
+    @pytest.mark.asyncio
+    async def test_download_size_limit(self, temp_dir):
+        """Test oversized downloads are rejected and leave no file behind."""
+        data = b"x" * 5000
+        declared = mock_client(lambda request: httpx.Response(200, content=data))
+        streamed = mock_client(
+            lambda request: httpx.Response(200, content=chunked(data))
+        )
+
+        for client in (declared, streamed):
+            with patch("agents.core.http_client.get_http_client", return_value=client):
+                with pytest.raises(ValidationError, match="size limit"):
+                    await download_to_file(
+                        "https://example.com/big.pdf",
+                        max_bytes=4096,
+                        directory=temp_dir,
+                    )
+
+        assert list(temp_dir.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_download_http_error(self, temp_dir):
+        """Test HTTP errors propagate and leave no file behind."""
+        client = mock_client(lambda request: httpx.Response(404))
+
+        with patch("agents.core.http_client.get_http_client", return_value=client):
+            with pytest.raises(httpx.HTTPStatusError):
+                await download_to_file("https://example.com/x.pdf", directory=temp_dir)
+
+        assert list(temp_dir.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_pdf_reader_from_url(self):
+        """Test pdf-reader downloads URLs and removes the temporary file."""
+        pdf_bytes = make_pdf_bytes(["Downloaded page"])
+        client = mock_client(lambda request: httpx.Response(200, content=pdf_bytes))
+        engine = PDFExtractionEngine(max_workers=0)
+        downloads = []
+
+        async def recording_download(*args, **kwargs):
+            downloads.append(await download_to_file(*args, **kwargs))
+            return downloads[-1]
+
+        with (
+            patch("agents.core.http_client.get_http_client", return_value=client),
+            patch("agents.claude.skills.get_extraction_engine", return_value=engine),
+            patch("agents.claude.skills.download_to_file", recording_download),
+        ):
+            result = await SkillInvoker()._handle_pdf_reader(
+                {"pdf_source": "https://example.com/paper.pdf"}
+            )
+
+        assert result["success"] is True
+        assert "Downloaded page" in result["data"]["content"]
+        assert result["data"]["download"]["sha256"] == (
+            hashlib.sha256(pdf_bytes).hexdigest()
+        )
+        assert len(downloads) == 1
+        assert not os.path.exists(downloads[0]["path"])
@@ -19,6 +19,7 @@ from agents.core.utils import (
     sanitize_filename,
     validate_pdf_file,
 )
+from tests.agents.fixtures.factories.pdf_factory import make_pdf_bytes
 
 
 @pytest.mark.unit
@@ -182,19 +183,55 @@ class TestValidatePdfFile:
         assert result["valid"] is False
         assert "Not a PDF file" in result["error"]
 
-    @patch("agents.core.utils.logger")  # Patch logger instead
-    def test_validate_pdf_success(self, mock_logger, temp_dir):
-        """Test successful PDF validation."""
-        # Mock PDF content
+    def test_validate_pdf_success(self, temp_dir):
+        """Test successful PDF validation reads the page count."""
         test_file = temp_dir / "test.pdf"
-        test_file.write_bytes(b"%PDF-1.4\n")
+        test_file.write_bytes(make_pdf_bytes(["One", "Two", "Three"]))
 
         result = validate_pdf_file(str(test_file))
 
         assert result["valid"] is True
         assert result["error"] is None
         assert result["size"] > 0
-        # pages might be 0 if pypdf2 is not available
+        assert result["pages"] == 3
+        assert result["version"] == "1.4"
+
+    def test_validate_pdf_repairs_broken_xref(self, temp_dir):
+        """Test a PDF whose startxref is off is accepted like pdfplumber does."""
+        test_file = temp_dir / "shifted.pdf"
+        data = make_pdf_bytes(["One", "Two"])
+        offset = data[data.rindex(b"startxref") :].split()[1]
+        shifted = str(int(offset) + 7).encode()
+        test_file.write_bytes(
+            data.replace(b"startxref\n" + offset, b"startxref\n" + shifted)
+        )
+
+        result = validate_pdf_file(str(test_file))
+
+        assert result["valid"] is True
+        assert result["pages"] == 2
+
+    @pytest.mark.parametrize(
+        "mutate,error",
+        [
+            (lambda data: b"", "Empty file"),
+            (lambda data: b"Not a PDF at all" * 10, "Missing %PDF header"),
+            (lambda data: data[: len(data) // 2], "Missing trailer"),
+            (
+                lambda data: data.replace(b"/Root", b"/Rxxt"),
+                "Invalid PDF structure",
+            ),
+        ],
+    )
+    def test_validate_pdf_rejects_broken_files(self, temp_dir, mutate, error):
+        """Test broken PDFs are rejected without a full parse."""
+        test_file = temp_dir / "broken.pdf"
+        test_file.write_bytes(mutate(make_pdf_bytes(["One", "Two"])))
+
+        result = validate_pdf_file(str(test_file))
+
+        assert result["valid"] is False
+        assert error in result["error"]
 
 
 @pytest.mark.unit